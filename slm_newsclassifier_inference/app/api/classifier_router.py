@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 import sys
 import os
 
@@ -23,11 +24,11 @@ async def predict(request: PredictionRequest):
         # 컨트롤러를 통한 예측 실행
         if isinstance(request.text, str):
             # 단일 텍스트 예측
-            result = classifier_controller.predict_text(request.text)
+            result = await classifier_controller.predict_text_async(request.text)
             return PredictionResponse(result=result)
         elif isinstance(request.text, list):
             # 배치 텍스트 예측
-            results = classifier_controller.predict_batch_texts(request.text)
+            results = await classifier_controller.predict_batch_texts_async(request.text)
             return PredictionResponse(result=results)
         else:
             raise HTTPException(status_code=400, detail="text는 문자열 또는 문자열 리스트여야 합니다.")
@@ -40,6 +41,22 @@ async def predict(request: PredictionRequest):
 @router.get("/health")
 async def health_check():
     """
-    서비스 상태 확인
+    서비스 상태 확인 (liveness - 모델 로딩 중에도 200)
     """
-    return {"status": "healthy", "service": "news-classifier-inference"} 
\ No newline at end of file
+    return {"status": "healthy", "service": "news-classifier-inference"}
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    모델 준비 상태 확인 (readiness - 로딩/워밍업 완료 전에는 503)
+    """
+    status = classifier_controller.get_readiness()
+    status_code = 200 if status["state"] == "ready" else 503
+    return JSONResponse(status_code=status_code, content={"service": "news-classifier-inference", **status})
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    마이크로 배칭 지표 (큐 깊이, 평균 배치 크기, 최근 배치 지연 시간)
+    """
+    return classifier_controller.get_batching_metrics() 
\ No newline at end of file
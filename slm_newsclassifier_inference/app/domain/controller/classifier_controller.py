@@ -20,6 +20,30 @@ class ClassifierController:
         배치 텍스트 예측 - 서비스로 위임
         """
         return self.classifier_service.predict_batch_texts(texts)
+    
+    async def predict_text_async(self, text: str) -> dict:
+        """
+        단일 텍스트 예측 (마이크로 배칭) - 서비스로 위임
+        """
+        return await self.classifier_service.predict_single_text_async(text)
+    
+    async def predict_batch_texts_async(self, texts: list) -> list:
+        """
+        배치 텍스트 예측 (마이크로 배칭) - 서비스로 위임
+        """
+        return await self.classifier_service.predict_batch_texts_async(texts)
+    
+    def get_readiness(self) -> dict:
+        """
+        모델 준비 상태 조회 - 서비스로 위임
+        """
+        return self.classifier_service.get_status()
+    
+    def get_batching_metrics(self) -> dict:
+        """
+        마이크로 배처 지표 조회 - 서비스로 위임
+        """
+        return self.classifier_service.get_batching_metrics()
 
 # 싱글톤 인스턴스
 classifier_controller = ClassifierController() 
\ No newline at end of file
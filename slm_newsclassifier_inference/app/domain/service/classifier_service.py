@@ -1,16 +1,141 @@
+import asyncio
 import torch
 import sys
 import os
+import time
+import threading
+import logging
 
 # utills 폴더 import
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from utills.model_loader import ModelLoader
+from utills.token_cache import TokenCache
+from .micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+# 배치 추론 설정
+MAX_LENGTH = int(os.getenv("CLASSIFIER_MAX_LENGTH", "512"))  # 최대 토큰 길이 (BERT 한계)
+MAX_BATCH_TOKENS = int(os.getenv("CLASSIFIER_MAX_BATCH_TOKENS", "8192"))  # 버킷당 (배치 크기 x 최대 길이) 상한
+MAX_BATCH_SIZE = int(os.getenv("CLASSIFIER_MAX_BATCH_SIZE", "128"))  # 버킷당 최대 텍스트 수
+TOKEN_CACHE_SIZE = int(os.getenv("CLASSIFIER_TOKEN_CACHE_SIZE", "100000"))  # 토큰 캐시 최대 항목 수 (0이면 비활성)
+
+# 마이크로 배칭 설정 (동시 요청을 모아 한 번에 추론)
+MICRO_BATCH_ENABLED = os.getenv("CLASSIFIER_MICRO_BATCHING", "true").lower() == "true"
+MICRO_BATCH_MAX_SIZE = int(os.getenv("CLASSIFIER_MICRO_BATCH_MAX_SIZE", "64"))  # 배치당 최대 요청 수
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("CLASSIFIER_MICRO_BATCH_MAX_WAIT_MS", "5"))  # 배치를 모으는 최대 대기 시간
+
+# 모델 티어 설정 (full: 기존 모델 | student: 증류 학생 모델 | cascade: 학생 모델이 전체를 분류하고 불확실한 항목만 기존 모델로 재분류)
+SUPPORTED_TIERS = ("full", "student", "cascade")
+MODEL_TIER = os.getenv("CLASSIFIER_TIER", "full").lower()
+STUDENT_MODEL_PATH = os.getenv("CLASSIFIER_STUDENT_PATH", "/app/slm_newsclassifier_training/outputs/student/model")
+ESCALATION_THRESHOLD = float(os.getenv("CLASSIFIER_ESCALATION_THRESHOLD", "0.9"))  # 학생 모델 confidence가 이보다 낮으면 기존 모델로 재분류
+
+# 워밍업 forward에 사용하는 문장
+WARMUP_TEXTS = ["넥슨, 2분기 역대 최대 실적 기록", "크래프톤, 배틀그라운드 국가대항전 개최"]
 
 class ClassifierService:
-    def __init__(self):
-        self.model_loader = ModelLoader()
-        self.model = self.model_loader.get_model()
-        self.tokenizer = self.model_loader.get_tokenizer()
+    def __init__(self, model_loader: ModelLoader = None):
+        # 모델은 import 시점이 아니라 백그라운드 워밍업 또는 첫 요청 시 로딩 (ensure_loaded)
+        # 추론 백엔드(torch/onnxruntime)는 ModelLoader가 결정 (CLASSIFIER_BACKEND)
+        self.model_loader = model_loader
+        self.model = None
+        self.tokenizer = None
+        # 증류 학생 모델 (CLASSIFIER_TIER가 student/cascade일 때만 로딩, 항상 torch 백엔드)
+        self.tier = MODEL_TIER
+        self.student_loader = None
+        self.student_model = None
+        self.escalation_threshold = ESCALATION_THRESHOLD
+        self.tier_stats = {"screened": 0, "escalated": 0}
+        self.token_cache = None
+        self.max_length = MAX_LENGTH
+        self.max_batch_tokens = MAX_BATCH_TOKENS
+        self.max_batch_size = MAX_BATCH_SIZE
+        self._load_lock = threading.Lock()
+        self._status = {"state": "not_loaded", "load_seconds": None, "error": None}
+        self.micro_batching = MICRO_BATCH_ENABLED
+        self.batcher = MicroBatcher(
+            self.predict_batch,
+            max_batch_size=MICRO_BATCH_MAX_SIZE,
+            max_wait_ms=MICRO_BATCH_MAX_WAIT_MS
+        )
+    
+    def ensure_loaded(self):
+        """
+        모델 로딩 + 워밍업 forward (최초 1회, 스레드 안전)
+        워밍업까지 끝나야 ready 상태가 됨
+        """
+        if self._status["state"] == "ready":
+            return
+        
+        with self._load_lock:
+            if self._status["state"] == "ready":
+                return
+            
+            self._status.update(state="loading", error=None)
+            started = time.perf_counter()
+            try:
+                self.tier = self._resolve_tier()
+                if self.tier in ("full", "cascade"):
+                    if self.model_loader is None:
+                        self.model_loader = ModelLoader()
+                    self.model = self.model_loader.get_model()
+                    self.tokenizer = self.model_loader.get_tokenizer()
+                if self.tier in ("student", "cascade"):
+                    if self.student_loader is None:
+                        self.student_loader = ModelLoader(model_path=STUDENT_MODEL_PATH, backend="torch")
+                    self.student_model = self.student_loader.get_model()
+                    # 학생 모델은 교사 토크나이저를 그대로 저장하므로 cascade에서는 토큰화 결과를 공유
+                    self.tokenizer = self.tokenizer or self.student_loader.get_tokenizer()
+                self.token_cache = TokenCache(self.tokenizer, self.max_length, TOKEN_CACHE_SIZE)
+                
+                # 워밍업 forward (CUDA 커널/메모리 풀 초기화를 첫 실제 요청 전에 끝냄)
+                self._run_batches(WARMUP_TEXTS)
+                self.tier_stats = {"screened": 0, "escalated": 0}
+                
+                elapsed = round(time.perf_counter() - started, 2)
+                self._status.update(state="ready", load_seconds=elapsed)
+                logger.info(f"✅ 분류 모델 준비 완료 ({elapsed}s)")
+            except Exception as e:
+                self._status.update(state="failed", error=str(e))
+                logger.error(f"❌ 분류 모델 준비 실패: {e}")
+                raise
+    
+    def _resolve_tier(self) -> str:
+        """설정된 티어 확인 (학생 모델이 없으면 full로 대체)"""
+        if self.tier not in SUPPORTED_TIERS:
+            raise ValueError(f"지원하지 않는 모델 티어입니다: {self.tier} (가능: {', '.join(SUPPORTED_TIERS)})")
+        if self.tier != "full" and not os.path.isdir(STUDENT_MODEL_PATH):
+            logger.warning(f"⚠️ 학생 모델 없음 ({STUDENT_MODEL_PATH}), full 티어로 대체합니다.")
+            return "full"
+        return self.tier
+    
+    def start_background_warmup(self):
+        """서버 기동을 막지 않도록 별도 스레드에서 모델 로딩/워밍업 시작"""
+        if self._status["state"] in ("loading", "ready"):
+            return
+        
+        def warmup():
+            try:
+                self.ensure_loaded()
+            except Exception:
+                # 실패 상태는 /ready에서 확인, 다음 요청에서 다시 시도
+                pass
+        
+        threading.Thread(target=warmup, name="classifier-warmup", daemon=True).start()
+    
+    def is_ready(self) -> bool:
+        """모델 로딩 및 워밍업 완료 여부"""
+        return self._status["state"] == "ready"
+    
+    def get_status(self) -> dict:
+        """모델 준비 상태 (state: not_loaded | loading | ready | failed)"""
+        status = dict(self._status)
+        status["tier"] = self.tier
+        if self.model_loader is not None:
+            status["device"] = self.model_loader.get_device()
+            status["backend"] = self.model_loader.get_backend()
+        return status
     
     def validate_single_text(self, text: str):
         """단일 텍스트 검증 로직"""
@@ -33,42 +158,102 @@ class ClassifierService:
     
     def predict(self, text: str) -> dict:
         """
-        핵심 텍스트 분류 예측 로직
+        핵심 텍스트 분류 예측 로직 (단일 텍스트는 크기 1 배치로 처리)
+        """
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts: list) -> list:
         """
+        배치 추론 로직
+        - 전체 텍스트를 한 번에 토크나이징 (패딩 없이, 토큰 캐시 적중분은 생략)
+        - 길이순 정렬 후 max_batch_tokens 이내로 버킷을 나눠 버킷별 동적 패딩
+        - 버킷당 forward 1회, 결과는 입력 순서대로 복원
+        """
+        if not texts:
+            return []
+        
+        # 아직 로딩 전이면 첫 요청에서 로딩 + 워밍업
+        self.ensure_loaded()
+        
         try:
-            # 텍스트 토크나이징
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-            
-            # GPU로 입력 이동 (디바이스 일관성 보장)
-            device = self.model_loader.get_device()
-            if device.startswith("cuda"):
-                inputs = {k: v.to(device) for k, v in inputs.items()}
-            
-            # 모델 추론
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probs = torch.softmax(logits, dim=1)
-                predicted = torch.argmax(probs, dim=1).item()
-                confidence = probs[0][predicted].item()
-            
-            # GPU 메모리 정리
-            if device.startswith("cuda"):
-                del inputs, outputs, logits, probs
-                torch.cuda.empty_cache()
-            
-            return {
-                "text": text,
-                "label": predicted,
-                "confidence": round(confidence, 4)
-            }
+            return self._run_batches(texts)
         except Exception as e:
-            # GPU 메모리 정리 (에러 시에도)
-            device = self.model_loader.get_device()
-            if device.startswith("cuda"):
-                torch.cuda.empty_cache()
             raise Exception(f"예측 중 오류 발생: {str(e)}")
     
+    def _run_batches(self, texts: list) -> list:
+        """
+        토크나이징 -> 티어별 분류 -> 입력 순서 복원
+        cascade: 학생 모델이 전체를 분류하고 confidence < escalation_threshold인 항목만 기존 모델로 재분류
+        """
+        encoded = self.token_cache.encode(texts)
+        
+        results = [None] * len(texts)
+        indices = list(range(len(texts)))
+        if self.tier == "full":
+            self._classify(texts, encoded, indices, results, student=False)
+            return results
+        
+        self._classify(texts, encoded, indices, results, student=True)
+        if self.tier == "cascade":
+            uncertain = [i for i in indices if results[i]["confidence"] < self.escalation_threshold]
+            if uncertain:
+                self._classify(texts, encoded, uncertain, results, student=False)
+            self.tier_stats["screened"] += len(texts)
+            self.tier_stats["escalated"] += len(uncertain)
+        return results
+    
+    def _classify(self, texts: list, encoded: list, indices: list, results: list, student: bool):
+        """indices에 해당하는 텍스트를 길이 버킷별로 forward하여 results에 채움"""
+        tier = "student" if student else "full"
+        subset = [encoded[i] for i in indices]
+        for bucket in self._build_buckets(subset):
+            probs = self._forward([subset[j] for j in bucket], student=student)
+            confidences, predicted = probs.max(dim=1)
+            for j, label, confidence in zip(bucket, predicted.tolist(), confidences.tolist()):
+                i = indices[j]
+                results[i] = {
+                    "text": texts[i],
+                    "label": label,
+                    "confidence": round(confidence, 4),
+                    "tier": tier
+                }
+    
+    def _build_buckets(self, encoded: list) -> list:
+        """
+        길이가 비슷한 텍스트끼리 묶어 패딩 낭비를 줄임
+        버킷 토큰 수(배치 크기 x 버킷 내 최대 길이)가 max_batch_tokens를 넘지 않도록 분할
+        """
+        order = sorted(range(len(encoded)), key=lambda i: len(encoded[i]))
+        buckets, current, current_max = [], [], 0
+        for i in order:
+            length = len(encoded[i])
+            new_max = max(current_max, length)
+            if current and (
+                new_max * (len(current) + 1) > self.max_batch_tokens
+                or len(current) >= self.max_batch_size
+            ):
+                buckets.append(current)
+                current, new_max = [], length
+            current.append(i)
+            current_max = new_max
+        if current:
+            buckets.append(current)
+        return buckets
+    
+    def _forward(self, input_ids: list, student: bool = False):
+        """버킷 하나를 패딩 후 forward 1회 실행, CPU 확률 텐서 반환"""
+        inputs = self.tokenizer.pad({"input_ids": input_ids}, padding=True, return_tensors="pt")
+        model, loader = (self.student_model, self.student_loader) if student else (self.model, self.model_loader)
+        
+        # 모델과 같은 디바이스로 입력 이동 (CPU/GPU 공통)
+        device = loader.get_device()
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        
+        with torch.inference_mode():
+            logits = model(**inputs).logits
+            probs = torch.softmax(logits.float(), dim=1)
+        return probs.cpu()
+    
     def predict_single_text(self, text: str) -> dict:
         """
         단일 텍스트 예측 (검증 포함)
@@ -88,16 +273,49 @@ class ClassifierService:
         # 검증
         valid_texts = self.validate_batch_texts(texts)
         
-        # 예측 실행
+        # 예측 실행 (진짜 배치 추론)
         try:
-            results = []
-            for text in valid_texts:
-                result = self.predict(text)
-                results.append(result)
-            return results
+            return self.predict_batch(valid_texts)
         except Exception as e:
             raise Exception(f"배치 예측 중 오류 발생: {str(e)}")
 
+    async def predict_single_text_async(self, text: str) -> dict:
+        """
+        단일 텍스트 예측 (마이크로 배처 경유)
+        동시에 들어온 다른 요청과 한 번의 forward로 묶여 처리됨
+        """
+        validated_text = self.validate_single_text(text)
+        if not self.micro_batching:
+            # 마이크로 배칭을 끈 경우에도 동기 추론이 이벤트 루프를 막지 않도록 스레드에서 실행
+            return await asyncio.get_running_loop().run_in_executor(None, self.predict, validated_text)
+        return await self.batcher.submit(validated_text)
+    
+    async def predict_batch_texts_async(self, texts: list) -> list:
+        """
+        배치 텍스트 예측 (마이크로 배처 경유)
+        """
+        valid_texts = self.validate_batch_texts(texts)
+        if not self.micro_batching:
+            return await asyncio.get_running_loop().run_in_executor(None, self.predict_batch, valid_texts)
+        try:
+            return await self.batcher.submit_many(valid_texts)
+        except Exception as e:
+            raise Exception(f"배치 예측 중 오류 발생: {str(e)}")
+    
+    def get_batching_metrics(self) -> dict:
+        """마이크로 배처 지표 (큐 깊이, 평균 배치 크기 등) + cascade 재분류 비율"""
+        screened = self.tier_stats["screened"]
+        return {
+            "enabled": self.micro_batching,
+            **self.batcher.get_metrics(),
+            "token_cache": self.token_cache.get_stats() if self.token_cache else None,
+            "tier": {
+                "name": self.tier,
+                **self.tier_stats,
+                "escalation_rate": round(self.tier_stats["escalated"] / screened, 4) if screened else None
+            }
+        }
+
 # 싱글톤 인스턴스
 classifier_service = ClassifierService()
 
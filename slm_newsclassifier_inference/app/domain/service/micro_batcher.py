@@ -0,0 +1,119 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    동적 마이크로 배칭 스케줄러
+    - 개별 요청을 큐에 모았다가 max_wait_ms가 지나거나 max_batch_size개가 차면 한 번에 추론
+    - 추론은 전용 스레드 1개에서 실행 (이벤트 루프 블로킹 방지 + 모델 동시 접근 방지)
+    - 각 요청자는 자신의 Future로 결과를 받음
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], List[dict]], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="classifier-batch")
+        self._metrics = {
+            "total_requests": 0,
+            "total_batches": 0,
+            "total_batched_items": 0,
+            "max_queue_depth": 0,
+            "last_batch_size": 0,
+            "last_batch_latency_ms": 0.0,
+            "last_queue_wait_ms": 0.0,
+        }
+
+    def _ensure_started(self):
+        """첫 요청 시 현재 이벤트 루프에서 워커 시작"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"🚀 마이크로 배처 시작 - max_batch_size: {self.max_batch_size}, max_wait_ms: {self.max_wait_ms}")
+
+    async def submit(self, text: str) -> dict:
+        """텍스트 1개를 큐에 넣고 배치 추론 결과를 기다림"""
+        return (await self.submit_many([text]))[0]
+
+    async def submit_many(self, texts: List[str]) -> List[dict]:
+        """여러 텍스트를 개별 항목으로 큐에 넣음 (다른 요청과 같은 배치로 묶일 수 있음)"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future, time.perf_counter()))
+            futures.append(future)
+
+        self._metrics["total_requests"] += len(texts)
+        self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue.qsize())
+        return await asyncio.gather(*futures)
+
+    async def _run(self):
+        """큐에서 배치를 모아 추론하는 워커 루프"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000.0
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # 대기 중 취소된 요청(클라이언트 연결 종료 등)은 제외
+            batch = [item for item in batch if not item[1].cancelled()]
+            if not batch:
+                continue
+
+            texts = [text for text, _, _ in batch]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.batch_fn, texts)
+                for (_, future, _), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                logger.error(f"❌ 배치 추론 실패 ({len(batch)}개): {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            finished = time.perf_counter()
+            self._metrics["total_batches"] += 1
+            self._metrics["total_batched_items"] += len(batch)
+            self._metrics["last_batch_size"] = len(batch)
+            self._metrics["last_batch_latency_ms"] = round((finished - started) * 1000, 2)
+            self._metrics["last_queue_wait_ms"] = round((started - min(enqueued for _, _, enqueued in batch)) * 1000, 2)
+
+    def get_metrics(self) -> dict:
+        """큐 깊이 및 배치 효율 지표"""
+        total_batches = self._metrics["total_batches"]
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "avg_batch_size": round(self._metrics["total_batched_items"] / total_batches, 2) if total_batches else 0.0,
+            **self._metrics,
+        }
+
+    async def stop(self):
+        """워커 종료"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+News Classifier Offline Batch Inference Script
+과거 기사 분류 백필용 오프라인 배치 작업 (HTTP API/마이크로 배처 없이 분류 서비스를 직접 사용)
+JSONL/Parquet 입력을 큰 청크 단위로 길이 버킷 배치 추론하고 결과를 Parquet 파트로 기록
+중단되면 같은 명령으로 다시 실행해 마지막으로 기록한 청크 다음부터 이어서 처리
+
+사용 예:
+    python batch_inference.py --input news_2024.jsonl --output-dir ./backfill/labels_2024
+    CLASSIFIER_TIER=cascade python batch_inference.py --input news.parquet --output-dir ./backfill/labels --keep-fields corp date
+"""
+import argparse
+import logging
+import os
+import sys
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.domain.service.classifier_service import classifier_service
+from utills.batch_job import BatchJob, record_id, keep_fields
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="News Classifier 오프라인 배치 분류 (재개 가능)")
+    parser.add_argument("--input", type=str, required=True, help="입력 파일 (.jsonl 또는 .parquet)")
+    parser.add_argument("--output-dir", type=str, required=True, help="Parquet 파트/진행 상황 출력 디렉터리")
+    parser.add_argument("--id-field", type=str, default="id", help="기사 식별자 필드 (없으면 입력 행 번호)")
+    parser.add_argument("--text-field", type=str, default="title", help="분류할 텍스트 필드")
+    parser.add_argument("--keep-fields", nargs="*", default=None, help="출력에 그대로 복사할 입력 필드")
+    parser.add_argument("--chunk-size", type=int, default=8192, help="진행 상황 기록 단위 (행)")
+    parser.add_argument("--overwrite", action="store_true", help="다른 입력/설정의 기존 출력을 지우고 새로 시작")
+    args = parser.parse_args()
+
+    classifier_service.ensure_loaded()
+    status = classifier_service.get_status()
+
+    # 설정이 같아야 이어서 처리 (모델 티어/백엔드가 바뀌거나 같은 경로에서 재학습되면 결과가 섞이지 않도록)
+    loaders = (classifier_service.model_loader, classifier_service.student_loader)
+    config = {
+        "text_field": args.text_field,
+        "tier": status["tier"],
+        "backend": status.get("backend"),
+        "model": [loader.get_artifact_id() for loader in loaders if loader is not None],
+        "max_length": classifier_service.max_length
+    }
+    job = BatchJob(args.input, args.output_dir, config, chunk_size=args.chunk_size, overwrite=args.overwrite)
+
+    def process_chunk(records, start_row):
+        texts = [str(record.get(args.text_field) or "").strip() for record in records]
+        valid = [i for i, text in enumerate(texts) if text]
+        predictions = dict(zip(valid, classifier_service.predict_batch([texts[i] for i in valid])))
+
+        rows = []
+        for offset, record in enumerate(records):
+            prediction = predictions.get(offset)
+            rows.append({
+                "id": record_id(record, args.id_field, start_row + offset),
+                **keep_fields(record, args.keep_fields),
+                "label": prediction["label"] if prediction else None,
+                "confidence": prediction["confidence"] if prediction else None,
+                "tier": prediction["tier"] if prediction else None
+            })
+        return rows
+
+    print("=" * 60)
+    print(f"🚀 배치 분류 시작 - {args.input} -> {args.output_dir} (tier: {status['tier']}, device: {status.get('device')})")
+    progress = job.run(process_chunk)
+    print(f"✅ 완료 - {progress['rows_done']}행, 파트 {progress['parts']}개, {progress['seconds']}초")
+    print(f"🔁 티어 통계: {classifier_service.get_batching_metrics()['tier']}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # API 라우터 import
 from app.api.classifier_router import router as classifier_router
+# 라우터와 동일한 경로로 import 해야 서비스 싱글턴이 하나만 생성됨
+from app.api.classifier_router import classifier_controller
 
 # FastAPI 앱 설정
 app = FastAPI(
@@ -36,13 +38,25 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(classifier_router)
 
+@app.on_event("startup")
+async def startup():
+    """모델 로딩/워밍업을 백그라운드로 시작 (서버는 즉시 기동, 준비 상태는 /ready)"""
+    if os.getenv("CLASSIFIER_EAGER_WARMUP", "true").lower() == "true":
+        classifier_controller.classifier_service.start_background_warmup()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """마이크로 배처 워커 정리"""
+    await classifier_controller.classifier_service.batcher.stop()
+
 @app.get("/")
 async def root():
     return {
         "service": "news-classifier-inference",
         "status": "running",
         "version": "1.0.0",
-        "endpoint": "/predict"
+        "endpoint": "/predict",
+        "readiness": "/ready"
     }
 
 if __name__ == "__main__":
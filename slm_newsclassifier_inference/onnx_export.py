@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+News Classifier ONNX Export / Parity / Benchmark Script
+학습된 BERT 분류 모델을 ONNX(+int8 동적 양자화)로 내보내고
+torch 백엔드 대비 정확도 일치율과 처리량을 비교하는 스크립트
+
+사용 예:
+    python onnx_export.py export --model-path /app/slm_newsclassifier_training/outputs/model
+    python onnx_export.py parity --onnx-path /app/slm_newsclassifier_training/outputs/onnx/model.int8.onnx
+    python onnx_export.py benchmark --onnx-path /app/slm_newsclassifier_training/outputs/onnx/model.int8.onnx
+"""
+import argparse
+import os
+import sys
+import time
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utills.model_loader import ModelLoader
+from utills.onnx_backend import export_to_onnx, quantize_onnx
+
+DEFAULT_MODEL_PATH = "/app/slm_newsclassifier_training/outputs/model"
+DEFAULT_ONNX_DIR = "/app/slm_newsclassifier_training/outputs/onnx"
+
+# 데이터 파일이 없을 때 사용하는 기본 검증 문장
+SAMPLE_TEXTS = [
+    "엔씨소프트, MMORPG '블레이드앤소울2' 글로벌 출시",
+    "넥슨, 2분기 역대 최대 실적 기록",
+    "게임 산업에 대한 정부 규제 완화 논의",
+    "애플, 새로운 아이폰 출시 루머",
+    "해외 투자자, 한국 증시에 관심 낮아져",
+    "강아지가 산책하다가 귀여움을 받음",
+    "비가 오는 날씨에 우산 판매량 증가",
+    "카트라이더의 새로운 맵 \"아이스월드\" 출시",
+    "리니지 새로운 캐릭터 \"이즈원\" 공개",
+    "텐센트, 넥슨 인수 소식",
+    "위믹스 상장폐지 소식에 주가 급락",
+    "지배구조 재편으로 esg 투자 증가",
+    "오픈월드, \"아케이드\"맵 전체 업데이트",
+    "개발자 \"파이널 판타지16\" 출시 예정에 법적 대응",
+    "지속가능경영보고서 최초 발간",
+    "농협은행과 mou 체결하여 채무 조정 소식",
+    "엔씨소프트 등 게임주 '장중 급등'...3대 이슈는?",
+    "pubg: 배틀그라운드, 국가대항전 'pnc 2025' 서울에서 개최",
+    "아이돌 콜라보 늦추자 … 크래프톤, 2분기 실적 주춤",
+    "크래프톤, 배틀그라운드 국가대항전 'pnc 2025' 개최",
+]
+
+def load_texts(data_path: str = None, limit: int = None) -> list:
+    """검증용 텍스트 로드 (CSV의 text 컬럼 또는 기본 문장)"""
+    if data_path:
+        import pandas as pd
+        texts = pd.read_csv(data_path)["text"].astype(str).tolist()
+    else:
+        texts = list(SAMPLE_TEXTS)
+    return texts[:limit] if limit else texts
+
+def predict_probs(loader: ModelLoader, texts: list, batch_size: int):
+    """배치 단위로 확률 계산 (백엔드 공통 ModelLoader.predict 사용)"""
+    import torch
+    chunks = [loader.predict(texts[i:i + batch_size], max_length=128) for i in range(0, len(texts), batch_size)]
+    return torch.cat(chunks, dim=0)
+
+def run_export(args):
+    """ONNX 내보내기 + int8 동적 양자화"""
+    loader = ModelLoader(model_path=args.model_path, backend="torch")
+    onnx_path = export_to_onnx(loader.get_model(), loader.get_tokenizer(), args.output_dir, opset=args.opset)
+    quantized_path = quantize_onnx(onnx_path)
+
+    for path in (onnx_path, quantized_path):
+        print(f"📦 {path}: {os.path.getsize(path) / 1e6:.1f}MB")
+    print(f"✅ 서빙하려면 CLASSIFIER_BACKEND=onnxruntime CLASSIFIER_ONNX_PATH={quantized_path}")
+
+def run_parity(args):
+    """torch vs onnxruntime 예측 일치율 및 확률 오차 확인"""
+    texts = load_texts(args.data, args.limit)
+    torch_loader = ModelLoader(model_path=args.model_path, backend="torch")
+    onnx_loader = ModelLoader(model_path=args.onnx_path, backend="onnxruntime")
+
+    torch_probs = predict_probs(torch_loader, texts, args.batch_size).float()
+    onnx_probs = predict_probs(onnx_loader, texts, args.batch_size).float()
+
+    agreement = (torch_probs.argmax(dim=1) == onnx_probs.argmax(dim=1)).float().mean().item()
+    max_diff = (torch_probs - onnx_probs).abs().max().item()
+
+    print("=" * 60)
+    print(f"🧪 정확도 일치 검사 ({len(texts)}개 문장)")
+    print(f"   - 라벨 일치율: {agreement * 100:.2f}%")
+    print(f"   - 최대 확률 오차: {max_diff:.4f}")
+    print("=" * 60)
+
+    if agreement < args.min_agreement:
+        print(f"❌ 라벨 일치율이 기준({args.min_agreement * 100:.1f}%)보다 낮습니다.")
+        sys.exit(1)
+    print("✅ 일치율 기준 통과")
+
+def run_benchmark(args):
+    """백엔드별 처리량(문장/초) 측정"""
+    texts = load_texts(args.data, args.limit)
+    # 측정 시간이 너무 짧지 않도록 최소 문장 수 확보
+    while texts and len(texts) < args.min_samples:
+        texts = texts + texts
+
+    backends = [("torch", args.model_path), ("onnxruntime", args.onnx_path)]
+    print("=" * 60)
+    print(f"⏱️ 처리량 벤치마크 ({len(texts)}개 문장, 배치 {args.batch_size})")
+    for backend, path in backends:
+        loader = ModelLoader(model_path=path, backend=backend)
+        predict_probs(loader, texts[:args.batch_size], args.batch_size)  # 워밍업
+
+        started = time.perf_counter()
+        predict_probs(loader, texts, args.batch_size)
+        elapsed = time.perf_counter() - started
+        print(f"   - {backend:<12} ({loader.get_device()}): {len(texts) / elapsed:8.1f} 문장/초 ({elapsed:.2f}s)")
+    print("=" * 60)
+
+def main():
+    parser = argparse.ArgumentParser(description="News Classifier ONNX 내보내기 / 검증 / 벤치마크")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="ONNX 내보내기 + int8 양자화")
+    export_parser.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+    export_parser.add_argument("--output-dir", default=DEFAULT_ONNX_DIR)
+    export_parser.add_argument("--opset", type=int, default=14)
+    export_parser.set_defaults(func=run_export)
+
+    for name, func, help_text in (
+        ("parity", run_parity, "torch 대비 라벨 일치율 검사"),
+        ("benchmark", run_benchmark, "백엔드별 처리량 측정"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--model-path", default=DEFAULT_MODEL_PATH)
+        sub.add_argument("--onnx-path", default=os.path.join(DEFAULT_ONNX_DIR, "model.int8.onnx"))
+        sub.add_argument("--data", default=None, help="text 컬럼이 있는 CSV (없으면 기본 문장 사용)")
+        sub.add_argument("--limit", type=int, default=None)
+        sub.add_argument("--batch-size", type=int, default=32)
+        sub.set_defaults(func=func)
+        if name == "parity":
+            sub.add_argument("--min-agreement", type=float, default=0.99)
+        else:
+            sub.add_argument("--min-samples", type=int, default=512)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
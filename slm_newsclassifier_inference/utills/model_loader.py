@@ -5,14 +5,31 @@ RTX 2080 + BERT 최적화
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 import os
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 추론 백엔드 설정 (torch | onnxruntime)
+SUPPORTED_BACKENDS = ("torch", "onnxruntime")
+DEFAULT_ONNX_PATH = "/app/slm_newsclassifier_training/outputs/onnx/model.int8.onnx"
+
+# 기동 속도 설정
+MODEL_CACHE_DIR = os.getenv("CLASSIFIER_MODEL_CACHE_DIR", "/app/.model_cache")  # safetensors 직렬화 캐시 위치
+ALLOW_ONLINE = os.getenv("CLASSIFIER_ALLOW_ONLINE", "true").lower() == "true"  # 로컬 파일 없을 때 허깅페이스 다운로드 허용
+
 class ModelLoader:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, backend=None):
+        self.backend = (backend or os.getenv("CLASSIFIER_BACKEND", "torch")).lower()
+        if self.backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"지원하지 않는 추론 백엔드입니다: {self.backend} (가능: {', '.join(SUPPORTED_BACKENDS)})")
+        
         # GPU 강제 설정 (RTX 2080)
-        if not torch.cuda.is_available():
+        if self.backend == "onnxruntime":
+            # ONNX Runtime 백엔드는 CPU 전용 노드 서빙용
+            self.device = "cpu"
+            logger.info("🧮 ONNX Runtime CPU 백엔드 사용")
+        elif not torch.cuda.is_available():
             logger.warning("⚠️ CUDA GPU가 감지되지 않았습니다. CPU로 fallback합니다.")
             self.device = "cpu"
         else:
@@ -20,7 +37,11 @@ class ModelLoader:
             torch.cuda.set_device(0)
             logger.info(f"🚀 GPU 환경 초기화: {torch.cuda.get_device_name(0)}")
         
-        if model_path is None:
+        if self.backend == "onnxruntime":
+            # ONNX 내보내기 디렉토리에 토크나이저도 함께 저장되어 있음
+            self.onnx_path = model_path or os.getenv("CLASSIFIER_ONNX_PATH", DEFAULT_ONNX_PATH)
+            self.model_path = os.path.dirname(self.onnx_path)
+        elif model_path is None:
             # 학습된 BERT 분류 모델 경로 (GPU 최적화)
             trained_model_path = "/app/slm_newsclassifier_training/outputs/model"
             if os.path.exists(trained_model_path):
@@ -37,78 +58,108 @@ class ModelLoader:
         self.model = None
         self._load_model()
     
+    def _from_pretrained(self, loader_cls, path, **kwargs):
+        """
+        오프라인 우선 로딩
+        로컬 파일이 없을 때(OSError/ValueError)만 온라인 모드로 재시도 (CLASSIFIER_ALLOW_ONLINE=false면 재시도 안 함)
+        """
+        try:
+            return loader_cls.from_pretrained(path, local_files_only=True, **kwargs)
+        except (OSError, ValueError) as e:
+            if not ALLOW_ONLINE:
+                raise
+            logger.warning(f"⚠️ 로컬 파일 없음, 온라인 모드로 재시도: {path} ({e})")
+            return loader_cls.from_pretrained(path, local_files_only=False, trust_remote_code=True, **kwargs)
+    
+    def get_artifact_id(self):
+        """
+        모델 아티팩트 식별자 (가중치 파일 경로 + 크기/수정 시각)
+        재학습은 디렉토리 안의 가중치 파일만 덮어쓰므로 디렉토리가 아닌 파일 정보로 구분
+        """
+        if self.backend == "onnxruntime":
+            candidates = [self.onnx_path]
+        else:
+            candidates = [os.path.join(self.model_path, name) for name in ("model.safetensors", "pytorch_model.bin")]
+        weights = next((path for path in candidates if os.path.isfile(path)), None)
+        if weights is None:
+            # 허깅페이스 허브 모델 등 로컬 가중치 파일이 없는 경우
+            return f"{self.model_path}:{self.backend}"
+        stat = os.stat(weights)
+        return f"{weights}:{stat.st_size}:{int(stat.st_mtime)}:{self.backend}"
+    
+    def _serialized_cache_dir(self):
+        """
+        safetensors 직렬화 캐시 경로
+        가중치 파일 식별자 + dtype 조합으로 구분하여 재학습 시 자동으로 새 캐시 생성
+        """
+        digest = hashlib.sha1(self.get_artifact_id().encode("utf-8")).hexdigest()[:12]
+        dtype_tag = "fp16" if self.device.startswith("cuda") else "fp32"
+        return os.path.join(MODEL_CACHE_DIR, digest, dtype_tag)
+    
     def _load_model(self):
         """GPU 최적화 BERT 모델 로딩"""
         try:
-            logger.info(f"🔄 GPU 기반 BERT 모델 로딩 시작: {self.model_path}")
-            
-            # GPU 메모리 정리
-            if self.device.startswith("cuda"):
-                torch.cuda.empty_cache()
-            
-            # 토크나이저 로딩 (오프라인 우선 + 안전 모드)
-            try:
-                # 1차 시도: 오프라인 모드
-                self.tokenizer = AutoTokenizer.from_pretrained(
-                    self.model_path,
-                    local_files_only=True
-                )
-                logger.info(f"✅ 오프라인 토크나이저 로딩 성공")
-            except:
-                # 2차 시도: 온라인 모드 (인증 없이)
-                self.tokenizer = AutoTokenizer.from_pretrained(
-                    self.model_path,
-                    local_files_only=False,
-                    trust_remote_code=True
-                )
-                logger.info(f"✅ 온라인 토크나이저 로딩 성공")
+            logger.info(f"🔄 BERT 모델 로딩 시작: {self.model_path} ({self.device}, backend: {self.backend})")
             
-            # GPU 최적화 BERT 모델 로딩
-            if self.device.startswith("cuda"):
-                try:
-                    # 1차 시도: 오프라인 모드
-                    self.model = AutoModelForSequenceClassification.from_pretrained(
-                        self.model_path,
-                        torch_dtype=torch.float16,
-                        local_files_only=True
-                    ).to(self.device)
-                    logger.info(f"✅ 오프라인 GPU 모델 로딩 성공")
-                except:
-                    # 2차 시도: 온라인 모드 (인증 없이)
-                    self.model = AutoModelForSequenceClassification.from_pretrained(
-                        self.model_path,
-                        torch_dtype=torch.float16,
-                        local_files_only=False,
-                        trust_remote_code=True
-                    ).to(self.device)
-                    logger.info(f"✅ 온라인 GPU 모델 로딩 성공")
-                
-                # GPU 메모리 상태 확인
-                memory_allocated = torch.cuda.memory_allocated(0) / 1e9
-                logger.info(f"🎯 GPU 메모리 사용량: {memory_allocated:.2f}GB")
+            if self.backend == "onnxruntime":
+                # ONNX 디렉토리에 함께 저장된 토크나이저 + ONNX Runtime 세션
+                from .onnx_backend import OnnxSequenceClassifier
+                self.tokenizer = self._from_pretrained(AutoTokenizer, self.model_path, use_fast=True)
+                num_threads = int(os.getenv("CLASSIFIER_ONNX_THREADS", "0")) or None
+                self.model = OnnxSequenceClassifier(self.onnx_path, num_threads=num_threads)
             else:
-                # CPU fallback
-                try:
+                dtype = torch.float16 if self.device.startswith("cuda") else torch.float32
+                cache_dir = self._serialized_cache_dir()
+                
+                if os.path.exists(os.path.join(cache_dir, "model.safetensors")):
+                    # 직렬화 캐시: safetensors mmap 로딩 (네트워크/변환 없이 빠르게 시작)
+                    self.tokenizer = AutoTokenizer.from_pretrained(cache_dir, use_fast=True, local_files_only=True)
                     self.model = AutoModelForSequenceClassification.from_pretrained(
-                        self.model_path,
+                        cache_dir,
+                        torch_dtype=dtype,
+                        low_cpu_mem_usage=True,
                         local_files_only=True
                     )
-                except:
-                    self.model = AutoModelForSequenceClassification.from_pretrained(
+                    logger.info(f"⚡ safetensors 캐시에서 모델 로딩: {cache_dir}")
+                else:
+                    self.tokenizer = self._from_pretrained(AutoTokenizer, self.model_path, use_fast=True)
+                    self.model = self._from_pretrained(
+                        AutoModelForSequenceClassification,
                         self.model_path,
-                        local_files_only=False,
-                        trust_remote_code=True
+                        torch_dtype=dtype,
+                        low_cpu_mem_usage=True
                     )
+                    self._write_serialized_cache(cache_dir)
+                
+                self.model = self.model.to(self.device)
+                
+                if self.device.startswith("cuda"):
+                    # GPU 메모리 상태 확인
+                    memory_allocated = torch.cuda.memory_allocated(0) / 1e9
+                    logger.info(f"🎯 GPU 메모리 사용량: {memory_allocated:.2f}GB")
+            
+            if not getattr(self.tokenizer, "is_fast", False):
+                logger.warning("⚠️ fast 토크나이저를 사용할 수 없어 느린 Python 토크나이저로 동작합니다.")
             
             # 추론 모드 설정
             self.model.eval()
             
-            logger.info(f"✅ BERT 모델 로딩 완료: {self.model_path} ({self.device})")
+            logger.info(f"✅ BERT 모델 로딩 완료: {self.model_path} ({self.device}, backend: {self.backend})")
             
         except Exception as e:
             logger.error(f"❌ BERT 모델 로딩 실패: {e}")
             raise e
     
+    def _write_serialized_cache(self, cache_dir):
+        """다음 기동부터 mmap 로딩이 가능하도록 safetensors로 저장 (실패해도 서비스는 계속)"""
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.model.save_pretrained(cache_dir, safe_serialization=True)
+            self.tokenizer.save_pretrained(cache_dir)
+            logger.info(f"💾 safetensors 캐시 저장: {cache_dir}")
+        except Exception as e:
+            logger.warning(f"⚠️ safetensors 캐시 저장 실패: {e}")
+    
     def get_model(self):
         """모델 반환"""
         return self.model
@@ -121,6 +172,10 @@ class ModelLoader:
         """디바이스 반환"""
         return self.device
     
+    def get_backend(self):
+        """추론 백엔드 반환 (torch | onnxruntime)"""
+        return self.backend
+    
     def predict(self, texts, max_length=512):
         """GPU 최적화 배치 예측"""
         if not isinstance(texts, list):
@@ -148,18 +203,11 @@ class ModelLoader:
                 # CPU로 결과 이동
                 predictions = predictions.cpu()
             
-            # GPU 메모리 정리
-            if self.device.startswith("cuda"):
-                del inputs, outputs
-                torch.cuda.empty_cache()
-            
+            # 호출마다 캐시를 비우면 다음 호출에서 할당 비용이 다시 발생하므로 비우지 않음
             return predictions
             
         except Exception as e:
             logger.error(f"❌ GPU 예측 실패: {e}")
-            # GPU 메모리 정리 (에러 시에도)
-            if self.device.startswith("cuda"):
-                torch.cuda.empty_cache()
             raise e
     
     def get_gpu_memory_info(self):
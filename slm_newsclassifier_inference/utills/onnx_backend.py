@@ -0,0 +1,101 @@
+"""
+ONNX Runtime 추론 백엔드
+BERT 분류 모델을 ONNX로 내보내고 int8 동적 양자화하여 CPU 전용 노드에서 서빙
+"""
+import os
+import logging
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+ONNX_FILENAME = "model.onnx"
+QUANTIZED_ONNX_FILENAME = "model.int8.onnx"
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask"]
+
+def export_to_onnx(model, tokenizer, output_dir: str, opset: int = 14) -> str:
+    """
+    PyTorch 분류 모델을 ONNX로 내보내기 (배치/시퀀스 길이 동적 축)
+    토크나이저도 같은 디렉토리에 저장하여 ONNX 디렉토리 하나로 서빙 가능하게 함
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    onnx_path = os.path.join(output_dir, ONNX_FILENAME)
+
+    model = model.float().to("cpu").eval()
+
+    class _LogitsOnly(torch.nn.Module):
+        """ModelOutput 대신 logits 텐서만 반환하도록 감싸 ONNX 출력 이름을 고정"""
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_ids, attention_mask):
+            return self.inner(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    dummy = tokenizer(["온라인 게임 신작 출시", "분기 실적 발표"], return_tensors="pt", padding=True)
+
+    logger.info(f"🔄 ONNX 내보내기 시작: {onnx_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            (dummy["input_ids"], dummy["attention_mask"]),
+            onnx_path,
+            input_names=ONNX_INPUT_NAMES,
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    tokenizer.save_pretrained(output_dir)
+    logger.info(f"✅ ONNX 내보내기 완료: {onnx_path}")
+    return onnx_path
+
+def quantize_onnx(onnx_path: str, output_path: str = None) -> str:
+    """ONNX 모델 int8 동적 양자화 (가중치 int8, 활성값은 런타임에 양자화)"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    if output_path is None:
+        output_path = os.path.join(os.path.dirname(onnx_path), QUANTIZED_ONNX_FILENAME)
+
+    logger.info(f"🔄 int8 동적 양자화 시작: {output_path}")
+    quantize_dynamic(onnx_path, output_path, weight_type=QuantType.QInt8)
+    logger.info(f"✅ int8 동적 양자화 완료: {output_path}")
+    return output_path
+
+class OnnxSequenceClassifier:
+    """
+    ONNX Runtime 세션을 transformers 모델처럼 호출할 수 있게 감싼 래퍼
+    model(**inputs).logits 형태를 유지하여 ClassifierService 코드 변경 없이 백엔드 교체
+    """
+
+    def __init__(self, onnx_path: str, num_threads: int = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.onnx_path = onnx_path
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(f"✅ ONNX Runtime 세션 생성: {onnx_path} (threads: {num_threads or 'auto'})")
+
+    def __call__(self, **inputs):
+        feed = {
+            name: value.cpu().numpy().astype(np.int64) if isinstance(value, torch.Tensor) else np.asarray(value, dtype=np.int64)
+            for name, value in inputs.items()
+            if name in self.input_names
+        }
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        """PyTorch 모델 인터페이스 호환용 (ONNX는 항상 추론 모드)"""
+        return self
@@ -0,0 +1,83 @@
+"""
+토크나이저 출력 LRU 캐시
+반복되는 뉴스 제목의 토큰 id를 압축 배열(array)로 보관하여 재토크나이징 비용 제거
+"""
+import re
+import threading
+from array import array
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화 (앞뒤 공백 제거 + 연속 공백 1칸으로) - BERT 토큰 결과는 동일"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+class TokenCache:
+    """
+    정규화 텍스트 -> 토큰 id 배열 LRU 캐시
+    - vocab이 65536 미만이면 uint16('H'), 아니면 uint32('I')로 저장하여 메모리 절약
+    - 미스 항목은 fast 토크나이저로 한 번에 배치 토크나이징
+    """
+
+    def __init__(self, tokenizer, max_length: int, max_entries: int = 100000):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.max_entries = max_entries
+        self.typecode = "H" if len(tokenizer) < 65536 else "I"
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, texts: list) -> list:
+        """텍스트 리스트를 토큰 id 리스트로 변환 (캐시 적중분은 토크나이저 호출 생략)"""
+        keys = [normalize_text(text) for text in texts]
+        encoded = [None] * len(keys)
+        missing = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                ids = self._entries.get(key)
+                if ids is not None:
+                    self._entries.move_to_end(key)
+                    encoded[i] = ids
+                else:
+                    missing.setdefault(key, []).append(i)
+            missed = sum(len(indices) for indices in missing.values())
+            self.hits += len(keys) - missed
+            self.misses += missed
+
+        if missing:
+            missing_keys = list(missing)
+            token_ids = self.tokenizer(
+                missing_keys,
+                truncation=True,
+                max_length=self.max_length,
+                padding=False
+            )["input_ids"]
+
+            with self._lock:
+                for key, ids in zip(missing_keys, token_ids):
+                    compact = array(self.typecode, ids)
+                    for i in missing[key]:
+                        encoded[i] = compact
+                    if self.max_entries > 0:
+                        self._entries[key] = compact
+                        self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return [ids.tolist() for ids in encoded]
+
+    def get_stats(self) -> dict:
+        """캐시 적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "fast_tokenizer": getattr(self.tokenizer, "is_fast", False),
+        }
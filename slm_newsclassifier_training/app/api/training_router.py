@@ -22,6 +22,11 @@ async def train_model(request: TrainingRequest):
     - **epochs**: 학습 에포크 수
     - **batch_size**: 배치 크기
     - **learning_rate**: 학습률
+    - **profile**: 학습 프로파일 (auto | gpu | cpu)
+    - **cpu_dtype**: CPU 학습 정밀도 (fp32 | bf16)
+    - **max_samples** / **max_steps**: 스모크 학습용 제한
+    - **incremental**: 증분 학습 (마지막 모델 + 워터마크 이후 새 데이터 + replay 샘플, 중단 시 이어서 학습)
+    - **replay_ratio**: 새 데이터 대비 기존 데이터 replay 비율
     """
     try:
         # 컨트롤러를 통한 학습 실행
@@ -31,9 +36,24 @@ async def train_model(request: TrainingRequest):
             model_name=request.model_name,
             epochs=request.epochs,
             batch_size=request.batch_size,
-            learning_rate=request.learning_rate
+            learning_rate=request.learning_rate,
+            profile=request.profile,
+            cpu_dtype=request.cpu_dtype,
+            dataloader_num_workers=request.dataloader_num_workers,
+            torch_compile=request.torch_compile,
+            max_samples=request.max_samples,
+            max_steps=request.max_steps,
+            incremental=request.incremental,
+            replay_ratio=request.replay_ratio
         )
         
+        if result is None:
+            return TrainingResponse(
+                status="skipped",
+                message="워터마크 이후 새로 라벨링된 데이터가 없어 학습을 건너뛰었습니다.",
+                output_path=f"{request.output_dir}/model"
+            )
+        
         return TrainingResponse(
             status="success",
             message="학습이 성공적으로 완료되었습니다.",
@@ -8,6 +8,14 @@ class TrainingRequest(BaseModel):
     epochs: int = 3
     batch_size: int = 8
     learning_rate: float = 2e-5
+    profile: Optional[str] = None  # auto | gpu | cpu (기본값: CLASSIFIER_TRAINING_PROFILE)
+    cpu_dtype: Optional[str] = None  # fp32 | bf16
+    dataloader_num_workers: Optional[int] = None
+    torch_compile: Optional[bool] = None
+    max_samples: Optional[int] = None  # 스모크 학습용 샘플 수 제한
+    max_steps: Optional[int] = None  # 스모크 학습용 스텝 수 제한
+    incremental: bool = False  # 마지막 내보낸 모델에서 워터마크 이후 새 데이터 + replay 샘플만 학습
+    replay_ratio: Optional[float] = None  # 새 데이터 대비 기존 데이터 replay 비율 (기본값: CLASSIFIER_REPLAY_RATIO)
 
 class TrainingResponse(BaseModel):
     status: str
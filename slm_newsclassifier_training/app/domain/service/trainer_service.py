@@ -1,13 +1,18 @@
 from transformers import TrainingArguments, Trainer
+from datasets import Dataset
 import numpy as np
 from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
 import sys
 import os
+import shutil
 
 # utills 폴더 import
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from utills.model_builder import ModelBuilder
 from utills.data_loader import DataLoader
+from utills.training_profile import TrainingProfile
+from utills.incremental_state import IncrementalState, INCREMENTAL_SAVE_STEPS, RUN_DIRNAME, SEED
+from utills.token_corpus import TokenCorpus, TOKEN_CORPUS_DIR
 
 class TrainerService:
     def __init__(self, data_path="data/news_classifier_dataset.csv", model_name="klue/bert-base"):
@@ -17,6 +22,10 @@ class TrainerService:
         self.model = None
         self.train_dataset = None
         self.eval_dataset = None
+        self.dataframe = None
+        self.corpus_watermark = None
+        self.incremental_plan = None
+        self.max_samples = None
     
     def validate_training_config(self, data_path: str, output_dir: str) -> dict:
         """
@@ -41,22 +50,56 @@ class TrainerService:
         
         return validation_result
         
-    def setup_training(self):
-        """학습 설정 초기화"""
-        # 데이터 로드
-        dataset, df = DataLoader.load_dataset(self.data_path)
-        
-        # 클래스 가중치 계산
-        class_weights_tensor = DataLoader.calculate_class_weights(df["label"])
+    def setup_training(self, max_samples=None, incremental=False, output_dir="./outputs", replay_ratio=None):
+        """
+        학습 설정 초기화
+        - max_samples: 스모크 학습용 샘플 수 제한
+        - incremental: 마지막으로 내보낸 모델에서 시작하여 워터마크 이후 새 행 + replay 샘플만 학습
+        """
+        self.dataframe = None
+        self.corpus_watermark = None
+        self.incremental_plan = None
+        self.max_samples = max_samples
+        
+        # CSV 전체를 DataFrame으로 읽는 것은 증분 학습(워터마크/replay) 또는 토큰 코퍼스를 쓰지 않을 때만
+        dataset = None
+        model_source = self.model_name
+        if incremental:
+            dataset, self.dataframe = DataLoader.load_dataset(self.data_path)
+            plan = IncrementalState.plan(self.dataframe, f"{output_dir}/model", replay_ratio)
+            if plan is None:
+                print("⚠️ 내보낸 모델/워터마크가 없거나 기존 데이터가 변경되어 전체 학습으로 진행합니다.")
+            else:
+                print(f"🔁 증분 학습 - 새 데이터 {plan['new_rows']}개 + replay {plan['replay_rows']}개 (시작: {plan['checkpoint']})")
+                self.incremental_plan = plan
+                if plan["new_rows"] == 0:
+                    return False
+                dataset = Dataset.from_pandas(plan["frame"], preserve_index=False)
+                model_source = plan["checkpoint"]
+        
+        use_corpus = bool(TOKEN_CORPUS_DIR) and self.incremental_plan is None
+        if not use_corpus and dataset is None:
+            dataset, self.dataframe = DataLoader.load_dataset(self.data_path)
         
         # 모델 및 토크나이저 생성
-        self.model = ModelBuilder.create_model(self.model_name)
-        self.tokenizer = ModelBuilder.create_tokenizer(self.model_name)
-        self.model.set_class_weights(class_weights_tensor)
-        
-        # 데이터 전처리
-        tokenized_dataset = DataLoader.preprocess_dataset(dataset, self.tokenizer)
-        self.train_dataset, self.eval_dataset = DataLoader.split_dataset(tokenized_dataset)
+        self.model = ModelBuilder.create_model(model_source)
+        self.tokenizer = ModelBuilder.create_tokenizer(model_source)
+        
+        # 데이터 전처리 (증분 학습은 중단 후 재개 시 같은 분할이 되도록 시드 고정)
+        # 전체 학습은 메모리 맵 토큰 코퍼스 재사용, 증분 학습은 새 행 + replay 샘플만 토크나이징
+        # 클래스 가중치는 증분 학습도 전체 분포 기준 (새 행에 한 클래스만 있어도 가중치 크기 유지)
+        if use_corpus:
+            tokenized_dataset = TokenCorpus.load(self.data_path, self.tokenizer)
+            self.corpus_watermark = tokenized_dataset.watermark()
+            labels = np.asarray(tokenized_dataset.labels)
+        else:
+            tokenized_dataset = DataLoader.preprocess_dataset(dataset, self.tokenizer)
+            labels = self.dataframe["label"]
+        self.model.set_class_weights(DataLoader.calculate_class_weights(labels))
+        seed = SEED if self.incremental_plan else None
+        self.train_dataset, self.eval_dataset = DataLoader.split_dataset(tokenized_dataset, seed=seed)
+        self.train_dataset = TrainingProfile.select_subset(self.train_dataset, max_samples)
+        self.eval_dataset = TrainingProfile.select_subset(self.eval_dataset, max_samples)
         
         return True
     
@@ -71,21 +114,52 @@ class TrainerService:
             "f1": f1_score(labels, preds),
         }
     
-    def train_model(self, output_dir="./outputs", epochs=3, batch_size=8, learning_rate=2e-5):
-        """모델 학습 실행"""
+    def train_model(self, output_dir="./outputs", epochs=3, batch_size=8, learning_rate=2e-5,
+                    profile=None, cpu_dtype=None, dataloader_num_workers=None, torch_compile=None, max_steps=None):
+        """모델 학습 실행 (profile=cpu면 fp32/bf16 + 멀티 워커 데이터 로딩 + torch.compile)"""
+        profile_args = {}
+        if TrainingProfile.resolve(profile) == "cpu":
+            profile_args = TrainingProfile.cpu_training_arguments(cpu_dtype, dataloader_num_workers, torch_compile)
+        
+        # 증분 학습은 전용 디렉토리에 스텝 단위 중간 체크포인트 저장, 같은 학습이 중단된 경우 이어서 진행
+        run_dir = output_dir
+        strategy_args = {"evaluation_strategy": "epoch", "save_strategy": "epoch"}
+        resume_from = None
+        if self.incremental_plan:
+            run_dir = f"{output_dir}/{RUN_DIRNAME}"
+            strategy_args = {
+                "evaluation_strategy": "steps",
+                "save_strategy": "steps",
+                "eval_steps": INCREMENTAL_SAVE_STEPS,
+                "save_steps": INCREMENTAL_SAVE_STEPS,
+                "save_total_limit": 2,
+            }
+            signature = {
+                "previous_watermark": self.incremental_plan["previous_watermark"],
+                "rows_sha256": IncrementalState.rows_digest(self.incremental_plan["frame"]),
+                "epochs": epochs,
+                "batch_size": batch_size,
+                "learning_rate": learning_rate,
+                "max_steps": max_steps,
+            }
+            resume_from = IncrementalState.resume_checkpoint(run_dir, signature)
+            if resume_from:
+                print(f"⏯️ 중단된 증분 학습 재개: {resume_from}")
+        
         training_args = TrainingArguments(
-            output_dir=output_dir,
+            output_dir=run_dir,
             learning_rate=learning_rate,
             per_device_train_batch_size=batch_size,
             per_device_eval_batch_size=batch_size,
             num_train_epochs=epochs,
-            evaluation_strategy="epoch",
-            save_strategy="epoch",
+            max_steps=max_steps or -1,
+            **strategy_args,
             logging_dir="./logs",
             logging_steps=10,
             load_best_model_at_end=True,
             metric_for_best_model="f1",
             greater_is_better=True,
+            **profile_args,
         )
         
         trainer = Trainer(
@@ -98,19 +172,31 @@ class TrainerService:
         )
         
         # 학습 실행
-        trainer.train()
+        trainer.train(resume_from_checkpoint=resume_from)
         
-        # 모델 저장
+        # 모델 저장 (워터마크 함께 기록)
         self.model.save_pretrained(f"{output_dir}/model")
         self.tokenizer.save_pretrained(f"{output_dir}/model")
+        if not self.max_samples:  # 스모크 학습은 전체 데이터를 학습한 것이 아니므로 워터마크 갱신 안 함
+            mode = "incremental" if self.incremental_plan else "full"
+            if self.corpus_watermark is None and self.dataframe is None:
+                # 워터마크가 없는 이전 버전 코퍼스이거나 워터마크 컬럼 설정이 바뀐 경우에만 CSV를 다시 읽음
+                _, self.dataframe = DataLoader.load_dataset(self.data_path)
+            IncrementalState.save(f"{output_dir}/model", self.dataframe, mode, self.model_name, watermark=self.corpus_watermark)
+        if self.incremental_plan:
+            shutil.rmtree(run_dir, ignore_errors=True)
         
         return trainer
     
-    def run_full_training_pipeline(self, output_dir="./outputs", **kwargs):
-        """전체 학습 파이프라인 실행"""
+    def run_full_training_pipeline(self, output_dir="./outputs", max_samples=None,
+                                   incremental=False, replay_ratio=None, **kwargs):
+        """전체 학습 파이프라인 실행 (incremental=True면 증분 학습)"""
         try:
             print("📋 학습 설정 초기화 중...")
-            self.setup_training()
+            if not self.setup_training(max_samples=max_samples, incremental=incremental,
+                                       output_dir=output_dir, replay_ratio=replay_ratio):
+                print("✅ 워터마크 이후 새로 라벨링된 데이터가 없어 학습을 건너뜁니다.")
+                return None
             
             print("🚀 모델 학습 시작...")
             trainer = self.train_model(output_dir=output_dir, **kwargs)
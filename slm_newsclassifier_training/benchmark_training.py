@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+News Classifier CPU Training Benchmark Script
+CPU 학습 프로파일 구성(정밀도 / 데이터로더 워커 / torch.compile)별 소규모 스모크 학습의
+초당 샘플 수와 최대 RSS를 측정하고 결과를 JSONL로 누적 기록
+
+사용 예:
+    python benchmark_training.py
+    python benchmark_training.py --configs fp32 bf16 bf16+compile --workers 0 4 --max-steps 20
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)  # macOS는 bytes, Linux는 KB
+    except ImportError:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / 1024**2
+
+def run_one(args) -> dict:
+    """(하위 프로세스) 구성 1개로 스모크 학습 실행"""
+    from app.domain.service.trainer_service import TrainerService
+
+    dtype, _, option = args.run_one.partition("+")
+    service = TrainerService(data_path=args.data_path, model_name=args.model_name)
+    service.setup_training(max_samples=args.max_samples)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        started = time.perf_counter()
+        trainer = service.train_model(
+            output_dir=output_dir,  # 벤치마크 체크포인트/모델은 남기지 않음
+            epochs=1,
+            batch_size=args.batch_size,
+            profile="cpu",
+            cpu_dtype=dtype,
+            dataloader_num_workers=args.run_workers,
+            torch_compile=option == "compile",
+            max_steps=args.max_steps
+        )
+        elapsed = time.perf_counter() - started
+
+    summary = next((log for log in reversed(trainer.state.log_history) if "train_samples_per_second" in log), {})
+    return {
+        "config": args.run_one,
+        "workers": args.run_workers,
+        "steps": trainer.state.global_step,
+        "train_seconds": round(elapsed, 2),
+        "samples_per_second": round(summary.get("train_samples_per_second", 0.0), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+def run_config(config: str, workers: int, args) -> dict:
+    """구성마다 별도 프로세스로 실행 (최대 RSS가 이전 구성의 영향을 받지 않도록)"""
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--run-one", config, "--run-workers", str(workers),
+        "--data-path", args.data_path,
+        "--model-name", args.model_name,
+        "--batch-size", str(args.batch_size),
+        "--max-samples", str(args.max_samples),
+        "--max-steps", str(args.max_steps)
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    error = (completed.stderr.strip().splitlines() or ["unknown error"])[-1]
+    return {"config": config, "workers": workers, "error": error}
+
+def main():
+    parser = argparse.ArgumentParser(description="News Classifier CPU 학습 프로파일 벤치마크")
+    parser.add_argument("--configs", nargs="+", default=["fp32", "bf16"],
+                        help="정밀도 구성 (fp32 | bf16, '+compile' 접미사로 torch.compile 사용)")
+    parser.add_argument("--workers", nargs="+", type=int, default=[0, 4], help="데이터로더 워커 수 목록")
+    parser.add_argument("--data-path", type=str, default="data/news_classifier_dataset.csv")
+    parser.add_argument("--model-name", type=str, default="klue/bert-base")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-samples", type=int, default=256)
+    parser.add_argument("--max-steps", type=int, default=10)
+    parser.add_argument("--output", type=str, default="./benchmarks/training_benchmark.jsonl",
+                        help="결과 누적 기록 파일 (JSONL)")
+    parser.add_argument("--run-one", type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--run-workers", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(RESULT_PREFIX + json.dumps(run_one(args)))
+        return
+
+    results = [run_config(config, workers, args) for config, workers in itertools.product(args.configs, args.workers)]
+
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps({"timestamp": timestamp, "model_name": args.model_name,
+                                "max_steps": args.max_steps, **result}, ensure_ascii=False) + "\n")
+
+    print("=" * 60)
+    print(f"⏱️ CPU 학습 벤치마크 (스텝 {args.max_steps}, 샘플 {args.max_samples}, 배치 {args.batch_size})")
+    for result in results:
+        label = f"{result['config']} / workers {result['workers']}"
+        if "error" in result:
+            print(f"   - {label:<24}: ❌ {result['error']}")
+            continue
+        print(f"   - {label:<24}: {result['samples_per_second']:8.2f} 샘플/초, "
+              f"최대 RSS {result['peak_rss_mb']:8.1f}MB ({result['train_seconds']}초)")
+    print(f"💾 결과 기록: {args.output}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+News Classifier Distillation Script
+학습된 분류 모델(교사)의 soft label로 얕은 BERT(학생)를 학습하여
+추론 서비스의 student / cascade 티어용 모델로 내보냄
+
+사용 예:
+    python distill.py
+    python distill.py --num-layers 3 --temperature 4 --alpha 0.8 --epochs 5
+"""
+import argparse
+import json
+import os
+import sys
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description="News Classifier 지식 증류 (교사 -> 학생)")
+    parser.add_argument("--teacher-path", type=str, default="./outputs/model", help="교사 모델 경로 (학습된 분류 모델)")
+    parser.add_argument("--data-path", type=str, default="data/news_classifier_dataset.csv")
+    parser.add_argument("--output-dir", type=str, default="./outputs/student", help="학생 모델 출력 디렉토리 (모델은 model/ 하위)")
+    parser.add_argument("--num-layers", type=int, default=4, help="학생 BERT 레이어 수")
+    parser.add_argument("--temperature", type=float, default=2.0, help="soft label 온도")
+    parser.add_argument("--alpha", type=float, default=0.7, help="증류 손실 비중 (나머지는 정답 라벨 CE)")
+    parser.add_argument("--epochs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--learning-rate", type=float, default=5e-5)
+    parser.add_argument("--profile", type=str, default=None, choices=["auto", "gpu", "cpu"])
+    parser.add_argument("--max-samples", type=int, default=None, help="스모크 실행용 샘플 수 제한")
+    args = parser.parse_args()
+
+    from utills.distiller import Distiller
+
+    print("=" * 60)
+    print(f"🎓 지식 증류 시작 - 교사: {args.teacher_path}, 학생 레이어: {args.num_layers}")
+    distiller = Distiller(
+        teacher_path=args.teacher_path,
+        num_layers=args.num_layers,
+        temperature=args.temperature,
+        alpha=args.alpha
+    )
+    info = distiller.run(
+        data_path=args.data_path,
+        output_dir=args.output_dir,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        profile=args.profile,
+        max_samples=args.max_samples
+    )
+    print(f"✅ 학생 모델 저장 완료: {args.output_dir}/model")
+    print(json.dumps(info, ensure_ascii=False, indent=2))
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
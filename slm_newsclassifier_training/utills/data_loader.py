@@ -39,7 +39,7 @@ class DataLoader:
         return tokenized_dataset
     
     @staticmethod
-    def split_dataset(dataset, test_size=0.2):
-        """데이터셋 분할"""
-        train_test = dataset.train_test_split(test_size=test_size)
+    def split_dataset(dataset, test_size=0.2, seed=None):
+        """데이터셋 분할 (seed 지정 시 항상 같은 분할)"""
+        train_test = dataset.train_test_split(test_size=test_size, seed=seed)
         return train_test["train"], train_test["test"] 
\ No newline at end of file
@@ -0,0 +1,160 @@
+from transformers import BertForSequenceClassification, Trainer, TrainingArguments
+from sklearn.metrics import accuracy_score, f1_score
+import torch.nn.functional as F
+import numpy as np
+import torch
+import copy
+import json
+import os
+
+from .model_builder import ModelBuilder
+from .data_loader import DataLoader
+from .training_profile import TrainingProfile
+
+# 학생 모델 학습에 넘기는 컬럼 (text 등 문자열 컬럼은 콜레이터에서 제외)
+MODEL_COLUMNS = ("input_ids", "attention_mask", "token_type_ids", "label", "teacher_logits")
+
+class DistillationTrainer(Trainer):
+    """교사 soft label(KL, temperature) + 정답 라벨(CE)을 섞은 손실로 학생 모델 학습"""
+
+    def __init__(self, *args, temperature: float = 2.0, alpha: float = 0.7, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def compute_loss(self, model, inputs, return_outputs=False, **kwargs):
+        teacher_logits = inputs.pop("teacher_logits")
+        outputs = model(**inputs)
+        student_logits = outputs.logits
+
+        soft_loss = F.kl_div(
+            F.log_softmax(student_logits / self.temperature, dim=-1),
+            F.softmax(teacher_logits / self.temperature, dim=-1),
+            reduction="batchmean"
+        ) * (self.temperature ** 2)
+        loss = self.alpha * soft_loss + (1 - self.alpha) * outputs.loss
+        return (loss, outputs) if return_outputs else loss
+
+class Distiller:
+    def __init__(self, teacher_path: str, num_layers: int = 4, temperature: float = 2.0, alpha: float = 0.7):
+        self.teacher_path = teacher_path
+        self.num_layers = num_layers
+        self.temperature = temperature
+        self.alpha = alpha
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    @staticmethod
+    def select_layers(teacher_layers: int, student_layers: int) -> list:
+        """교사 레이어 중 학생 초기화에 쓸 레이어를 균등 간격으로 선택 (마지막 레이어 포함)"""
+        if student_layers >= teacher_layers:
+            return list(range(teacher_layers))
+        if student_layers == 1:
+            return [teacher_layers - 1]
+        step = (teacher_layers - 1) / (student_layers - 1)
+        return [round(i * step) for i in range(student_layers)]
+
+    def build_student(self, teacher):
+        """교사의 임베딩/선택 레이어/풀러/분류기 가중치로 초기화한 얕은 BERT"""
+        config = copy.deepcopy(teacher.config)
+        layer_ids = self.select_layers(config.num_hidden_layers, self.num_layers)
+        config.num_hidden_layers = len(layer_ids)
+        config.architectures = ["BertForSequenceClassification"]
+
+        student = BertForSequenceClassification(config)
+        student.bert.embeddings.load_state_dict(teacher.bert.embeddings.state_dict())
+        for student_index, teacher_index in enumerate(layer_ids):
+            student.bert.encoder.layer[student_index].load_state_dict(teacher.bert.encoder.layer[teacher_index].state_dict())
+        student.bert.pooler.load_state_dict(teacher.bert.pooler.state_dict())
+        student.classifier.load_state_dict(teacher.classifier.state_dict())
+        print(f"🎓 학생 모델 생성 - 교사 레이어 {layer_ids} 사용 ({config.num_hidden_layers}/{teacher.config.num_hidden_layers}층)")
+        return student
+
+    def add_teacher_logits(self, dataset, teacher, batch_size: int = 64):
+        """교사 모델 logits(soft label)를 teacher_logits 컬럼으로 추가"""
+        teacher = teacher.to(self.device).eval()
+
+        def predict(batch):
+            inputs = {
+                key: torch.tensor(batch[key], device=self.device)
+                for key in ("input_ids", "attention_mask", "token_type_ids") if key in batch
+            }
+            with torch.inference_mode():
+                logits = teacher(**inputs)[0]  # ConfidenceAwareBert는 라벨 없이 호출하면 (logits,) 반환
+            return {"teacher_logits": logits.float().cpu().tolist()}
+
+        return dataset.map(predict, batched=True, batch_size=batch_size, desc="Teacher soft labels")
+
+    def compute_metrics(self, p):
+        """학생 모델 정답 라벨 기준 지표"""
+        preds = np.argmax(p.predictions, axis=1)
+        return {"accuracy": accuracy_score(p.label_ids, preds), "f1": f1_score(p.label_ids, preds)}
+
+    def run(self, data_path: str, output_dir: str, epochs: int = 3, batch_size: int = 32,
+            learning_rate: float = 5e-5, profile: str = None, max_samples: int = None) -> dict:
+        """교사 soft label 생성 -> 학생 학습 -> 교사 일치율 평가 -> 학생 모델 내보내기"""
+        dataset, _ = DataLoader.load_dataset(data_path)
+        teacher = ModelBuilder.create_model(self.teacher_path)
+        tokenizer = ModelBuilder.create_tokenizer(self.teacher_path)
+
+        tokenized = DataLoader.preprocess_dataset(dataset, tokenizer)
+        tokenized = TrainingProfile.select_subset(tokenized, max_samples)
+        tokenized = self.add_teacher_logits(tokenized, teacher)
+        tokenized = tokenized.remove_columns([c for c in tokenized.column_names if c not in MODEL_COLUMNS])
+        train_dataset, eval_dataset = DataLoader.split_dataset(tokenized, seed=42)
+
+        student = self.build_student(teacher.cpu())
+        del teacher
+
+        profile_args = {}
+        if TrainingProfile.resolve(profile) == "cpu":
+            profile_args = TrainingProfile.cpu_training_arguments()
+
+        training_args = TrainingArguments(
+            output_dir=f"{output_dir}/checkpoints",
+            learning_rate=learning_rate,
+            per_device_train_batch_size=batch_size,
+            per_device_eval_batch_size=batch_size,
+            num_train_epochs=epochs,
+            evaluation_strategy="epoch",
+            save_strategy="epoch",
+            save_total_limit=1,
+            logging_steps=10,
+            load_best_model_at_end=True,
+            metric_for_best_model="f1",
+            greater_is_better=True,
+            remove_unused_columns=False,  # teacher_logits를 손실 계산까지 전달
+            **profile_args,
+        )
+        trainer = DistillationTrainer(
+            model=student,
+            args=training_args,
+            train_dataset=train_dataset,
+            eval_dataset=eval_dataset,
+            tokenizer=tokenizer,
+            compute_metrics=self.compute_metrics,
+            temperature=self.temperature,
+            alpha=self.alpha,
+        )
+        trainer.train()
+
+        # 교사와의 예측 일치율 (cascade 임계값 조정 참고용)
+        prediction = trainer.predict(eval_dataset)
+        student_preds = np.argmax(prediction.predictions, axis=1)
+        teacher_preds = np.argmax(np.array(eval_dataset["teacher_logits"]), axis=1)
+        info = {
+            "teacher_path": self.teacher_path,
+            "num_layers": student.config.num_hidden_layers,
+            "temperature": self.temperature,
+            "alpha": self.alpha,
+            "eval_samples": len(eval_dataset),
+            "teacher_agreement": round(float((student_preds == teacher_preds).mean()), 4),
+            "eval_f1": round(float(prediction.metrics.get("test_f1", 0.0)), 4),
+            "student_parameters": sum(p.numel() for p in student.parameters()),
+        }
+
+        model_dir = f"{output_dir}/model"
+        student.save_pretrained(model_dir, safe_serialization=True)
+        tokenizer.save_pretrained(model_dir)
+        with open(os.path.join(model_dir, "distill_info.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+        return info
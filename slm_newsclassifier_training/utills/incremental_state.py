@@ -0,0 +1,190 @@
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
+import shutil
+
+# 새로 라벨링된 행 판단 기준 컬럼 (비어 있으면 행 수 기준 워터마크, CSV는 뒤에 추가만 된다고 가정)
+WATERMARK_COLUMN = os.getenv("CLASSIFIER_WATERMARK_COLUMN", "")
+# 새 데이터 대비 기존 데이터 재학습(replay) 비율
+REPLAY_RATIO = float(os.getenv("CLASSIFIER_REPLAY_RATIO", "1.0"))
+# 증분 학습 중간 체크포인트 저장 간격 (스텝)
+INCREMENTAL_SAVE_STEPS = int(os.getenv("CLASSIFIER_INCREMENTAL_SAVE_STEPS", "50"))
+
+STATE_FILENAME = "training_state.json"
+RUN_STATE_FILENAME = "run_state.json"
+RUN_DIRNAME = "incremental_run"
+SEED = 42
+
+class IncrementalState:
+    @staticmethod
+    def rows_digest(df, ordered: bool = True) -> str:
+        """
+        text/label 내용 해시 (워터마크 이전 데이터가 바뀌었는지 확인용)
+        ordered=False면 행 순서와 무관한 해시 (컬럼 워터마크는 행 위치가 아니라 값으로 기존 행을 고르므로)
+        """
+        hashed = pd.util.hash_pandas_object(df[["text", "label"]], index=False).values
+        if not ordered:
+            hashed = pd.Series(hashed).sort_values().values
+        return hashlib.sha256(hashed.tobytes()).hexdigest()
+
+    @staticmethod
+    def _column_values(series, kind: str):
+        """워터마크 종류에 맞는 비교용 값 (숫자 id는 숫자로, 날짜는 datetime으로 비교)"""
+        if kind == "numeric":
+            return pd.to_numeric(series)
+        if kind == "datetime":
+            return pd.to_datetime(series)
+        return series.astype(str)
+
+    @staticmethod
+    def _column_kind(series) -> str:
+        """컬럼 워터마크 종류 (numeric | datetime | string)"""
+        if pd.api.types.is_numeric_dtype(series):
+            return "numeric"
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return "datetime"
+        try:
+            # CSV에서 읽은 날짜 문자열
+            pd.to_datetime(series)
+            return "datetime"
+        except (ValueError, TypeError):
+            return "string"
+
+    @staticmethod
+    def compute_watermark(df) -> dict:
+        """현재 데이터 전체를 학습했다고 표시할 워터마크"""
+        builder = WatermarkBuilder()
+        builder.add(df)
+        return builder.result()
+
+    @staticmethod
+    def load(model_dir: str):
+        """내보낸 모델 디렉토리의 학습 상태 (없으면 None)"""
+        path = os.path.join(model_dir, STATE_FILENAME)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def save(model_dir: str, df, mode: str, base_model: str, watermark: dict = None):
+        """
+        모델 내보내기와 함께 워터마크 저장 (다음 증분 학습의 시작점)
+        토큰 코퍼스 생성 시 미리 계산한 워터마크가 있으면 DataFrame 없이 그대로 사용
+        """
+        state = {
+            "mode": mode,
+            "base_model": base_model,
+            "watermark": watermark or IncrementalState.compute_watermark(df),
+        }
+        with open(os.path.join(model_dir, STATE_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def split_new_rows(df, watermark: dict):
+        """
+        워터마크 기준으로 (새 행, 기존 행) 분리
+        워터마크 이전 데이터가 변경되어 증분 학습이 불가능하면 None
+        """
+        if watermark.get("column"):
+            column = watermark["column"]
+            if column not in df.columns:
+                return None
+            kind = watermark.get("kind", "string")
+            threshold = pd.Timestamp(watermark["value"]) if kind == "datetime" else watermark["value"]
+            try:
+                is_new = IncrementalState._column_values(df[column], kind) > threshold
+            except (ValueError, TypeError):
+                return None
+            new_rows, old_rows = df[is_new], df[~is_new]
+            # 워터마크 이전 행이 수정/삭제되었으면 증분 학습 불가 (행 순서는 바뀌어도 됨)
+            if IncrementalState.rows_digest(old_rows, ordered=False) != watermark.get("column_rows_sha256"):
+                return None
+            return new_rows, old_rows
+
+        rows = watermark["rows"]
+        if len(df) < rows or IncrementalState.rows_digest(df.iloc[:rows]) != watermark["rows_sha256"]:
+            return None
+        return df.iloc[rows:], df.iloc[:rows]
+
+    @staticmethod
+    def plan(df, model_dir: str, replay_ratio: float = None) -> dict:
+        """
+        증분 학습 계획
+        - checkpoint: 시작 가중치 (마지막으로 내보낸 모델)
+        - frame: 새 행 + 기존 행 replay 샘플 (섞인 순서, 같은 입력이면 항상 같은 결과)
+        내보낸 모델/워터마크가 없거나 기존 데이터가 바뀌었으면 None (전체 학습 필요)
+        """
+        state = IncrementalState.load(model_dir)
+        if state is None:
+            return None
+        split = IncrementalState.split_new_rows(df, state["watermark"])
+        if split is None:
+            return None
+
+        new_rows, old_rows = split
+        replay_ratio = REPLAY_RATIO if replay_ratio is None else replay_ratio
+        replay_count = min(len(old_rows), int(len(new_rows) * replay_ratio))
+        replay = old_rows.sample(n=replay_count, random_state=SEED) if replay_count else old_rows.iloc[:0]
+        frame = pd.concat([new_rows, replay]).sample(frac=1.0, random_state=SEED).reset_index(drop=True)
+        return {
+            "checkpoint": model_dir,
+            "frame": frame,
+            "new_rows": len(new_rows),
+            "replay_rows": len(replay),
+            "previous_watermark": state["watermark"],
+        }
+
+    @staticmethod
+    def resume_checkpoint(run_dir: str, signature: dict):
+        """
+        같은 증분 학습(시작 워터마크/데이터/설정 동일)이 중단된 경우 마지막 중간 체크포인트 경로
+        다른 학습의 잔여물이면 삭제 후 새로 시작
+        """
+        from transformers.trainer_utils import get_last_checkpoint
+
+        run_state_path = os.path.join(run_dir, RUN_STATE_FILENAME)
+        if os.path.exists(run_state_path):
+            with open(run_state_path, "r", encoding="utf-8") as f:
+                previous = json.load(f)
+            if previous == signature:
+                return get_last_checkpoint(run_dir)
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+        os.makedirs(run_dir, exist_ok=True)
+        with open(run_state_path, "w", encoding="utf-8") as f:
+            json.dump(signature, f, ensure_ascii=False, indent=2)
+        return None
+
+class WatermarkBuilder:
+    """
+    CSV 청크를 순서대로 받아 IncrementalState.compute_watermark(전체 DataFrame)와 같은 워터마크 계산
+    청크마다 행 해시(행당 8바이트)와 워터마크 컬럼만 남기므로 토큰 코퍼스 생성 중에 함께 계산
+    """
+
+    def __init__(self):
+        self.column = WATERMARK_COLUMN
+        self._hashes = []
+        self._column_parts = []
+
+    def add(self, chunk):
+        self._hashes.append(pd.util.hash_pandas_object(chunk[["text", "label"]], index=False).values)
+        if self.column and self.column in chunk.columns:
+            self._column_parts.append(chunk[self.column])
+
+    def result(self) -> dict:
+        hashed = np.concatenate(self._hashes) if self._hashes else np.zeros(0, dtype=np.uint64)
+        watermark = {"rows": len(hashed), "rows_sha256": hashlib.sha256(hashed.tobytes()).hexdigest()}
+        if self._column_parts:
+            column = pd.concat(self._column_parts, ignore_index=True)
+            kind = IncrementalState._column_kind(column)
+            value = IncrementalState._column_values(column, kind).max()
+            watermark["column"] = self.column
+            watermark["kind"] = kind
+            # JSON에 원래 타입 그대로 저장 (datetime은 ISO 문자열)
+            watermark["value"] = value.isoformat() if kind == "datetime" else (value.item() if hasattr(value, "item") else value)
+            # rows_digest(ordered=False)와 같은 값 (정렬된 행 해시)
+            watermark["column_rows_sha256"] = hashlib.sha256(np.sort(hashed).tobytes()).hexdigest()
+        return watermark
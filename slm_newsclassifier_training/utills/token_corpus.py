@@ -0,0 +1,160 @@
+from torch.utils.data import Dataset
+import pandas as pd
+import numpy as np
+import hashlib
+import json
+import shutil
+import os
+
+from .incremental_state import WatermarkBuilder, WATERMARK_COLUMN
+
+# 토큰 코퍼스 저장 위치 (빈 값이면 사용 안 함, 매 실행 datasets.map으로 토크나이징)
+TOKEN_CORPUS_DIR = os.getenv("CLASSIFIER_TOKEN_CORPUS_DIR", "./data/corpus")
+# 코퍼스 생성 시 CSV를 읽고 토크나이징하는 청크 크기 (행)
+CORPUS_CHUNK_ROWS = int(os.getenv("CLASSIFIER_CORPUS_CHUNK_ROWS", "10000"))
+# 토크나이징 방식이 바뀌면 올려서 기존 코퍼스를 무효화
+CORPUS_VERSION = 1
+
+TOKENS_FILENAME = "tokens.bin"
+OFFSETS_FILENAME = "offsets.bin"
+LABELS_FILENAME = "labels.bin"
+META_FILENAME = "meta.json"
+
+class TokenCorpus(Dataset):
+    """
+    메모리 맵 토큰 코퍼스
+    - tokens.bin: 전체 샘플 토큰 id를 패딩 없이 이어붙인 배열 (vocab 크기에 따라 uint16/uint32)
+    - offsets.bin: 샘플 i의 토큰 구간 [offsets[i], offsets[i+1]) (uint64)
+    - labels.bin: 샘플별 라벨 (int64)
+    샘플 조회 시 해당 구간만 memmap에서 읽고, 패딩은 Trainer 콜레이터가 배치 단위로 수행
+    """
+
+    def __init__(self, path: str, indices=None):
+        self.path = path
+        self.indices = indices
+        self._open()
+
+    def _open(self):
+        with open(os.path.join(self.path, META_FILENAME), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.tokens = np.memmap(os.path.join(self.path, TOKENS_FILENAME), dtype=self.meta["dtype"], mode="r")
+        self.offsets = np.memmap(os.path.join(self.path, OFFSETS_FILENAME), dtype=np.uint64, mode="r")
+        self.labels = np.memmap(os.path.join(self.path, LABELS_FILENAME), dtype=np.int64, mode="r")
+
+    def __getstate__(self):
+        # np.memmap을 그대로 pickle하면 전체 배열이 복사되므로 데이터로더 워커에는 경로만 전달
+        state = dict(self.__dict__)
+        for key in ("tokens", "offsets", "labels"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self):
+        return len(self.indices) if self.indices is not None else self.meta["num_samples"]
+
+    def __getitem__(self, index):
+        row = int(self.indices[index]) if self.indices is not None else index
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        input_ids = self.tokens[start:end].tolist()
+        return {
+            "input_ids": input_ids,
+            "attention_mask": [1] * len(input_ids),
+            "label": int(self.labels[row])
+        }
+
+    def select(self, indices):
+        """부분집합 뷰 (datasets.Dataset.select와 같은 용도, 파일은 공유)"""
+        indices = np.asarray(list(indices), dtype=np.int64)
+        if self.indices is not None:
+            indices = self.indices[indices]
+        return TokenCorpus(self.path, indices)
+
+    def train_test_split(self, test_size=0.2, seed=None):
+        """datasets.Dataset.train_test_split와 같은 형태의 분할 (seed 지정 시 항상 같은 분할)"""
+        order = np.random.default_rng(seed).permutation(len(self))
+        test_count = int(np.ceil(len(self) * test_size))
+        return {"train": self.select(order[test_count:]), "test": self.select(order[:test_count])}
+
+    def watermark(self):
+        """코퍼스 생성 시 계산한 증분 학습 워터마크 (이전 버전 코퍼스이거나 워터마크 컬럼 설정이 바뀌었으면 None)"""
+        if self.meta.get("watermark_column") != WATERMARK_COLUMN:
+            return None
+        return self.meta.get("watermark")
+
+    @staticmethod
+    def cache_key(data_path: str, tokenizer, max_length: int) -> str:
+        """데이터셋 파일 내용 + 토크나이저 + 최대 길이 해시"""
+        digest = hashlib.sha256()
+        with open(data_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        payload = {
+            "dataset_sha256": digest.hexdigest(),
+            "tokenizer": getattr(tokenizer, "name_or_path", type(tokenizer).__name__),
+            "num_tokens": len(tokenizer),
+            "max_length": max_length,
+            "version": CORPUS_VERSION
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def build(path: str, data_path: str, tokenizer, max_length: int = 128):
+        """
+        CSV를 청크 단위로 읽어 토크나이징 후 파일 끝에 추가 기록 (메모리 사용량이 데이터셋 크기와 무관)
+        모든 파일 기록 후 임시 디렉터리를 교체하므로 meta.json이 있으면 완성된 코퍼스
+        """
+        dtype = np.dtype(np.uint16 if len(tokenizer) <= np.iinfo(np.uint16).max + 1 else np.uint32)
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+
+        num_samples, num_tokens = 0, 0
+        watermark = WatermarkBuilder()
+        with open(os.path.join(tmp_path, TOKENS_FILENAME), "wb") as tokens_file, \
+             open(os.path.join(tmp_path, OFFSETS_FILENAME), "wb") as offsets_file, \
+             open(os.path.join(tmp_path, LABELS_FILENAME), "wb") as labels_file:
+            offsets_file.write(np.zeros(1, dtype=np.uint64).tobytes())
+            for chunk in pd.read_csv(data_path, chunksize=CORPUS_CHUNK_ROWS):
+                chunk["label"] = chunk["label"].astype(int)  # DataLoader.load_dataset과 같은 dtype (워터마크 해시 일치)
+                watermark.add(chunk)
+                encoded = tokenizer(chunk["text"].astype(str).tolist(), truncation=True, max_length=max_length)["input_ids"]
+                lengths = np.array([len(ids) for ids in encoded], dtype=np.int64)
+                tokens_file.write(np.concatenate([np.asarray(ids, dtype=dtype) for ids in encoded]).tobytes())
+                offsets_file.write((num_tokens + np.cumsum(lengths)).astype(np.uint64).tobytes())
+                labels_file.write(chunk["label"].astype(np.int64).to_numpy().tobytes())
+                num_samples += len(lengths)
+                num_tokens += int(lengths.sum())
+
+        if num_samples == 0:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise ValueError(f"학습 데이터가 비어 있습니다: {data_path}")
+
+        meta = {
+            "dtype": dtype.name,
+            "num_samples": num_samples,
+            "num_tokens": num_tokens,
+            "max_length": max_length,
+            # 전체 학습 후 증분 학습용 워터마크를 CSV를 다시 읽지 않고 저장하기 위함 (계산 시 사용한 워터마크 컬럼 설정 포함)
+            "watermark_column": watermark.column,
+            "watermark": watermark.result()
+        }
+        with open(os.path.join(tmp_path, META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        print(f"💾 토큰 코퍼스 생성 - {path} ({num_samples}개 샘플, 평균 {num_tokens / num_samples:.1f} 토큰, {dtype.name})")
+
+    @staticmethod
+    def load(data_path: str, tokenizer, max_length: int = 128, corpus_dir: str = None):
+        """코퍼스 로드 (없으면 생성), 같은 데이터/토크나이저로 다시 학습하면 토크나이징 생략"""
+        corpus_dir = corpus_dir or TOKEN_CORPUS_DIR
+        path = os.path.join(corpus_dir, TokenCorpus.cache_key(data_path, tokenizer, max_length)[:16])
+        if not os.path.exists(os.path.join(path, META_FILENAME)):
+            os.makedirs(corpus_dir, exist_ok=True)
+            TokenCorpus.build(path, data_path, tokenizer, max_length)
+        else:
+            print(f"💾 토큰 코퍼스 재사용 - {path}")
+        return TokenCorpus(path)
@@ -0,0 +1,58 @@
+from transformers import TrainingArguments
+import inspect
+import os
+import torch
+
+# 학습 프로파일 (auto: CUDA 사용 가능하면 gpu, 아니면 cpu)
+TRAINING_PROFILE = os.getenv("CLASSIFIER_TRAINING_PROFILE", "auto")
+# CPU 학습 정밀도 (fp32 | bf16, bf16은 autocast로 적용)
+CPU_DTYPE = os.getenv("CLASSIFIER_CPU_DTYPE", "fp32")
+# CPU 학습 데이터로더 워커 수
+CPU_NUM_WORKERS = int(os.getenv("CLASSIFIER_CPU_NUM_WORKERS", str(min(4, os.cpu_count() or 1))))
+# CPU 학습 시 torch.compile 사용 여부
+CPU_TORCH_COMPILE = os.getenv("CLASSIFIER_CPU_TORCH_COMPILE", "false").lower() == "true"
+
+class TrainingProfile:
+    @staticmethod
+    def resolve(profile: str = None) -> str:
+        """요청/환경변수 프로파일을 gpu 또는 cpu로 확정"""
+        profile = (profile or TRAINING_PROFILE).lower()
+        if profile not in ("auto", "gpu", "cpu"):
+            raise ValueError(f"알 수 없는 학습 프로파일입니다: {profile} (auto | gpu | cpu)")
+        if profile == "auto":
+            return "gpu" if torch.cuda.is_available() else "cpu"
+        if profile == "gpu" and not torch.cuda.is_available():
+            raise ValueError("GPU 학습 프로파일이 지정되었지만 CUDA를 사용할 수 없습니다.")
+        return profile
+
+    @staticmethod
+    def cpu_training_arguments(cpu_dtype: str = None, num_workers: int = None, torch_compile: bool = None) -> dict:
+        """CPU 프로파일용 TrainingArguments 인자 (설치된 transformers가 지원하는 인자만)"""
+        dtype = (cpu_dtype or CPU_DTYPE).lower()
+        if dtype not in ("fp32", "bf16"):
+            raise ValueError(f"알 수 없는 CPU 정밀도입니다: {dtype} (fp32 | bf16)")
+        num_workers = CPU_NUM_WORKERS if num_workers is None else num_workers
+        torch_compile = CPU_TORCH_COMPILE if torch_compile is None else torch_compile
+        torch_compile = torch_compile and hasattr(torch, "compile") and os.name != "nt"
+
+        arguments = {
+            "use_cpu": True,
+            "no_cuda": True,  # transformers 4.34 미만
+            "bf16": dtype == "bf16",
+            "dataloader_num_workers": num_workers,
+            "dataloader_persistent_workers": num_workers > 0,
+            "dataloader_pin_memory": False,
+            "torch_compile": torch_compile,
+        }
+        supported = inspect.signature(TrainingArguments.__init__).parameters
+        if "use_cpu" in supported:
+            arguments.pop("no_cuda")
+        print(f"🔧 CPU 학습 프로파일 - dtype: {dtype}, workers: {num_workers}, torch.compile: {torch_compile}, threads: {torch.get_num_threads()}")
+        return {key: value for key, value in arguments.items() if key in supported}
+
+    @staticmethod
+    def select_subset(dataset, max_samples: int = None):
+        """스모크 학습용 앞쪽 max_samples개 부분집합 (None/0이면 전체)"""
+        if not max_samples or max_samples >= len(dataset):
+            return dataset
+        return dataset.select(range(max_samples))
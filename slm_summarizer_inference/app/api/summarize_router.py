@@ -1,7 +1,8 @@
 """
 뉴스 요약 모델 추론 API 라우터
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List
 from ..domain.controller.summarizer_controller import SummarizerController
 from ..domain.model.prediction_models import SummarizeRequest, SummarizeResponse, BatchSummarizeRequest, BatchSummarizeResponse
@@ -25,6 +26,20 @@ async def summarize_text(request: SummarizeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/summarize/stream")
+async def summarize_stream(
+    request: SummarizeRequest,
+    http_request: Request,
+    format: str = Query("sse", pattern="^(sse|ndjson)$", description="스트림 형식 (sse | ndjson)")
+):
+    """단일 텍스트 스트리밍 요약 - 토큰이 생성되는 대로 전송, 연결이 끊기면 생성 취소"""
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    return StreamingResponse(
+        summarizer_controller.stream_summary(request.dict(), http_request, format),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/summarize/batch", response_model=BatchSummarizeResponse)
 async def summarize_batch(request: BatchSummarizeRequest):
     """배치 텍스트 요약"""
@@ -50,6 +65,11 @@ async def reload_model():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/metrics")
+async def get_metrics():
+    """연속 배칭 지표 (큐 깊이, 활성 시퀀스 수, 토큰/초)"""
+    return summarizer_controller.get_batching_metrics()
+
 @router.get("/health")
 async def health_check():
     """헬스 체크 - 서비스의 기본적인 생존 여부만 빠르게 응답"""
@@ -2,7 +2,8 @@
 뉴스 요약 모델 추론 컨트롤러
 API 라우터와 서비스 간의 중개 역할
 """
-from typing import Dict, Any
+import json
+from typing import Dict, Any, AsyncIterator
 from ..service.summarizer_service import SummarizerService
 
 class SummarizerController:
@@ -25,9 +26,6 @@ class SummarizerController:
             temperature = request_data.get("temperature", 0.7)
             top_p = request_data.get("top_p", 0.9)
             
-            # 모델 로드 확인
-            await self.summarizer_service._ensure_model_loaded()
-            
             # 학습 데이터와 동일한 형태로 입력 구성 (title + description)
             input_text = f"{orig_title} {description}".strip()
             
@@ -38,8 +36,8 @@ class SummarizerController:
 
 요약:"""
             
-            # 모델에 직접 커스텀 프롬프트로 요약 생성 요청
-            raw_summary = await self.summarizer_service.predictor.generate_summary(
+            # 요약 생성 요청 (연속 배칭 스케줄러로 동시 요청과 함께 디코딩)
+            raw_summary = await self.summarizer_service.generate_one(
                 title=orig_title, description=description,
                 max_new_tokens=max_new_tokens,
                 temperature=temperature,
@@ -66,10 +64,50 @@ class SummarizerController:
                 "error": str(e)
             }
     
+    async def stream_summary(self, request_data: Dict[str, Any], http_request, stream_format: str = "sse") -> AsyncIterator[str]:
+        """
+        스트리밍 요약 - SSE 이벤트(data: JSON) 또는 NDJSON(한 줄에 JSON 1개) 문자열을 생성
+        매 이벤트마다 클라이언트 연결을 확인하여 끊기면 생성 취소
+        """
+        news = request_data.get("news", {})
+        events = self.summarizer_service.stream_one(
+            title=news.get("title", ""),
+            description=news.get("description", ""),
+            max_new_tokens=request_data.get("max_new_tokens", 50),
+            temperature=request_data.get("temperature", 0.7),
+            top_p=request_data.get("top_p", 0.9)
+        )
+        
+        def _format(event: Dict[str, Any]) -> str:
+            payload = json.dumps(event, ensure_ascii=False)
+            return f"{payload}\n" if stream_format == "ndjson" else f"data: {payload}\n\n"
+        
+        try:
+            async for event in events:
+                if await http_request.is_disconnected():
+                    break
+                if event.get("done"):
+                    one_line = event["summary"].replace("\n", " ").strip()
+                    event = {"done": True, "title": one_line, "summary": one_line, "status": "success"}
+                yield _format(event)
+        except Exception as e:
+            yield _format({"done": True, "title": news.get("title", ""), "summary": "", "status": "error", "error": str(e)})
+        finally:
+            await events.aclose()
+    
     async def summarize_batch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """배치 텍스트 요약"""
         return await self.summarizer_service.summarize_batch(request_data)
     
+    def get_batching_metrics(self) -> Dict[str, Any]:
+        """연속 배칭 지표 조회"""
+        return self.summarizer_service.get_batching_metrics()
+    
+    async def shutdown(self):
+        """스케줄러 종료"""
+        if self.summarizer_service.batcher is not None:
+            await self.summarizer_service.batcher.stop()
+    
     async def get_model_status(self) -> Dict[str, Any]:
         """모델 상태 조회"""
         return await self.summarizer_service.get_model_status()
@@ -0,0 +1,263 @@
+import asyncio
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+
+from utils.continuous_batching import ContinuousBatch, GenerationRequest
+
+logger = logging.getLogger(__name__)
+
+# 메모리 기반 동시 생성 상한 계산 시 시퀀스 1개의 최대 토큰 수 (프롬프트 400 + 생성 여유)
+SEQUENCE_TOKEN_BUDGET = 512
+
+class ContinuousBatcher:
+    """
+    연속 배칭 스케줄러
+    - 요청은 큐에 쌓이고, 매 토큰 경계마다 빈 슬롯만큼 실행 중 배치에 합류
+    - 끝난 시퀀스는 즉시 결과를 돌려주고 배치에서 빠짐 (긴 요약이 짧은 요약을 붙잡지 않음)
+    - 배치가 비어 있을 때만 max_wait_ms 동안 추가 요청을 모아 첫 프리필을 함께 수행
+    - 디코딩은 전용 스레드 1개에서 실행 (이벤트 루프 블로킹 방지 + 모델 동시 접근 방지)
+    - 동시 시퀀스 수는 max_batch_size와 메모리 관리자가 계산한 상한 중 작은 값
+    """
+
+    def __init__(self, predictor, max_batch_size: int = 16, max_wait_ms: float = 10.0):
+        self.predictor = predictor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+        self._batch: Optional[ContinuousBatch] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summarizer-decode")
+        self._inflight = set()  # 결과가 아직 정해지지 않은 요청 (큐 대기 + 합류 대기 + 디코딩 중)
+        self._metrics = {
+            "total_requests": 0,
+            "completed_requests": 0,
+            "failed_requests": 0,
+            "cancelled_requests": 0,
+            "stream_requests": 0,
+            "total_steps": 0,
+            "generated_tokens": 0,
+            "decode_seconds": 0.0,
+            "max_queue_depth": 0,
+            "max_active": 0,
+            "last_queue_wait_ms": 0.0,
+        }
+
+    def _ensure_started(self):
+        """첫 요청 시 현재 이벤트 루프에서 워커 시작"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"🚀 연속 배칭 스케줄러 시작 - max_batch_size: {self.max_batch_size}, max_wait_ms: {self.max_wait_ms}")
+
+    async def submit(self, title: str, description: str, max_new_tokens: int = 100,
+                     temperature: float = 0.7, top_p: float = 0.9) -> str:
+        """기사 1개를 큐에 넣고 생성이 끝나면 정리된 요약을 반환"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        prompt_ids = self.predictor.encode_prompts([(title, description)])[0]
+        params = self.predictor.resolve_generation_params(max_new_tokens, temperature, top_p)
+        self._enqueue(GenerationRequest(prompt_ids, **params, handle=future))
+
+        self._metrics["total_requests"] += 1
+        self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue.qsize())
+        return await future
+
+    async def submit_stream(self, title: str, description: str, max_new_tokens: int = 100,
+                            temperature: float = 0.7, top_p: float = 0.9) -> AsyncIterator[Dict]:
+        """
+        기사 1개를 큐에 넣고 토큰이 생성될 때마다 {"token": 텍스트 조각}을, 끝나면 {"done": True, "summary"}를 yield
+        소비자가 중간에 닫으면(클라이언트 연결 종료) 요청을 취소하여 다음 토큰 경계에서 배치에서 제거
+        """
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        prompt_ids = self.predictor.encode_prompts([(title, description)])[0]
+        params = self.predictor.resolve_generation_params(max_new_tokens, temperature, top_p)
+        request = GenerationRequest(prompt_ids, **params, handle=future)
+        request.stream = asyncio.Queue()
+        self._enqueue(request)
+
+        self._metrics["total_requests"] += 1
+        self._metrics["stream_requests"] += 1
+        self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue.qsize())
+        try:
+            while True:
+                delta = await request.stream.get()
+                if delta is None:
+                    break
+                yield {"token": delta}
+            yield {"done": True, "summary": await future}
+        finally:
+            if not future.done():
+                request.cancelled = True
+                future.cancel()
+
+    def _enqueue(self, request: GenerationRequest):
+        """큐에 넣고 결과가 정해질 때까지 진행 중 요청으로 추적 (reset 시 실패 처리 대상)"""
+        self._inflight.add(request)
+        request.handle.add_done_callback(lambda _: self._inflight.discard(request))
+        self._queue.put_nowait(request)
+
+    def _publish(self, request: GenerationRequest):
+        """스트리밍 요청에 새로 디코딩된 텍스트 조각 전달 (멀티바이트 문자가 덜 만들어진 경우 다음 토큰까지 보류)"""
+        text = request.text
+        if text.endswith("\ufffd") or len(text) <= len(request.emitted_text):
+            return
+        request.stream.put_nowait(text[len(request.emitted_text):])
+        request.emitted_text = text
+
+    def _mark_cancelled(self):
+        """Future가 취소된 진행 중 요청 표시 (다음 스텝에서 KV 캐시 슬롯 반환)"""
+        if self._batch is None:
+            return
+        for request in self._batch.requests:
+            if not request.cancelled and request.handle.cancelled():
+                request.cancelled = True
+
+    def _take_waiting(self, limit: int) -> list:
+        """큐에서 대기 중인 요청을 limit개까지 꺼냄 (취소된 요청은 버림)"""
+        joined = []
+        while len(joined) < limit and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.handle.cancelled():
+                joined.append(request)
+        return joined
+
+    def _slot_limit(self) -> int:
+        """메모리 여유를 반영한 현재 동시 시퀀스 상한"""
+        return self.predictor.memory.max_concurrent(SEQUENCE_TOKEN_BUDGET, self.max_batch_size)
+
+    async def _collect_first(self) -> list:
+        """배치가 비어 있으면 첫 요청을 기다린 뒤 max_wait_ms 동안 추가 요청을 모음"""
+        loop = asyncio.get_running_loop()
+        joined = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+        limit = self._slot_limit()
+        while len(joined) < limit:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                joined.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return [request for request in joined if not request.handle.cancelled()]
+
+    def _decode_step(self, joined: list) -> list:
+        """(디코딩 스레드) 새 요청 합류 + 토큰 1개 진행, 끝난 요청 반환"""
+        if self._batch is None:
+            self._batch = ContinuousBatch(self.predictor.model, self.predictor.tokenizer, stop_fn=self.predictor.should_stop)
+        self._batch.join(joined)
+        return self._batch.step()
+
+    async def _run(self):
+        """토큰 경계마다 합류/진행/종료를 반복하는 워커 루프"""
+        loop = asyncio.get_running_loop()
+        while True:
+            active = len(self._batch) if self._batch is not None else 0
+            if active == 0:
+                joined = await self._collect_first()
+            elif not self._queue.empty():
+                joined = self._take_waiting(self._slot_limit() - active)
+            else:
+                joined = []
+            if not joined and active == 0:
+                continue
+            self._mark_cancelled()
+
+            now = time.perf_counter()
+            if joined:
+                self._metrics["last_queue_wait_ms"] = round((now - min(r.enqueued_at for r in joined)) * 1000, 2)
+
+            try:
+                finished = await loop.run_in_executor(self._executor, self._decode_step, joined)
+            except Exception as e:
+                # 배치 전체가 같은 KV 캐시를 공유하므로 실패 시 진행 중인 요청 모두 실패 처리
+                logger.error(f"❌ 연속 배칭 디코딩 실패: {e}")
+                in_flight = (self._batch.requests if self._batch is not None else []) + joined
+                failed = list({id(request): request for request in in_flight}.values())  # join 성공 여부와 무관하게 중복 제거
+                for request in failed:
+                    if not request.handle.done():
+                        request.handle.set_exception(e)
+                    if request.stream is not None:
+                        request.stream.put_nowait(None)
+                self._metrics["failed_requests"] += len(failed)
+                if self._batch is not None:
+                    self._batch.reset()
+                self.predictor.memory.maybe_flush(force="out of memory" in str(e).lower())
+                continue
+
+            active = len(self._batch) if self._batch is not None else 0
+            self._metrics["total_steps"] += 1
+            self._metrics["generated_tokens"] += active + len(finished)
+            self._metrics["decode_seconds"] += time.perf_counter() - now
+            self._metrics["max_active"] = max(self._metrics["max_active"], active + len(finished))
+
+            for request in (self._batch.requests if self._batch is not None else []):
+                if request.stream is not None and not request.cancelled:
+                    self._publish(request)
+
+            if finished:
+                self.predictor.memory.maybe_flush()  # 고수위 초과 시에만 정리
+            for request in finished:
+                if request.cancelled or request.handle.done():
+                    self._metrics["cancelled_requests"] += 1  # 클라이언트 연결 종료 등으로 취소된 요청
+                    continue
+                self._metrics["completed_requests"] += 1
+                if request.stream is not None:
+                    self._publish(request)
+                    request.stream.put_nowait(None)
+                request.handle.set_result(self.predictor._clean_generated_text(request.text.strip()))
+
+    def get_metrics(self) -> dict:
+        """큐 깊이, 활성 시퀀스 수, 토큰/초"""
+        decode_seconds = self._metrics["decode_seconds"]
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "active_sequences": len(self._batch) if self._batch is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "memory_slot_limit": self._slot_limit(),
+            "max_wait_ms": self.max_wait_ms,
+            "tokens_per_second": round(self._metrics["generated_tokens"] / decode_seconds, 2) if decode_seconds else 0.0,
+            "avg_active_sequences": round(self._metrics["generated_tokens"] / self._metrics["total_steps"], 2) if self._metrics["total_steps"] else 0.0,
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in self._metrics.items()},
+        }
+
+    async def reset(self, reason: str = "모델 재로딩"):
+        """
+        모델 재로딩 전 호출: 워커를 멈추고, 디코딩 스레드에서 돌던 스텝이 끝나길 기다린 뒤
+        대기/진행 중인 요청을 모두 실패 처리하고 기존 모델을 참조하는 배치 상태 폐기
+        다음 요청이 들어오면 새 큐로 워커가 다시 시작됨
+        """
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        # 디코딩 스레드는 1개이므로 빈 작업이 실행되면 취소 시점에 진행 중이던 스텝도 끝난 것
+        await asyncio.get_running_loop().run_in_executor(self._executor, lambda: None)
+
+        error = RuntimeError(f"{reason}으로 요약 요청이 중단되었습니다")
+        pending = [request for request in self._inflight if not request.handle.done()]
+        for request in pending:
+            request.handle.set_exception(error)
+            if request.stream is not None:
+                request.stream.put_nowait(None)
+        self._metrics["failed_requests"] += len(pending)
+        self._inflight.clear()
+        self._batch = None
+        self._worker = None
+        if pending:
+            logger.warning(f"⚠️ {reason}으로 진행 중인 요청 {len(pending)}개 실패 처리")
+
+    async def stop(self):
+        """워커 종료"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=False)
@@ -3,24 +3,50 @@
 QLoRA 기반 모델 추론의 핵심 비즈니스 로직
 """
 import time
+import asyncio
 import logging
+import threading
 import torch
 import sys
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, AsyncIterator
 
 # utils 폴더 import
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from utils.predictor import SummarizerPredictor
+from utils.summary_cache import SummaryCache
+from .continuous_batcher import ContinuousBatcher
 
 logger = logging.getLogger(__name__)
 
+# 연속 배칭 설정 (단일 요약 요청을 토큰 단위로 합류/이탈시키는 스케줄러)
+CONTINUOUS_BATCHING_ENABLED = os.getenv("SUMMARIZER_CONTINUOUS_BATCHING", "true").lower() == "true"
+CONTINUOUS_MAX_BATCH_SIZE = int(os.getenv("SUMMARIZER_CB_MAX_BATCH_SIZE", "16"))  # 동시에 디코딩하는 최대 시퀀스 수
+CONTINUOUS_MAX_WAIT_MS = float(os.getenv("SUMMARIZER_CB_MAX_WAIT_MS", "10"))  # 빈 배치에서 첫 프리필 전 대기 시간
+
+# 요약 결과 캐시 설정 (SUMMARIZER_DETERMINISTIC_MODE가 greedy/seed일 때만 사용)
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARIZER_CACHE_ENABLED", "true").lower() == "true"
+SUMMARY_CACHE_PATH = os.getenv("SUMMARIZER_CACHE_PATH", os.path.join(os.path.dirname(__file__), '..', '..', '..', 'cache', 'summary_cache.sqlite3'))
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARIZER_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 30일
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARIZER_CACHE_MAX_ENTRIES", "100000"))
+
 class SummarizerService:
     """요약 모델 추론 서비스"""
     
     def __init__(self):
         self.predictor = SummarizerPredictor()
         self.model_loaded = False
+        self.batcher = ContinuousBatcher(
+            self.predictor,
+            max_batch_size=CONTINUOUS_MAX_BATCH_SIZE,
+            max_wait_ms=CONTINUOUS_MAX_WAIT_MS
+        ) if CONTINUOUS_BATCHING_ENABLED else None
+        # 샘플링 결과는 매번 달라지므로 결정적 모드에서만 캐시
+        self.summary_cache = SummaryCache(
+            SUMMARY_CACHE_PATH,
+            ttl_seconds=SUMMARY_CACHE_TTL_SECONDS,
+            max_entries=SUMMARY_CACHE_MAX_ENTRIES
+        ) if SUMMARY_CACHE_ENABLED and self.predictor.deterministic else None
         
     async def get_service_info(self) -> Dict[str, str]:
         """서비스 정보 조회"""
@@ -43,10 +69,7 @@ class SummarizerService:
         try:
             start_time = time.time()
             
-            # 모델 로드 확인
-            await self._ensure_model_loaded()
-            
-            # 요청 데이터 파싱
+            # 요청 데이터 파싱 (모델 로딩은 캐시 미스일 때 generate_one에서 수행)
             news_data = request_data.get("news", {})
             title = news_data.get("title", "")
             description = news_data.get("description", "")
@@ -55,7 +78,7 @@ class SummarizerService:
             top_p = request_data.get("top_p", 0.9)
             
             # 요약 생성
-            summary = await self.predictor.generate_summary(
+            summary = await self.generate_one(
                 title=title,
                 description=description,
                 max_new_tokens=max_new_tokens,
@@ -76,58 +99,190 @@ class SummarizerService:
             logger.error(f"Service: Failed to generate summary - {str(e)}")
             raise e
     
+    async def generate_one(
+        self,
+        title: str,
+        description: str,
+        max_new_tokens: int = 100,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> str:
+        """
+        단일 기사 요약 생성
+        - 결정적 모드 캐시 적중 시 모델 로딩/생성 없이 바로 반환
+        - 연속 배칭이 켜져 있으면 실행 중 배치에 합류하여 다른 동시 요청과 함께 디코딩
+        """
+        cache_key = self._cache_key(title, description, max_new_tokens, temperature, top_p)
+        if cache_key is not None:
+            cached = self.summary_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        await self._ensure_model_loaded()
+        if self.batcher is None:
+            result = (await self.predictor.generate_summaries(
+                [(title, description)],
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p
+            ))[0]
+            if result["error"]:
+                return f"요약 생성 중 오류 발생: {result['error']}"
+            summary = result["summary"]
+        else:
+            summary = await self.batcher.submit(title, description, max_new_tokens, temperature, top_p)
+        
+        if not summary:
+            return "요약을 생성할 수 없습니다."
+        if cache_key is not None:
+            self.summary_cache.set(cache_key, summary)
+        return summary
+    
+    async def stream_one(
+        self,
+        title: str,
+        description: str,
+        max_new_tokens: int = 100,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        단일 기사 스트리밍 요약
+        생성되는 대로 {"token": 텍스트 조각}, 마지막에 {"done": True, "summary": 정리된 요약}을 yield
+        소비자가 닫으면(aclose) 생성 취소
+        """
+        cache_key = self._cache_key(title, description, max_new_tokens, temperature, top_p)
+        if cache_key is not None:
+            cached = self.summary_cache.get(cache_key)
+            if cached is not None:
+                yield {"token": cached}
+                yield {"done": True, "summary": cached}
+                return
+        
+        await self._ensure_model_loaded()
+        if self.batcher is not None:
+            events = self.batcher.submit_stream(title, description, max_new_tokens, temperature, top_p)
+        else:
+            events = self._stream_with_streamer(title, description, max_new_tokens, temperature, top_p)
+        
+        try:
+            async for event in events:
+                if event.get("done"):
+                    summary = event["summary"]
+                    if cache_key is not None and summary:
+                        self.summary_cache.set(cache_key, summary)
+                    event = {"done": True, "summary": summary or "요약을 생성할 수 없습니다."}
+                yield event
+        finally:
+            await events.aclose()
+    
+    async def _stream_with_streamer(
+        self,
+        title: str,
+        description: str,
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """연속 배칭 미사용 시 TextIteratorStreamer 기반 스트리밍 (취소 시 StoppingCriteria로 중단)"""
+        cancel_event = threading.Event()
+        streamer = self.predictor.start_stream(title, description, max_new_tokens, temperature, top_p, cancel_event)
+        loop = asyncio.get_running_loop()
+        pieces = []
+        try:
+            while True:
+                delta = await loop.run_in_executor(None, next, streamer, None)
+                if delta is None:
+                    break
+                if delta:
+                    pieces.append(delta)
+                    yield {"token": delta}
+            yield {"done": True, "summary": self.predictor._clean_generated_text("".join(pieces).strip())}
+        finally:
+            cancel_event.set()
+    
+    def _cache_key(self, title: str, description: str, max_new_tokens: int, temperature: float, top_p: float) -> Optional[str]:
+        """결정적 모드 캐시 키 (프롬프트 + 모델 아티팩트 + 실제 생성 파라미터), 캐시 미사용 시 None"""
+        if self.summary_cache is None or not self.summary_cache.enabled:
+            return None
+        return self.summary_cache.make_key(
+            self.predictor._create_prompt(title, description),
+            self.predictor.get_model_artifact_id(),
+            self.predictor.resolve_generation_params(max_new_tokens, temperature, top_p)
+        )
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """요약 캐시 통계"""
+        if self.summary_cache is None:
+            return {"enabled": False, "deterministic": self.predictor.deterministic}
+        return {"deterministic": True, **self.summary_cache.get_stats()}
+    
+    def get_batching_metrics(self) -> Dict[str, Any]:
+        """연속 배칭 큐 깊이 / 토큰 처리량"""
+        return {
+            "continuous_batching": self.batcher is not None,
+            **(self.batcher.get_metrics() if self.batcher is not None else {}),
+            "predictor": self.predictor.get_generation_stats(),
+            "memory": self.predictor.get_gpu_memory_info(),
+            "cache": self.get_cache_stats()
+        }
+    
     async def summarize_batch(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
         """배치 텍스트 요약"""
         try:
             start_time = time.time()
             
-            # 모델 로드 확인
-            await self._ensure_model_loaded()
-            
             # 요청 데이터 파싱
             news_list = request_data.get("news_list", [])
             max_new_tokens = request_data.get("max_new_tokens", 150)
             temperature = request_data.get("temperature", 0.7)
+            top_p = 0.9  # 배치 요청 스키마에는 top_p가 없으므로 generate 기본값과 동일
+            pairs = [(news_data.get("title", ""), news_data.get("description", "")) for news_data in news_list]
+            
+            # 결정적 모드 캐시 조회 -> 미스만 생성
+            generated: List[Optional[Dict[str, Optional[str]]]] = [None] * len(pairs)
+            cache_keys = [self._cache_key(title, description, max_new_tokens, temperature, top_p) for title, description in pairs]
+            for i, cache_key in enumerate(cache_keys):
+                if cache_key is not None:
+                    cached = self.summary_cache.get(cache_key)
+                    if cached is not None:
+                        generated[i] = {"summary": cached, "error": None}
+            
+            missing = [i for i, item in enumerate(generated) if item is None]
+            if missing:
+                # 모델 로드 확인 후 길이 버킷별 배치 generate (결과는 입력 순서대로 반환)
+                await self._ensure_model_loaded()
+                fresh = await self.predictor.generate_summaries(
+                    [pairs[i] for i in missing],
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    top_p=top_p
+                )
+                for i, item in zip(missing, fresh):
+                    generated[i] = item
+                    if cache_keys[i] is not None and not item["error"] and item["summary"]:
+                        self.summary_cache.set(cache_keys[i], item["summary"])
             
             results = []
             success_count = 0
             error_count = 0
             
-            for news_data in news_list:
-                try:
-                    item_start_time = time.time()
-                    
-                    title = news_data.get("title", "")
-                    description = news_data.get("description", "")
-                    
-                    # 개별 요약 생성
-                    summary = await self.predictor.generate_summary(
-                        title=title,
-                        description=description,
-                        max_new_tokens=max_new_tokens,
-                        temperature=temperature
-                    )
-                    
-                    item_processing_time = time.time() - item_start_time
-                    
+            for news_data, item in zip(news_list, generated):
+                if item["error"]:
+                    error_count += 1
                     results.append({
-                        "summary": summary,
-                        "input_title": title,
-                        "processing_time": item_processing_time,
-                        "model_info": self.predictor.get_model_info()
+                        "title": news_data.get("title", ""),
+                        "summary": "",
+                        "status": "error",
+                        "error": item["error"]
                     })
-                    
+                else:
                     success_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to process item: {str(e)}")
-                    error_count += 1
-                    
+                    one_line = item["summary"].replace("\n", " ").strip() or "요약을 생성할 수 없습니다."
                     results.append({
-                        "summary": f"요약 생성 실패: {str(e)}",
-                        "input_title": news_data.get("title", ""),
-                        "processing_time": 0.0,
-                        "model_info": None
+                        "title": one_line,
+                        "summary": one_line,
+                        "status": "success"
                     })
             
             total_processing_time = time.time() - start_time
@@ -147,19 +302,11 @@ class SummarizerService:
     async def get_model_status(self) -> Dict[str, Any]:
         """모델 상태 조회"""
         try:
-            gpu_memory_info = {}
-            if torch.cuda.is_available():
-                gpu_memory_info = {
-                    "gpu_memory_allocated": f"{torch.cuda.memory_allocated() / 1024**3:.2f}GB",
-                    "gpu_memory_reserved": f"{torch.cuda.memory_reserved() / 1024**3:.2f}GB",
-                    "gpu_memory_total": f"{torch.cuda.get_device_properties(0).total_memory / 1024**3:.2f}GB"
-                }
-            
             return {
                 "model_loaded": self.model_loaded,
                 "model_info": self.predictor.get_model_info() if self.model_loaded else None,
                 "gpu_available": torch.cuda.is_available(),
-                **gpu_memory_info
+                "memory": self.predictor.get_gpu_memory_info()
             }
             
         except Exception as e:
@@ -171,15 +318,13 @@ class SummarizerService:
         try:
             logger.info("Starting model reload...")
             
-            # 기존 모델 해제
+            # 기존 모델 해제 전 연속 배칭 워커를 멈추고 진행 중 요청은 오류로 종료 (이전 모델을 참조하므로)
+            if self.batcher is not None:
+                await self.batcher.reset()
             self.predictor.unload_model()
             self.model_loaded = False
             
-            # GPU 메모리 정리
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            
-            # 모델 재로드
+            # 모델 재로드 (GPU 메모리 정리는 unload_model에서 수행)
             await self.predictor.load_model()
             self.model_loaded = True
             
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+News Summarizer Offline Batch Inference Script
+과거 기사 요약 백필용 오프라인 배치 작업 (HTTP API 없이 예측기를 직접 사용)
+JSONL/Parquet 입력을 청크 단위로 길이 버킷 배치 생성하고 결과를 Parquet 파트로 기록
+중단되면 같은 명령으로 다시 실행해 마지막으로 기록한 청크 다음부터 이어서 처리
+
+사용 예:
+    python batch_inference.py --input news_2024.jsonl --output-dir ./backfill/summaries_2024
+    python batch_inference.py --input news.parquet --output-dir ./backfill/summaries --chunk-size 512 --keep-fields corp date
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.predictor import SummarizerPredictor
+from utils.batch_job import BatchJob, record_id, keep_fields
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+def main():
+    parser = argparse.ArgumentParser(description="News Summarizer 오프라인 배치 요약 (재개 가능)")
+    parser.add_argument("--input", type=str, required=True, help="입력 파일 (.jsonl 또는 .parquet)")
+    parser.add_argument("--output-dir", type=str, required=True, help="Parquet 파트/진행 상황 출력 디렉터리")
+    parser.add_argument("--id-field", type=str, default="id", help="기사 식별자 필드 (없으면 입력 행 번호)")
+    parser.add_argument("--title-field", type=str, default="title")
+    parser.add_argument("--description-field", type=str, default="description")
+    parser.add_argument("--keep-fields", nargs="*", default=None, help="출력에 그대로 복사할 입력 필드")
+    parser.add_argument("--chunk-size", type=int, default=256, help="진행 상황 기록 단위 (행)")
+    parser.add_argument("--max-new-tokens", type=int, default=100)
+    parser.add_argument("--temperature", type=float, default=0.7)
+    parser.add_argument("--top-p", type=float, default=0.9)
+    parser.add_argument("--device", type=str, default=None, choices=["cuda", "cpu"])
+    parser.add_argument("--overwrite", action="store_true", help="다른 입력/설정의 기존 출력을 지우고 새로 시작")
+    args = parser.parse_args()
+
+    predictor = SummarizerPredictor(device=args.device)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(predictor.load_model())
+
+    # 설정이 같아야 이어서 처리 (모델/생성 파라미터가 바뀌면 결과가 섞이지 않도록)
+    config = {
+        "model": predictor.get_model_artifact_id(),
+        "title_field": args.title_field,
+        "description_field": args.description_field,
+        "generation": predictor.resolve_generation_params(args.max_new_tokens, args.temperature, args.top_p)
+    }
+    job = BatchJob(args.input, args.output_dir, config, chunk_size=args.chunk_size, overwrite=args.overwrite)
+
+    def process_chunk(records, start_row):
+        news_list = [
+            (str(record.get(args.title_field) or ""), str(record.get(args.description_field) or ""))
+            for record in records
+        ]
+        results = loop.run_until_complete(predictor.generate_summaries(
+            news_list,
+            max_new_tokens=args.max_new_tokens,
+            temperature=args.temperature,
+            top_p=args.top_p
+        ))
+        return [
+            {
+                "id": record_id(record, args.id_field, start_row + offset),
+                **keep_fields(record, args.keep_fields),
+                "summary": result["summary"],
+                "error": result["error"]
+            }
+            for offset, (record, result) in enumerate(zip(records, results))
+        ]
+
+    print("=" * 60)
+    print(f"🚀 배치 요약 시작 - {args.input} -> {args.output_dir}")
+    progress = job.run(process_chunk)
+    stats = predictor.get_generation_stats()
+    print(f"✅ 완료 - {progress['rows_done']}행, 파트 {progress['parts']}개, {progress['seconds']}초")
+    print(f"⏱️ 생성 통계: {stats}")
+    print("=" * 60)
+    predictor.unload_model()
+    loop.close()
+
+if __name__ == "__main__":
+    main()
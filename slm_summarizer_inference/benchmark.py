@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+News Summarizer Throughput Benchmark Script
+디바이스(cuda / cpu)별 요약 생성 처리량(토큰/초)을 측정하는 스크립트
+
+사용 예:
+    python benchmark.py --devices cpu
+    python benchmark.py --devices cuda cpu --batch-size 8 --rounds 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.predictor import SummarizerPredictor
+
+SAMPLE_NEWS = [
+    ("이게 얼마 만이냐 엔씨소프트, 신작 기대감에 8% 급등[핫종목]",
+     "18일 한국거래소에 따르면 엔씨소프트는 전일 대비 8.73% 오른 18만 6900원에 거래를 마쳤다. 게임주 상승은 하반기 신작에 대한 기대감이 커진 영향이다."),
+    ("자체 개발한 AI 플랫폼 '하이퍼클로바' 기반 서비스 공개",
+     "최근 기업 발표에 따르면 자체 개발한 AI 플랫폼 '하이퍼클로바' 기반 새로운 서비스 개발 공개와 관련한 내용이 공식적으로 확인되었다."),
+    ("제3자배정증자 방식의 유상증자 결정",
+     "최근 기업 발표에 따르면 제3자배정증자 방식의 유상증자 결정과 관련한 내용이 공식적으로 확인되었다."),
+    ("신작 MMORPG '나이트 크로우' 사전 예약 시작",
+     "최근 기업 발표에 따르면 신작 MMORPG '나이트 크로우'의 프리뷰 영상 공개 및 사전 예약 시작과 관련한 내용이 공식적으로 확인되었다."),
+]
+
+async def run_device(device: str, args) -> dict:
+    """디바이스 하나에서 모델 로딩 후 처리량 측정"""
+    predictor = SummarizerPredictor(device=device)
+    await predictor.load_model()
+
+    news_list = (SAMPLE_NEWS * (args.batch_size // len(SAMPLE_NEWS) + 1))[:args.batch_size]
+    await predictor.generate_summaries(news_list[:1], max_new_tokens=8)  # 워밍업
+
+    # 워밍업 통계 제외
+    predictor.generation_stats = {"generated_tokens": 0, "generate_seconds": 0.0}
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        await predictor.generate_summaries(news_list, max_new_tokens=args.max_new_tokens)
+    elapsed = time.perf_counter() - started
+
+    stats = predictor.get_generation_stats()
+    stats["articles_per_second"] = round(len(news_list) * args.rounds / elapsed, 2)
+    predictor.unload_model()
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="News Summarizer 디바이스별 처리량 벤치마크")
+    parser.add_argument("--devices", nargs="+", default=["cpu"], choices=["cuda", "cpu"])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    args = parser.parse_args()
+
+    results = [asyncio.run(run_device(device, args)) for device in args.devices]
+
+    print("=" * 60)
+    print(f"⏱️ 요약 처리량 벤치마크 (배치 {args.batch_size}, {args.rounds}회, max_new_tokens {args.max_new_tokens})")
+    for stats in results:
+        print(f"   - {stats['device']:<7}: {stats['tokens_per_second']:8.1f} 토큰/초, "
+              f"{stats['articles_per_second']:6.2f} 기사/초 ({stats['generated_tokens']} 토큰)")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import sys
 import os
-from app.api.summarize_router import router as summarize_router
+from app.api.summarize_router import router as summarize_router, summarizer_controller
 
 # 프로젝트 루트 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -34,6 +34,11 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(summarize_router)
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """연속 배칭 스케줄러 종료"""
+    await summarizer_controller.shutdown()
+
 @app.get("/")
 async def root():
     return {
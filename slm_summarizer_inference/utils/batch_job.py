@@ -0,0 +1,166 @@
+"""
+오프라인 배치 작업 유틸리티 (HTTP API 없이 과거 기사 일괄 처리)
+- 입력: JSONL 또는 Parquet 파일을 청크 단위로 스트리밍 (다음 청크는 백그라운드 스레드에서 미리 읽음)
+- 출력: 청크마다 part-00000.parquet 파일 하나 (임시 파일 기록 후 교체)
+- 진행 상황: _progress.json에 처리한 입력 행 수/파트 수 기록, 같은 입력/설정으로 다시 실행하면 이어서 처리
+"""
+import os
+import json
+import glob
+import time
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FILENAME = "_progress.json"
+PART_PATTERN = "part-{:05d}.parquet"
+
+def input_fingerprint(path: str) -> Dict[str, Any]:
+    """입력 파일 식별 정보 (내용이 바뀌면 이어서 처리하지 않음)"""
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+def iter_records(path: str, chunk_size: int, skip_rows: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """입력 파일을 chunk_size 행씩 읽음 (앞쪽 skip_rows 행은 건너뜀)"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        remaining_skip = skip_rows
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            if remaining_skip >= batch.num_rows:
+                remaining_skip -= batch.num_rows  # 이미 처리한 배치는 파이썬 객체로 바꾸지 않고 건너뜀
+                continue
+            rows = batch.slice(remaining_skip).to_pylist()
+            remaining_skip = 0
+            yield rows
+        return
+
+    chunk: List[Dict[str, Any]] = []
+    row = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row += 1
+            if row <= skip_rows:
+                continue
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def prefetch(iterator: Iterator, depth: int = 2) -> Iterator:
+    """다음 청크 읽기/파싱을 모델 연산과 겹치도록 백그라운드 스레드에서 미리 읽음"""
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    done = object()
+
+    def reader():
+        try:
+            for item in iterator:
+                buffer.put(item)
+            buffer.put(done)
+        except Exception as e:
+            buffer.put(e)
+
+    threading.Thread(target=reader, name="batch-job-reader", daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+class BatchJob:
+    """청크 단위 처리 + Parquet 파트 출력 + 재개 가능한 진행 상황 기록"""
+
+    def __init__(self, input_path: str, output_dir: str, config: Dict[str, Any],
+                 chunk_size: int = 256, overwrite: bool = False):
+        self.input_path = input_path
+        self.output_dir = output_dir
+        self.config = config
+        self.chunk_size = chunk_size
+        self.overwrite = overwrite
+        self.progress_path = os.path.join(output_dir, PROGRESS_FILENAME)
+
+    def _load_progress(self) -> Dict[str, Any]:
+        """이전 진행 상황 (입력/설정이 다르면 overwrite 없이는 오류)"""
+        fresh = {
+            "input": input_fingerprint(self.input_path),
+            "config": self.config,
+            "rows_done": 0,
+            "parts": 0,
+            "seconds": 0.0,
+            "completed": False
+        }
+        if not os.path.exists(self.progress_path):
+            return fresh
+
+        with open(self.progress_path, "r", encoding="utf-8") as f:
+            progress = json.load(f)
+        if progress["input"] == fresh["input"] and progress["config"] == self.config:
+            return progress
+        if not self.overwrite:
+            raise ValueError(f"출력 디렉터리에 다른 입력/설정의 작업이 있습니다: {self.output_dir} (--overwrite로 새로 시작)")
+        for path in glob.glob(os.path.join(self.output_dir, "part-*.parquet")):
+            os.remove(path)
+        return fresh
+
+    def _save_progress(self, progress: Dict[str, Any]):
+        tmp_path = f"{self.progress_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(progress, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.progress_path)
+
+    def _write_part(self, index: int, rows: List[Dict[str, Any]]):
+        """파트 파일 기록 (중단 후 재개 시 같은 번호 파트를 덮어쓰므로 중복 행이 생기지 않음)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.output_dir, PART_PATTERN.format(index))
+        tmp_path = f"{path}.tmp"
+        pq.write_table(pa.Table.from_pylist(rows), tmp_path)
+        os.replace(tmp_path, path)
+
+    def run(self, process_chunk: Callable[[List[Dict[str, Any]], int], List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        process_chunk(records, start_row) -> 출력 행 리스트
+        청크 결과를 파트로 기록한 뒤에 진행 상황을 갱신 (파트 기록 전 중단되면 그 청크부터 다시 처리)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        progress = self._load_progress()
+        if progress["completed"]:
+            logger.info(f"✅ 이미 완료된 작업입니다: {self.output_dir} ({progress['rows_done']}행)")
+            return progress
+        if progress["rows_done"]:
+            logger.info(f"⏯️ 이어서 처리 - {progress['rows_done']}행 / 파트 {progress['parts']}개 완료")
+
+        for records in prefetch(iter_records(self.input_path, self.chunk_size, progress["rows_done"])):
+            started = time.perf_counter()
+            rows = process_chunk(records, progress["rows_done"])
+            self._write_part(progress["parts"], rows)
+            elapsed = time.perf_counter() - started
+
+            progress["rows_done"] += len(records)
+            progress["parts"] += 1
+            progress["seconds"] = round(progress["seconds"] + elapsed, 2)
+            self._save_progress(progress)
+            logger.info(f"💾 파트 {progress['parts'] - 1} 기록 - 누적 {progress['rows_done']}행 ({len(records) / elapsed:.1f}행/초)")
+
+        progress["completed"] = True
+        self._save_progress(progress)
+        return progress
+
+def record_id(record: Dict[str, Any], id_field: str, row: int) -> Any:
+    """출력 행 식별자 (id 필드가 없으면 입력 행 번호)"""
+    value = record.get(id_field)
+    return row if value is None else value
+
+def keep_fields(record: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """출력에 그대로 복사할 입력 필드"""
+    return {field: record.get(field) for field in fields or []}
@@ -0,0 +1,220 @@
+"""
+연속 배칭(continuous batching) 디코딩 상태
+토큰 단위로 배치를 진행하면서 새 요청은 다음 토큰 경계에 합류하고
+끝난 시퀀스는 즉시 빠져 KV 캐시 슬롯을 다음 요청이 재사용
+"""
+import time
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import torch
+from transformers import (
+    LogitsProcessorList,
+    NoRepeatNGramLogitsProcessor,
+    RepetitionPenaltyLogitsProcessor,
+    TemperatureLogitsWarper,
+    TopPLogitsWarper
+)
+
+logger = logging.getLogger(__name__)
+
+class GenerationRequest:
+    """배치 안의 시퀀스 1개 (프롬프트 토큰, 생성 설정, 생성된 토큰)"""
+
+    def __init__(self, prompt_ids: List[int], max_new_tokens: int, temperature: float, top_p: float,
+                 seed: Optional[int] = None, handle=None):
+        self.prompt_ids = prompt_ids
+        self.max_new_tokens = max(1, max_new_tokens)
+        self.greedy = not temperature or temperature <= 0
+        self.seed = seed
+        self.generator: Optional[torch.Generator] = None  # 시드 고정 시 요청별 난수 생성기 (같이 묶인 요청과 무관하게 재현)
+        self.cancelled = False  # 클라이언트 연결 종료 시 다음 스텝에서 배치에서 제거
+        self.stream = None  # 스트리밍 요청이면 스케줄러가 텍스트 조각을 넣는 asyncio.Queue
+        self.text = ""  # 지금까지 생성된 토큰의 디코딩 결과 (조기 종료 판정/스트리밍에 사용)
+        self.emitted_text = ""
+        self.handle = handle  # 스케줄러가 결과를 돌려줄 때 쓰는 식별자 (Future 등)
+        self.generated_ids: List[int] = []
+        self.enqueued_at = time.perf_counter()
+        self.processors = LogitsProcessorList([
+            RepetitionPenaltyLogitsProcessor(1.1),
+            NoRepeatNGramLogitsProcessor(3),
+        ])
+        if not self.greedy:
+            self.processors.append(TemperatureLogitsWarper(temperature))
+            self.processors.append(TopPLogitsWarper(top_p))
+
+class ContinuousBatch:
+    """
+    KV 캐시를 공유하는 실행 중 배치
+    - 행(row) = 시퀀스 1개, 모든 텐서는 left padding으로 마지막 열이 정렬됨
+    - join(): 새 요청 프리필 후 KV 캐시를 왼쪽 패딩으로 맞춰 배치 차원에 이어붙임
+    - step(): 행별 샘플링 -> 끝난 행 제거 -> 남은 행만 1토큰 forward
+    - stop_fn(text)이 True를 반환하면 eos 전이라도 종료 (줄바꿈/문장 끝/글자 수 상한)
+    """
+
+    def __init__(self, model, tokenizer, stop_fn: Optional[Callable[[str], bool]] = None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.stop_fn = stop_fn
+        self.pad_token_id = tokenizer.pad_token_id
+        self.eos_token_id = tokenizer.eos_token_id
+        self.device = next(model.parameters()).device
+        self.reset()
+
+    def reset(self):
+        """배치 비우기 (KV 캐시 해제)"""
+        self.requests: List[GenerationRequest] = []
+        self.input_ids: Optional[torch.Tensor] = None
+        self.attention_mask: Optional[torch.Tensor] = None
+        self.past_key_values = None
+        self.next_logits: Optional[torch.Tensor] = None
+
+    def __len__(self) -> int:
+        return len(self.requests)
+
+    @staticmethod
+    def _legacy_cache(past) -> Tuple:
+        """Cache 객체로 반환되는 버전 대비 (layer별 (key, value) 튜플로 통일)"""
+        return past.to_legacy_cache() if hasattr(past, "to_legacy_cache") else past
+
+    @staticmethod
+    def _left_pad(tensor: torch.Tensor, width: int, dim: int, value=0) -> torch.Tensor:
+        """dim 축 앞쪽을 value로 채워 길이를 width로 맞춤"""
+        missing = width - tensor.shape[dim]
+        if missing <= 0:
+            return tensor
+        shape = list(tensor.shape)
+        shape[dim] = missing
+        return torch.cat([tensor.new_full(shape, value), tensor], dim=dim)
+
+    def _forward(self, input_ids: torch.Tensor, position_ids: torch.Tensor, past_key_values):
+        """캐시를 이어받아 1토큰 forward, 마지막 위치 logits와 갱신된 캐시 반환"""
+        with torch.inference_mode():
+            outputs = self.model(
+                input_ids=input_ids,
+                attention_mask=self.attention_mask,
+                position_ids=position_ids,
+                past_key_values=past_key_values,
+                use_cache=True
+            )
+        return outputs.logits[:, -1, :].float(), self._legacy_cache(outputs.past_key_values)
+
+    def join(self, new_requests: List[GenerationRequest]):
+        """새 요청들을 프리필하여 실행 중 배치에 합류 (다음 step부터 함께 디코딩)"""
+        if not new_requests:
+            return
+
+        padded = self.tokenizer.pad(
+            {"input_ids": [request.prompt_ids for request in new_requests]},
+            padding=True,
+            return_tensors="pt"
+        )
+        input_ids = padded["input_ids"].to(self.device)
+        attention_mask = padded["attention_mask"].to(self.device)
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+
+        with torch.inference_mode():
+            outputs = self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                use_cache=True
+            )
+        logits = outputs.logits[:, -1, :].float()
+        past = self._legacy_cache(outputs.past_key_values)
+
+        if not self.requests:
+            self.input_ids, self.attention_mask, self.past_key_values, self.next_logits = input_ids, attention_mask, past, logits
+        else:
+            # 시퀀스 축(dim=-2 for KV, dim=1 for ids/mask)을 더 긴 쪽에 맞춰 왼쪽 패딩 후 배치 축으로 연결
+            width = max(self.input_ids.shape[1], input_ids.shape[1])
+            self.input_ids = torch.cat([
+                self._left_pad(self.input_ids, width, 1, self.pad_token_id),
+                self._left_pad(input_ids, width, 1, self.pad_token_id)
+            ], dim=0)
+            self.attention_mask = torch.cat([
+                self._left_pad(self.attention_mask, width, 1),
+                self._left_pad(attention_mask, width, 1)
+            ], dim=0)
+            self.past_key_values = tuple(
+                tuple(
+                    torch.cat([self._left_pad(old, width, 2), self._left_pad(new, width, 2)], dim=0)
+                    for old, new in zip(old_layer, new_layer)
+                )
+                for old_layer, new_layer in zip(self.past_key_values, past)
+            )
+            self.next_logits = torch.cat([self.next_logits, logits], dim=0)
+
+        self.requests.extend(new_requests)
+
+    def _sample(self) -> torch.Tensor:
+        """행별 생성 설정(반복 패널티, 온도, top-p)을 적용하여 다음 토큰 선택 (greedy면 argmax)"""
+        next_tokens = []
+        for row, request in enumerate(self.requests):
+            scores = request.processors(self.input_ids[row:row + 1], self.next_logits[row:row + 1])
+            if request.greedy:
+                next_tokens.append(scores.argmax(dim=-1, keepdim=True))
+                continue
+            if request.seed is not None and request.generator is None:
+                request.generator = torch.Generator(device=self.device).manual_seed(request.seed)
+            probs = torch.softmax(scores, dim=-1)
+            next_tokens.append(torch.multinomial(probs, num_samples=1, generator=request.generator))
+        return torch.cat(next_tokens, dim=0).squeeze(-1)
+
+    def _select_rows(self, keep: List[int]):
+        """남길 행만 선택하고 모든 행이 패딩인 앞쪽 열을 잘라 KV 캐시 크기 회수"""
+        index = torch.tensor(keep, device=self.device)
+        self.requests = [self.requests[i] for i in keep]
+        self.input_ids = self.input_ids.index_select(0, index)
+        self.attention_mask = self.attention_mask.index_select(0, index)
+        self.past_key_values = tuple(
+            tuple(tensor.index_select(0, index) for tensor in layer)
+            for layer in self.past_key_values
+        )
+
+        used_columns = (self.attention_mask.sum(dim=0) > 0).nonzero()
+        start = int(used_columns[0]) if len(used_columns) else 0
+        if start > 0:
+            self.input_ids = self.input_ids[:, start:]
+            self.attention_mask = self.attention_mask[:, start:]
+            self.past_key_values = tuple(
+                tuple(tensor[:, :, start:, :] for tensor in layer)
+                for layer in self.past_key_values
+            )
+
+    def step(self) -> List[GenerationRequest]:
+        """
+        토큰 1개 진행
+        Returns: 이번 스텝에 끝난 요청 리스트 (eos, max_new_tokens 도달, 조기 종료 조건 또는 취소)
+        """
+        if not self.requests:
+            return []
+
+        next_tokens = self._sample()
+        self.input_ids = torch.cat([self.input_ids, next_tokens[:, None]], dim=1)
+        self.attention_mask = torch.cat([self.attention_mask, torch.ones_like(next_tokens)[:, None]], dim=1)
+
+        finished, keep = [], []
+        for row, (request, token) in enumerate(zip(self.requests, next_tokens.tolist())):
+            if request.cancelled or token == self.eos_token_id:
+                finished.append(request)
+                continue
+            request.generated_ids.append(token)
+            request.text = self.tokenizer.decode(request.generated_ids, skip_special_tokens=True)
+            if len(request.generated_ids) >= request.max_new_tokens or (self.stop_fn is not None and self.stop_fn(request.text)):
+                finished.append(request)
+            else:
+                keep.append(row)
+
+        if not keep:
+            self.reset()
+            return finished
+
+        if finished:
+            next_tokens = next_tokens[keep]
+            self._select_rows(keep)
+
+        # 마지막 토큰만 입력, 위치는 행별 실제 토큰 수 기준 (left padding 보정)
+        position_ids = (self.attention_mask.sum(dim=-1, keepdim=True) - 1)
+        self.next_logits, self.past_key_values = self._forward(next_tokens[:, None], position_ids, self.past_key_values)
+        return finished
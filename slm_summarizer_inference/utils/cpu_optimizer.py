@@ -0,0 +1,65 @@
+"""
+CPU 추론 최적화 유틸리티
+KoGPT2(+LoRA 병합) 모델을 int8 동적 양자화하여 GPU 없는 노드에서 서빙
+"""
+import os
+import logging
+import torch
+from transformers.pytorch_utils import Conv1D
+
+logger = logging.getLogger(__name__)
+
+def configure_cpu_threads(num_threads: int = 0) -> int:
+    """
+    PyTorch CPU 스레드 수 설정
+    0이면 물리 코어 수 기준 (하이퍼스레딩 코어는 행렬 연산에서 이득이 적음)
+    """
+    if num_threads <= 0:
+        try:
+            import psutil
+            num_threads = psutil.cpu_count(logical=False) or os.cpu_count() or 1
+        except ImportError:
+            num_threads = os.cpu_count() or 1
+
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)  # 요청 1개씩 generate하므로 inter-op 병렬은 불필요
+    except RuntimeError:
+        # 이미 병렬 작업이 시작된 뒤에는 변경 불가 (재로딩 시)
+        pass
+
+    logger.info(f"🧵 CPU 스레드 설정: intra-op {num_threads}")
+    return num_threads
+
+def conv1d_to_linear(module: torch.nn.Module) -> torch.nn.Module:
+    """
+    GPT2 계열의 transformers Conv1D를 동일한 nn.Linear로 교체
+    (torch 동적 양자화는 nn.Linear만 대상으로 하므로 양자화 전에 필요)
+    Conv1D: y = x @ W + b (W: [in, out]) -> Linear: y = x @ W.T + b (W: [out, in])
+    """
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            in_features, out_features = child.weight.shape
+            linear = torch.nn.Linear(in_features, out_features)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data.clone()
+            setattr(module, name, linear)
+        else:
+            conv1d_to_linear(child)
+    return module
+
+def quantize_for_cpu(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    트랜스포머 블록의 Linear 가중치를 int8 동적 양자화
+    lm_head는 임베딩과 가중치를 공유하므로 요약 품질 보존을 위해 fp32 유지
+    """
+    model = model.float().eval()
+    base = getattr(model, model.base_model_prefix, model)
+    conv1d_to_linear(base)
+    quantized = torch.quantization.quantize_dynamic(base, {torch.nn.Linear}, dtype=torch.qint8)
+    if base is not model:
+        setattr(model, model.base_model_prefix, quantized)
+        logger.info("✅ int8 동적 양자화 완료 (lm_head 제외)")
+        return model
+    logger.info("✅ int8 동적 양자화 완료")
+    return quantized
@@ -0,0 +1,107 @@
+"""
+추론 메모리 관리자
+요청마다 캐시를 비우지 않고 고수위(high-water) 초과 시에만 정리하며,
+남은 메모리로 동시에 생성할 수 있는 시퀀스 수를 제한
+"""
+import gc
+import logging
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+class MemoryManager:
+    """
+    GPU(할당/예약) 또는 CPU(RSS) 메모리 모니터
+    - maybe_flush(): 사용량이 high_water 비율을 넘을 때만 empty_cache / gc 실행
+    - max_concurrent(): 남은 메모리 / 시퀀스당 KV 캐시 추정치로 동시 생성 수 상한 계산
+    """
+
+    def __init__(self, device: str, high_water: float = 0.85):
+        self.device = device
+        self.high_water = min(max(high_water, 0.1), 0.99)
+        self.sequence_bytes_per_token = 0
+        self.flush_count = 0
+        self.forced_flush_count = 0
+
+    @property
+    def is_cuda(self) -> bool:
+        return self.device.startswith("cuda")
+
+    def configure_model(self, config, dtype_bytes: int = 2):
+        """모델 설정으로 토큰당 KV 캐시 크기 추정 (key + value) x 레이어 수 x hidden 크기"""
+        n_layer = getattr(config, "n_layer", getattr(config, "num_hidden_layers", 12))
+        n_embd = getattr(config, "n_embd", getattr(config, "hidden_size", 768))
+        self.sequence_bytes_per_token = 2 * n_layer * n_embd * dtype_bytes
+
+    def snapshot(self) -> dict:
+        """현재 메모리 사용량 (GB)"""
+        if self.is_cuda:
+            total = torch.cuda.get_device_properties(0).total_memory
+            return {
+                "device": self.device,
+                "allocated": torch.cuda.memory_allocated(0) / 1e9,
+                "reserved": torch.cuda.memory_reserved(0) / 1e9,
+                "max_allocated": torch.cuda.max_memory_allocated(0) / 1e9,
+                "total": total / 1e9,
+            }
+
+        import psutil
+        rss = psutil.Process().memory_info().rss
+        virtual = psutil.virtual_memory()
+        return {
+            "device": self.device,
+            "rss": rss / 1e9,
+            "available": virtual.available / 1e9,
+            "total": virtual.total / 1e9,
+        }
+
+    def _usage_ratio(self, snapshot: dict) -> float:
+        """고수위 판단 기준 사용률 (GPU는 예약 메모리, CPU는 시스템 전체 사용량)"""
+        if self.is_cuda:
+            return snapshot["reserved"] / snapshot["total"] if snapshot["total"] else 0.0
+        return 1.0 - snapshot["available"] / snapshot["total"] if snapshot["total"] else 0.0
+
+    def maybe_flush(self, force: bool = False) -> bool:
+        """고수위 초과(또는 OOM 직후 force) 시에만 캐시 정리, 정리했으면 True"""
+        snapshot = self.snapshot()
+        ratio = self._usage_ratio(snapshot)
+        if not force and ratio < self.high_water:
+            return False
+
+        gc.collect()
+        if self.is_cuda:
+            torch.cuda.empty_cache()
+        self.flush_count += 1
+        if force:
+            self.forced_flush_count += 1
+        logger.info(f"🧹 메모리 정리 실행 (사용률 {ratio * 100:.1f}%, 고수위 {self.high_water * 100:.0f}%, force={force})")
+        return True
+
+    def max_concurrent(self, tokens_per_sequence: int, upper: int) -> int:
+        """
+        고수위까지 남은 메모리로 동시에 생성 가능한 시퀀스 수 (1 ~ upper)
+        모델 설정 전이거나 추정이 불가능하면 upper 그대로
+        """
+        if not self.sequence_bytes_per_token or tokens_per_sequence <= 0:
+            return upper
+
+        snapshot = self.snapshot()
+        if self.is_cuda:
+            headroom = snapshot["total"] * self.high_water - snapshot["allocated"]
+        else:
+            headroom = snapshot["available"] - snapshot["total"] * (1.0 - self.high_water)
+
+        per_sequence = self.sequence_bytes_per_token * tokens_per_sequence / 1e9
+        return max(1, min(upper, int(headroom / per_sequence)))
+
+    def get_stats(self) -> dict:
+        """스냅샷 + 정책 설정 + 정리 횟수"""
+        snapshot = self.snapshot()
+        return {
+            **{key: round(value, 3) if isinstance(value, float) else value for key, value in snapshot.items()},
+            "usage_ratio": round(self._usage_ratio(snapshot), 4),
+            "high_water": self.high_water,
+            "flush_count": self.flush_count,
+            "forced_flush_count": self.forced_flush_count,
+        }
@@ -1,34 +1,85 @@
 """
 GPU 최적화 뉴스 요약 모델 예측기 
 RTX 2080 + bitsandbytes 4bit 양자화 지원
+GPU가 없는 노드에서는 LoRA 병합 + int8 동적 양자화 CPU 백엔드로 동작
 """
 import os
 import gc
+import contextlib
+import json
+import hashlib
+import time
+import threading
 import torch
 import logging
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
 from transformers import (
     AutoModelForCausalLM,
     AutoTokenizer,
-    BitsAndBytesConfig
+    BitsAndBytesConfig,
+    StoppingCriteriaList,
+    TextIteratorStreamer
 )
 from peft import PeftModel
+from .cpu_optimizer import configure_cpu_threads, quantize_for_cpu
+from .memory_manager import MemoryManager
+from .stopping import CancelledCriteria, SummaryStoppingCriteria, should_stop
 
 logger = logging.getLogger(__name__)
 
+# 배치 생성 설정
+MAX_BATCH_SIZE = int(os.getenv("SUMMARIZER_MAX_BATCH_SIZE", "8"))  # generate 1회당 최대 기사 수
+MAX_BATCH_TOKENS = int(os.getenv("SUMMARIZER_MAX_BATCH_TOKENS", "4096"))  # 배치 크기 x (프롬프트 + 생성 길이) 상한
+
+# 디바이스 설정 (auto | cuda | cpu)
+DEVICE = os.getenv("SUMMARIZER_DEVICE", "auto").lower()
+CPU_THREADS = int(os.getenv("SUMMARIZER_CPU_THREADS", "0"))  # 0이면 물리 코어 수
+CPU_QUANTIZE = os.getenv("SUMMARIZER_CPU_QUANTIZE", "true").lower() == "true"  # CPU에서 int8 동적 양자화
+
+# 메모리 정책: 사용률이 고수위를 넘을 때만 캐시 정리, 남은 메모리로 동시 생성 수 제한
+MEMORY_HIGH_WATER = float(os.getenv("SUMMARIZER_MEMORY_HIGH_WATER", "0.85"))
+
+# 결정적 생성 모드 (off | greedy | seed): 같은 입력이면 같은 요약 -> 결과 캐시 가능
+DETERMINISTIC_MODE = os.getenv("SUMMARIZER_DETERMINISTIC_MODE", "off").lower()
+GENERATION_SEED = int(os.getenv("SUMMARIZER_SEED", "42"))
+_SEEDED_RNG_LOCK = threading.Lock()  # 시드 샘플링은 전역 RNG를 쓰므로 한 번에 하나씩
+
+# 조기 종료: 한 문장 요약이므로 줄바꿈/문장 끝/글자 수 상한에서 생성 중단
+STOP_ON_SENTENCE_END = os.getenv("SUMMARIZER_STOP_ON_SENTENCE_END", "true").lower() == "true"
+MAX_SUMMARY_CHARS = int(os.getenv("SUMMARIZER_MAX_SUMMARY_CHARS", "200"))
+
+# 보조(assisted/speculative) 디코딩용 소형 draft 모델 (같은 토크나이저, 비우면 사용 안 함)
+DRAFT_MODEL_NAME = os.getenv("SUMMARIZER_DRAFT_MODEL", "")
+
+# 어댑터 병합 모델 (slm_summarizer_training/merge_adapter.py 산출물, 있으면 PeftModel 대신 우선 사용)
+MERGED_MODEL_PATH = os.getenv("SUMMARIZER_MERGED_MODEL_PATH", "/app/slm_summarizer_training/outputs/merged")
+MERGED_WEIGHTS_FILENAME = "model.safetensors"
+MERGE_INFO_FILENAME = "merge_info.json"
+
 class SummarizerPredictor:
-    """GPU 최적화 요약 모델 예측기 (RTX 2080 전용)"""
+    """요약 모델 예측기 (RTX 2080 GPU 4bit / CPU int8)"""
     
-    def __init__(self):
+    def __init__(self, device: Optional[str] = None):
         self.model = None
         self.tokenizer = None
+        self.draft_model = None
+        self.max_batch_size = max(1, MAX_BATCH_SIZE)
+        self.max_batch_tokens = MAX_BATCH_TOKENS
+        
+        self.generation_stats = {"generated_tokens": 0, "generate_seconds": 0.0}
         
-        # GPU 강제 설정 (RTX 2080)
-        if not torch.cuda.is_available():
+        # 디바이스 선택 (GPU가 없으면 CPU 백엔드)
+        requested = (device or DEVICE).lower()
+        if requested == "cuda" and not torch.cuda.is_available():
             raise RuntimeError("❌ CUDA GPU가 필요합니다. RTX 2080이 감지되지 않았습니다.")
         
-        self.device = "cuda:0"
-        torch.cuda.set_device(0)  # RTX 2080 선택
+        if requested != "cpu" and torch.cuda.is_available():
+            self.device = "cuda:0"
+            torch.cuda.set_device(0)  # RTX 2080 선택
+        else:
+            self.device = "cpu"
+        
+        self.memory = MemoryManager(self.device, high_water=MEMORY_HIGH_WATER)
         
         self.base_model_name = "skt/kogpt2-base-v2"  # KoGPT2 한국어 생성 모델
         
@@ -41,16 +92,25 @@ class SummarizerPredictor:
             self.model_path = "./outputs"  # 폴백 경로
             logger.warning(f"⚠️ 학습된 어댑터 없음, 베이스 모델 사용")
         
-        logger.info(f"🚀 GPU 환경 초기화 완료: {torch.cuda.get_device_name(0)}")
-        logger.info(f"💾 GPU 메모리: {torch.cuda.get_device_properties(0).total_memory / 1e9:.1f}GB")
+        self.merged_model_path = MERGED_MODEL_PATH
+        self._merge_check = None  # ((어댑터 경로, 크기, 수정 시각, merge_info 수정 시각), 일치 여부)
+        if self.has_merged_model:
+            logger.info(f"🧩 병합 모델 발견 (어댑터 병합 완료본 우선 사용): {self.merged_model_path}")
+        
+        if self.device.startswith("cuda"):
+            logger.info(f"🚀 GPU 환경 초기화 완료: {torch.cuda.get_device_name(0)}")
+            logger.info(f"💾 GPU 메모리: {torch.cuda.get_device_properties(0).total_memory / 1e9:.1f}GB")
+        else:
+            logger.info("🧮 CPU 환경 초기화 완료 (LoRA 병합 + int8 동적 양자화)")
         
     async def load_model(self):
-        """RTX 2080 GPU 최적화 모델 로딩"""
+        """RTX 2080 GPU 최적화 모델 로딩 (GPU가 없으면 CPU 백엔드)"""
         try:
-            logger.info("🔄 GPU 기반 KoGPT2 모델 로딩 시작...")
+            logger.info(f"🔄 KoGPT2 모델 로딩 시작... ({self.device})")
             
             # GPU 메모리 정리
-            torch.cuda.empty_cache()
+            if self.device.startswith("cuda"):
+                torch.cuda.empty_cache()
             gc.collect()
             
             # RTX 2080 최적화 4bit 양자화 설정
@@ -87,11 +147,21 @@ class SummarizerPredictor:
                 logger.error(f"❌ 토크나이저 로딩 실패: {e}")
                 raise
             
+            if self.device == "cpu":
+                self.model = self._load_cpu_model()
+                self.memory.configure_model(self.model.config, dtype_bytes=4)
+                self._load_draft_model()
+                logger.info("🎉 CPU 최적화 KoGPT2 모델 로딩 완료!")
+                return
+            
+            # 병합 모델이 있으면 어댑터 래핑 없이 바로 로딩
+            model_source = self.merged_model_path if self.has_merged_model else self.base_model_name
+            
             # RTX 2080 최적화 베이스 모델 로딩 (단순화된 방식)
-            logger.info("🤖 KoGPT2 베이스 모델 로딩 (GPU + 4bit)...")
+            logger.info(f"🤖 KoGPT2 모델 로딩 (GPU + 4bit): {model_source}")
             try:
                 base_model = AutoModelForCausalLM.from_pretrained(
-                    self.base_model_name,
+                    model_source,
                     quantization_config=bnb_config,
                     device_map="auto",  # RTX 2080에 자동 배치
                     torch_dtype=torch.float16,
@@ -106,7 +176,7 @@ class SummarizerPredictor:
                 # 폴백: 4bit 없이 GPU만 사용
                 logger.info("🔄 4bit 없이 GPU 모드로 재시도...")
                 base_model = AutoModelForCausalLM.from_pretrained(
-                    self.base_model_name,
+                    model_source,
                     torch_dtype=torch.float16,
                     device_map="auto",
                     low_cpu_mem_usage=True,
@@ -114,7 +184,9 @@ class SummarizerPredictor:
                 )
             
             # LoRA 어댑터 확인 및 로딩
-            if os.path.exists(self.model_path) and os.path.exists(os.path.join(self.model_path, "adapter_config.json")):
+            if self.has_merged_model:
+                self.model = base_model
+            elif os.path.exists(self.model_path) and os.path.exists(os.path.join(self.model_path, "adapter_config.json")):
                 logger.info(f"🔗 LoRA 어댑터 로딩: {self.model_path}")
                 self.model = PeftModel.from_pretrained(base_model, self.model_path)
             else:
@@ -130,6 +202,8 @@ class SummarizerPredictor:
             memory_allocated = torch.cuda.memory_allocated(0) / 1e9
             memory_reserved = torch.cuda.memory_reserved(0) / 1e9
             logger.info(f"🎯 GPU 메모리 사용량: {memory_allocated:.2f}GB / {memory_reserved:.2f}GB")
+            self.memory.configure_model(self.model.config, dtype_bytes=2)
+            self._load_draft_model()
             
             logger.info("🎉 GPU 최적화 KoGPT2 모델 로딩 완료!")
             
@@ -137,6 +211,60 @@ class SummarizerPredictor:
             logger.error(f"💥 GPU 모델 로딩 실패: {str(e)}")
             raise e
     
+    def _load_draft_model(self):
+        """
+        보조 디코딩용 draft 모델 로딩 (SUMMARIZER_DRAFT_MODEL 지정 시)
+        draft가 여러 토큰을 먼저 제안하고 본 모델이 한 번에 검증 -> 단일 요청 지연 감소
+        어휘가 다르면 검증이 불가능하므로 사용하지 않음
+        """
+        if not DRAFT_MODEL_NAME:
+            return
+        try:
+            draft = AutoModelForCausalLM.from_pretrained(
+                DRAFT_MODEL_NAME,
+                torch_dtype=torch.float16 if self.device.startswith("cuda") else torch.float32,
+                low_cpu_mem_usage=True,
+                token=os.getenv("HUGGINGFACE_HUB_TOKEN")
+            ).to(self.device).eval()
+        except Exception as e:
+            logger.warning(f"⚠️ draft 모델 로딩 실패, 보조 디코딩 없이 진행: {e}")
+            return
+        
+        if draft.config.vocab_size != self.model.config.vocab_size:
+            logger.warning(f"⚠️ draft 모델 어휘 크기 불일치 ({draft.config.vocab_size} != {self.model.config.vocab_size}), 보조 디코딩 비활성화")
+            return
+        self.draft_model = draft
+        logger.info(f"🏎️ 보조 디코딩 draft 모델 로딩 완료: {DRAFT_MODEL_NAME}")
+    
+    def _load_cpu_model(self):
+        """
+        CPU 백엔드 모델 로딩
+        - 병합 모델이 있으면 그대로, 없으면 fp32 베이스 모델에 LoRA 어댑터를 병합하여 PEFT 우회 비용 제거
+        - 트랜스포머 블록 int8 동적 양자화 + 스레드 수 조정
+        """
+        configure_cpu_threads(CPU_THREADS)
+        
+        model_source = self.merged_model_path if self.has_merged_model else self.base_model_name
+        logger.info(f"🤖 KoGPT2 모델 로딩 (CPU + fp32): {model_source}")
+        model = AutoModelForCausalLM.from_pretrained(
+            model_source,
+            torch_dtype=torch.float32,
+            low_cpu_mem_usage=True,
+            token=os.getenv("HUGGINGFACE_HUB_TOKEN")
+        )
+        
+        if not self.has_merged_model:
+            if os.path.exists(self.model_path) and os.path.exists(os.path.join(self.model_path, "adapter_config.json")):
+                logger.info(f"🔗 LoRA 어댑터 병합: {self.model_path}")
+                model = PeftModel.from_pretrained(model, self.model_path).merge_and_unload()
+            else:
+                logger.warning(f"⚠️ LoRA 어댑터 없음, 베이스 모델 사용: {self.model_path}")
+        
+        if CPU_QUANTIZE:
+            model = quantize_for_cpu(model)
+        
+        return model.eval()
+    
     async def generate_summary(
         self,
         title: str,
@@ -145,62 +273,240 @@ class SummarizerPredictor:
         temperature: float = 0.7,
         top_p: float = 0.9
     ) -> str:
-        """GPU 최적화 요약 생성"""
-        try:
-            if self.model is None or self.tokenizer is None:
-                raise ValueError("❌ 모델이 로드되지 않았습니다")
-            
-            # 프롬프트 구성
-            prompt = self._create_prompt(title, description)
-            
-            # GPU 토크나이징
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                truncation=True,
-                max_length=400,  # 입력 길이 제한 (RTX 2080 최적화)
-                padding=True
+        """GPU 최적화 요약 생성 (단일 뉴스는 크기 1 배치로 처리)"""
+        result = (await self.generate_summaries(
+            [(title, description)],
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p
+        ))[0]
+        
+        if result["error"]:
+            return f"요약 생성 중 오류 발생: {result['error']}"
+        return result["summary"] if result["summary"] else "요약을 생성할 수 없습니다."
+    
+    async def generate_summaries(
+        self,
+        news_list: List[Tuple[str, str]],
+        max_new_tokens: int = 100,
+        temperature: float = 0.7,
+        top_p: float = 0.9
+    ) -> List[Dict[str, Optional[str]]]:
+        """
+        배치 요약 생성
+        - 프롬프트 길이순으로 버킷을 나눠 짧은/긴 기사가 같이 패딩되지 않도록 함
+        - 버킷별로 left padding 후 generate 1회 (끝난 시퀀스는 eos 이후 pad로 채워짐)
+        - 결과는 입력 순서대로 {"summary", "error"} 리스트로 반환
+        """
+        if self.model is None or self.tokenizer is None:
+            raise ValueError("❌ 모델이 로드되지 않았습니다")
+        
+        params = self.resolve_generation_params(max_new_tokens, temperature, top_p)
+        encoded = self.encode_prompts(news_list)
+        
+        results: List[Dict[str, Optional[str]]] = [None] * len(encoded)
+        out_of_memory = False
+        for bucket in self._build_length_buckets(encoded, max_new_tokens):
+            try:
+                summaries = self._generate_bucket([encoded[i] for i in bucket], **params)
+                for i, summary in zip(bucket, summaries):
+                    results[i] = {"summary": summary, "error": None}
+            except Exception as e:
+                logger.error(f"❌ GPU 요약 생성 실패 ({len(bucket)}개 배치): {str(e)}")
+                out_of_memory = out_of_memory or "out of memory" in str(e).lower()
+                for i in bucket:
+                    results[i] = {"summary": "", "error": str(e)}
+        
+        # 매 호출 정리 대신 고수위 초과 또는 OOM 직후에만 정리 (할당자 캐시 재사용)
+        self.memory.maybe_flush(force=out_of_memory)
+        
+        return results
+    
+    def start_stream(
+        self,
+        title: str,
+        description: str,
+        max_new_tokens: int = 100,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        cancel_event: Optional[threading.Event] = None
+    ) -> TextIteratorStreamer:
+        """
+        (연속 배칭 미사용 시) 별도 스레드에서 generate를 실행하고 텍스트 조각을 내보내는 streamer 반환
+        cancel_event가 설정되면 다음 토큰 경계에서 생성 중단
+        """
+        if self.model is None or self.tokenizer is None:
+            raise ValueError("❌ 모델이 로드되지 않았습니다")
+        
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=120)
+        kwargs = {
+            **self.resolve_generation_params(max_new_tokens, temperature, top_p),
+            "streamer": streamer,
+            "stopping_criteria": StoppingCriteriaList([CancelledCriteria(cancel_event or threading.Event())])
+        }
+        
+        def _worker():
+            try:
+                self._generate_bucket(self.encode_prompts([(title, description)]), **kwargs)
+            except Exception as e:
+                logger.error(f"❌ 스트리밍 요약 생성 실패: {e}")
+                streamer.end()  # 소비자가 무한 대기하지 않도록 종료 신호
+        
+        threading.Thread(target=_worker, name="summarizer-stream", daemon=True).start()
+        return streamer
+    
+    def should_stop(self, text: str) -> bool:
+        """연속 배칭 스케줄러용 조기 종료 판정 (generate의 SummaryStoppingCriteria와 동일 기준)"""
+        return should_stop(text, MAX_SUMMARY_CHARS, STOP_ON_SENTENCE_END)
+    
+    def resolve_generation_params(self, max_new_tokens: int, temperature: float, top_p: float) -> Dict:
+        """
+        결정적 모드를 반영한 실제 생성 파라미터
+        - greedy: temperature 0 (top_p 무의미)
+        - seed: 요청 파라미터 그대로 + 고정 시드
+        """
+        if DETERMINISTIC_MODE == "greedy":
+            return {"max_new_tokens": max_new_tokens, "temperature": 0.0, "top_p": 1.0, "seed": None}
+        seed = GENERATION_SEED if DETERMINISTIC_MODE == "seed" else None
+        return {"max_new_tokens": max_new_tokens, "temperature": temperature, "top_p": top_p, "seed": seed}
+    
+    @property
+    def deterministic(self) -> bool:
+        """같은 입력에 같은 요약을 보장하는 모드인지 여부"""
+        return DETERMINISTIC_MODE in ("greedy", "seed")
+    
+    def get_model_artifact_id(self) -> str:
+        """
+        캐시 키용 모델 아티팩트 식별자 (모델을 로드하지 않고 파일 정보로 계산)
+        병합 모델 또는 어댑터 가중치 파일의 크기/수정 시각 + 디바이스/양자화 설정
+        """
+        candidates = [os.path.join(self.merged_model_path, MERGED_WEIGHTS_FILENAME)] if self.has_merged_model else [
+            os.path.join(self.model_path, "adapter_model.safetensors"),
+            os.path.join(self.model_path, "adapter_model.bin")
+        ]
+        weights = next((path for path in candidates if os.path.exists(path)), None)
+        if weights is None:
+            fingerprint = f"base:{self.base_model_name}"
+        else:
+            stat = os.stat(weights)
+            fingerprint = f"{weights}:{stat.st_size}:{int(stat.st_mtime)}"
+        backend = "cpu-int8" if self.device == "cpu" and CPU_QUANTIZE else self.device
+        return f"{fingerprint}|{backend}"
+    
+    def encode_prompts(self, news_list: List[Tuple[str, str]]) -> List[List[int]]:
+        """(제목, 본문) 리스트를 패딩 없는 프롬프트 토큰 id 리스트로 변환"""
+        prompts = [self._create_prompt(title, description) for title, description in news_list]
+        return self.tokenizer(
+            prompts,
+            truncation=True,
+            max_length=400,  # 입력 길이 제한 (RTX 2080 최적화)
+            padding=False
+        )["input_ids"]
+    
+    def _build_length_buckets(self, encoded: List[List[int]], max_new_tokens: int) -> List[List[int]]:
+        """
+        길이 버킷 스케줄러
+        길이순 정렬 후 (배치 크기 x (최대 프롬프트 길이 + 생성 길이))가 max_batch_tokens 이하가 되도록 분할
+        """
+        order = sorted(range(len(encoded)), key=lambda i: len(encoded[i]))
+        # 남은 메모리 기준 동시 생성 상한 (가장 긴 프롬프트 기준 보수적 추정)
+        batch_limit = self.memory.max_concurrent(
+            max((len(ids) for ids in encoded), default=0) + max_new_tokens,
+            self.max_batch_size
+        )
+        buckets, current, current_max = [], [], 0
+        for i in order:
+            new_max = max(current_max, len(encoded[i]))
+            if current and (
+                len(current) >= batch_limit
+                or (new_max + max_new_tokens) * (len(current) + 1) > self.max_batch_tokens
+            ):
+                buckets.append(current)
+                current, new_max = [], len(encoded[i])
+            current.append(i)
+            current_max = new_max
+        if current:
+            buckets.append(current)
+        return buckets
+    
+    def _generate_bucket(
+        self,
+        input_ids: List[List[int]],
+        max_new_tokens: int,
+        temperature: float,
+        top_p: float,
+        seed: Optional[int] = None,
+        **generate_kwargs
+    ) -> List[str]:
+        """버킷 하나를 left padding 후 generate 1회 실행, 시퀀스별 요약 반환 (generate_kwargs: streamer 등)"""
+        if seed is not None and temperature > 0 and len(input_ids) > 1:
+            # generate는 행별 난수 생성기를 받지 않으므로 시드 샘플링은 요청마다 따로 실행
+            # (같은 버킷에 묶인 다른 요청에 따라 샘플이 달라지지 않도록)
+            return [
+                summary
+                for ids in input_ids
+                for summary in self._generate_bucket([ids], max_new_tokens, temperature, top_p, seed, **generate_kwargs)
+            ]
+        
+        inputs = self.tokenizer.pad(
+            {"input_ids": input_ids},
+            padding=True,
+            return_tensors="pt"
+        )
+        # 입력 텐서를 모델과 같은 디바이스로 이동 (4bit 모델 호환)
+        device = next(self.model.parameters()).device
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+        
+        # temperature 0이면 그리디, 아니면 샘플링
+        sampling = {"do_sample": True, "temperature": temperature, "top_p": top_p} if temperature > 0 else {"do_sample": False}
+        
+        # 줄바꿈/문장 끝/글자 수 상한에서 행별 조기 종료 (취소 조건 등 호출자 조건과 합침)
+        prompt_width = inputs["input_ids"].shape[1]
+        stopping = StoppingCriteriaList([
+            SummaryStoppingCriteria(self.tokenizer, prompt_width, MAX_SUMMARY_CHARS, STOP_ON_SENTENCE_END)
+        ])
+        stopping.extend(generate_kwargs.pop("stopping_criteria", []))
+        
+        # 보조 디코딩은 transformers 제약상 배치 크기 1에서만 사용
+        if self.draft_model is not None and len(input_ids) == 1:
+            generate_kwargs["assistant_model"] = self.draft_model
+        
+        started = time.perf_counter()
+        with torch.no_grad(), self._seeded_rng(seed if sampling["do_sample"] else None, device):
+            outputs = self.model.generate(
+                input_ids=inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                max_new_tokens=max_new_tokens,
+                **sampling,
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id,
+                repetition_penalty=1.1,
+                no_repeat_ngram_size=3,
+                early_stopping=True,
+                use_cache=True,
+                stopping_criteria=stopping,
+                **generate_kwargs
             )
-            # 입력 텐서를 모델과 같은 디바이스로 이동 (4bit 모델 호환)
-            device = next(self.model.parameters()).device
-            inputs = {k: v.to(device) for k, v in inputs.items()}
-            
-            # GPU 추론
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    input_ids=inputs["input_ids"],
-                    attention_mask=inputs["attention_mask"],
-                    max_new_tokens=max_new_tokens,
-                    temperature=temperature,
-                    top_p=top_p,
-                    do_sample=True,
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id,
-                    repetition_penalty=1.1,
-                    no_repeat_ngram_size=3,
-                    early_stopping=True,
-                    use_cache=True
-                )
-            
-            # 결과 디코딩
-            generated_text = self.tokenizer.decode(
-                outputs[0][inputs["input_ids"].shape[1]:], 
-                skip_special_tokens=True
-            ).strip()
-            
-            # 정리
-            summary = self._clean_generated_text(generated_text)
-            
-            # GPU 메모리 정리
-            del inputs, outputs
-            torch.cuda.empty_cache()
-            
-            return summary if summary else "요약을 생성할 수 없습니다."
-            
-        except Exception as e:
-            logger.error(f"❌ GPU 요약 생성 실패: {str(e)}")
-            torch.cuda.empty_cache()  # 에러 시에도 메모리 정리
-            return f"요약 생성 중 오류 발생: {str(e)}"
+        
+        # left padding이므로 모든 행의 프롬프트 폭이 같음 -> 그 뒤가 생성 토큰
+        new_tokens = outputs[:, prompt_width:]
+        self.generation_stats["generated_tokens"] += int((new_tokens != self.tokenizer.pad_token_id).sum().item())
+        self.generation_stats["generate_seconds"] += time.perf_counter() - started
+        generated = self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+        return [self._clean_generated_text(text.strip()) for text in generated]
+    
+    @contextlib.contextmanager
+    def _seeded_rng(self, seed: Optional[int], device: torch.device):
+        """
+        시드 샘플링 동안 전역 RNG를 시드로 고정하고 끝나면 이전 상태로 복구
+        다른 스레드의 시드 샘플링과 섞이지 않도록 락으로 직렬화 (시드가 없으면 아무것도 하지 않음)
+        """
+        if seed is None:
+            yield
+            return
+        with _SEEDED_RNG_LOCK, torch.random.fork_rng(devices=[device] if device.type == "cuda" else []):
+            torch.manual_seed(seed)
+            yield
     
     def _create_prompt(self, title: str, description: str) -> str:
         """KoGPT2 최적화 프롬프트 생성"""
@@ -221,8 +527,8 @@ class SummarizerPredictor:
         cleaned = cleaned.replace('요약:', '').strip()
         
         # 길이 제한 (너무 긴 요약 방지)
-        if len(cleaned) > 200:
-            cleaned = cleaned[:200] + "..."
+        if len(cleaned) > MAX_SUMMARY_CHARS:
+            cleaned = cleaned[:MAX_SUMMARY_CHARS] + "..."
         
         return cleaned
     
@@ -231,23 +537,88 @@ class SummarizerPredictor:
         if self.model is not None:
             del self.model
             self.model = None
+        if self.draft_model is not None:
+            del self.draft_model
+            self.draft_model = None
         if self.tokenizer is not None:
             del self.tokenizer  
             self.tokenizer = None
         
-        torch.cuda.empty_cache()
+        if self.device.startswith("cuda"):
+            torch.cuda.empty_cache()
         gc.collect()
-        logger.info("🗑️ GPU 모델 언로드 완료")
+        logger.info(f"🗑️ 모델 언로드 완료 ({self.device})")
     
     def get_gpu_memory_info(self) -> dict:
-        """GPU 메모리 정보 반환"""
-        if torch.cuda.is_available():
-            return {
-                "allocated": torch.cuda.memory_allocated(0) / 1e9,
-                "reserved": torch.cuda.memory_reserved(0) / 1e9,
-                "total": torch.cuda.get_device_properties(0).total_memory / 1e9
-            }
-        return {}
+        """메모리 정보 반환 (GPU: 할당/예약/전체, CPU: RSS/가용/전체 + 정리 정책 통계)"""
+        return self.memory.get_stats()
+    
+    def get_model_info(self) -> dict:
+        """모델 정보 반환"""
+        return {
+            "base_model": self.base_model_name,
+            "model_path": self.model_path,
+            "merged_model": self.merged_model_path if self.has_merged_model else None,
+            "device": self.device,
+            "max_batch_size": self.max_batch_size,
+            "cpu_quantized": self.device == "cpu" and CPU_QUANTIZE,
+            "draft_model": DRAFT_MODEL_NAME if self.draft_model is not None else None,
+            "stop_on_sentence_end": STOP_ON_SENTENCE_END,
+            "max_summary_chars": MAX_SUMMARY_CHARS,
+            "loaded": self.is_loaded
+        }
+    
+    def get_generation_stats(self) -> dict:
+        """누적 생성 토큰 수 및 토큰/초 (디바이스별 처리량 비교용)"""
+        seconds = self.generation_stats["generate_seconds"]
+        return {
+            "device": self.device,
+            "generated_tokens": self.generation_stats["generated_tokens"],
+            "generate_seconds": round(seconds, 3),
+            "tokens_per_second": round(self.generation_stats["generated_tokens"] / seconds, 2) if seconds else 0.0
+        }
+    
+    @property
+    def has_merged_model(self) -> bool:
+        """현재 어댑터로 만든 병합 모델(단일 safetensors) 존재 여부"""
+        weights = os.path.join(self.merged_model_path, MERGED_WEIGHTS_FILENAME)
+        if not os.path.exists(weights):
+            return False
+        return self._merged_model_matches_adapter()
+    
+    def _merged_model_matches_adapter(self) -> bool:
+        """
+        merge_info.json의 adapter_sha256과 현재 어댑터 파일 해시 비교
+        어댑터를 다시 학습한 뒤 병합을 다시 하지 않았으면 PeftModel 경로로 fallback
+        해시 계산은 어댑터/merge_info 파일이 바뀔 때만 다시 수행 (요청마다 호출되는 캐시 키 계산에서 사용)
+        """
+        adapter = next((path for path in (
+            os.path.join(self.model_path, "adapter_model.safetensors"),
+            os.path.join(self.model_path, "adapter_model.bin")
+        ) if os.path.exists(path)), None)
+        if adapter is None:
+            # 병합 모델만 배포된 경우
+            return True
+        
+        info_path = os.path.join(self.merged_model_path, MERGE_INFO_FILENAME)
+        adapter_stat = os.stat(adapter)
+        stamp = (adapter, adapter_stat.st_size, adapter_stat.st_mtime, os.path.getmtime(info_path) if os.path.exists(info_path) else None)
+        if self._merge_check is not None and self._merge_check[0] == stamp:
+            return self._merge_check[1]
+        
+        recorded = None
+        if os.path.exists(info_path):
+            with open(info_path, "r", encoding="utf-8") as f:
+                recorded = json.load(f).get("adapter_sha256")
+        digest = hashlib.sha256()
+        with open(adapter, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        matches = recorded == digest.hexdigest()
+        if not matches:
+            logger.warning(f"⚠️ 병합 모델이 현재 어댑터와 다릅니다 (재학습 후 미병합), PeftModel로 로딩: {self.merged_model_path}")
+        self._merge_check = (stamp, matches)
+        return matches
     
     @property
     def is_loaded(self) -> bool:
@@ -0,0 +1,49 @@
+"""
+생성 중단 조건 (transformers StoppingCriteria)
+요약은 한 문장이므로 줄바꿈/문장 끝/글자 수 상한에서 바로 멈춰 버려질 디코딩 스텝을 줄임
+"""
+import re
+import threading
+
+import torch
+from transformers import StoppingCriteria
+
+# 숫자 뒤 마침표(예: "8.73%")는 문장 끝으로 보지 않음
+_SENTENCE_END = re.compile(r"[^\d\s][.!?。]$")
+
+def should_stop(text: str, max_chars: int = 200, stop_on_sentence_end: bool = True) -> bool:
+    """
+    생성된 텍스트 기준 중단 여부
+    - 앞쪽 공백/줄바꿈 이후 본문이 시작된 뒤의 줄바꿈 (_clean_generated_text가 첫 줄만 사용)
+    - 문장 종결 부호 (stop_on_sentence_end)
+    - 글자 수 상한 (max_chars)
+    """
+    body = text.lstrip()
+    if not body:
+        return False
+    if "\n" in body or len(body) >= max_chars:
+        return True
+    return stop_on_sentence_end and bool(_SENTENCE_END.search(body.rstrip()))
+
+class SummaryStoppingCriteria(StoppingCriteria):
+    """generate()용 행별 중단 조건 (프롬프트 이후 생성 토큰만 디코딩하여 should_stop 판정)"""
+
+    def __init__(self, tokenizer, prompt_width: int, max_chars: int = 200, stop_on_sentence_end: bool = True):
+        self.tokenizer = tokenizer
+        self.prompt_width = prompt_width
+        self.max_chars = max_chars
+        self.stop_on_sentence_end = stop_on_sentence_end
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        texts = self.tokenizer.batch_decode(input_ids[:, self.prompt_width:], skip_special_tokens=True)
+        done = [should_stop(text, self.max_chars, self.stop_on_sentence_end) for text in texts]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+class CancelledCriteria(StoppingCriteria):
+    """클라이언트 연결 종료 등으로 이벤트가 설정되면 다음 토큰 경계에서 생성 중단"""
+
+    def __init__(self, cancel_event: threading.Event):
+        self.cancel_event = cancel_event
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs) -> torch.BoolTensor:
+        return torch.full((input_ids.shape[0],), self.cancel_event.is_set(), dtype=torch.bool, device=input_ids.device)
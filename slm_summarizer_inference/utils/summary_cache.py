@@ -0,0 +1,132 @@
+"""
+결정적(deterministic) 요약 결과 영구 캐시
+프롬프트 + 모델 아티팩트 + 생성 파라미터 해시를 키로 SQLite에 저장
+- TTL: 저장 후 ttl_seconds가 지난 항목은 조회 시 미스로 처리하고 삭제
+- LRU: 적중할 때마다 last_access를 갱신하고, max_entries를 넘으면 가장 오래 조회되지 않은 항목부터 삭제
+  (주간 파이프라인 재시도로 반복 조회되는 기사가 캐시에 남도록)
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class SummaryCache:
+    """요약 결과 캐시 (그리디/고정 시드 생성일 때만 사용)"""
+
+    def __init__(self, db_path: str, ttl_seconds: int, max_entries: int):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = True
+        self._lock = threading.Lock()  # 연결 하나를 요청 스레드와 이벤트 루프가 같이 사용
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summary_cache ("
+                "cache_key TEXT PRIMARY KEY, summary TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summary_cache_last_access ON summary_cache (last_access)")
+            self._migrate_fifo_table()
+            self._conn.commit()
+            logger.info(f"💾 요약 캐시 초기화 - Path: {self.db_path}, TTL: {self.ttl_seconds}s, Max: {self.max_entries}")
+        except Exception as e:
+            # 읽기 전용 볼륨 등에서 DB를 열 수 없으면 매번 생성
+            logger.warning(f"⚠️ 요약 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+            self.enabled = False
+
+    def _migrate_fifo_table(self):
+        """TTL/LRU 컬럼 없이 저장하던 summary_results 테이블의 항목을 현재 시각 기준으로 옮기고 삭제"""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'summary_results'"
+        ).fetchone()
+        if exists is None:
+            return
+        now = time.time()
+        moved = self._conn.execute(
+            "INSERT OR IGNORE INTO summary_cache (cache_key, summary, created_at, last_access) "
+            "SELECT cache_key, summary, ?, ? FROM summary_results",
+            (now, now)
+        ).rowcount
+        self._conn.execute("DROP TABLE summary_results")
+        logger.info(f"🔁 요약 캐시 테이블 이전 - {moved}개")
+
+    @staticmethod
+    def make_key(prompt: str, model_artifact: str, params: Dict) -> str:
+        """프롬프트, 모델 아티팩트 식별자, 생성 파라미터를 함께 해시 (모델 교체/설정 변경 시 자동 분리)"""
+        payload = json.dumps({"prompt": prompt, "model": model_artifact, "params": params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시 조회 (만료 항목은 삭제 후 미스, 적중 시 last_access 갱신)"""
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        summary = None
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT summary, created_at FROM summary_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM summary_cache WHERE cache_key = ?", (key,))
+                    self.stats["evictions"] += 1
+                elif row is not None:
+                    self._conn.execute("UPDATE summary_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+                    summary = row[0]
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 요약 캐시 조회 실패: {e}")
+            return None
+
+        self.stats["hits" if summary is not None else "misses"] += 1
+        return summary
+
+    def set(self, key: str, summary: str):
+        """결과 저장 후 최대 항목 수를 넘으면 가장 오래 조회되지 않은 항목부터 삭제"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summary_cache (cache_key, summary, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, summary, now, now)
+                )
+                overflow = self._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    self._conn.execute(
+                        "DELETE FROM summary_cache WHERE cache_key IN "
+                        "(SELECT cache_key FROM summary_cache ORDER BY last_access ASC LIMIT ?)",
+                        (overflow,)
+                    )
+                    self.stats["evictions"] += overflow
+                self._conn.commit()
+            self.stats["writes"] += 1
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ 요약 캐시 저장 실패: {e}")
+
+    def get_stats(self) -> Dict:
+        """캐시 통계"""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0]
+        total = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "hit_rate": round(self.stats["hits"] / total, 4) if total else 0.0,
+            **self.stats
+        }
@@ -24,6 +24,14 @@ async def get_training_status():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/metrics")
+async def get_training_metrics():
+    """학습 처리량 지표 (스텝 시간, 데이터 대기/연산 시간, tokens/sec, 패딩 비율, 메모리 최대치)"""
+    try:
+        return await trainer_controller.get_training_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/train", response_model=TrainingResponse)
 async def start_training(request: TrainingRequest, background_tasks: BackgroundTasks):
     """학습 시작"""
@@ -20,6 +20,10 @@ class SummarizerTrainerController:
         """학습 상태 조회"""
         return await self.trainer_service.get_training_status()
     
+    async def get_training_metrics(self) -> Dict[str, Any]:
+        """학습 처리량 지표 조회"""
+        return await self.trainer_service.get_training_metrics()
+    
     async def start_training(self, training_config: Dict[str, Any], background_tasks: BackgroundTasks) -> Dict[str, str]:
         """학습 시작"""
         return await self.trainer_service.start_training(training_config, background_tasks)
@@ -56,6 +56,13 @@ class TrainingRequest(BaseModel):
     batch_size: Optional[int] = Field(1, description="배치 크기")
     learning_rate: Optional[float] = Field(2e-4, description="학습률")
     max_seq_length: Optional[int] = Field(512, description="최대 시퀀스 길이")
+    batching_mode: Optional[str] = Field(None, description="배치 구성 방식 (padded | dynamic | packing, 기본값: SUMMARIZER_BATCHING_MODE)")
+    profile: Optional[str] = Field(None, description="학습 프로파일 (auto | gpu | cpu, 기본값: SUMMARIZER_TRAINING_PROFILE)")
+    cpu_dtype: Optional[str] = Field(None, description="CPU 학습 정밀도 (fp32 | bf16)")
+    dataloader_num_workers: Optional[int] = Field(None, description="CPU 학습 데이터로더 워커 수")
+    torch_compile: Optional[bool] = Field(None, description="CPU 학습 시 torch.compile 사용 여부")
+    max_samples: Optional[int] = Field(None, description="스모크 학습용 최대 샘플 수")
+    max_steps: Optional[int] = Field(None, description="스모크 학습용 최대 스텝 수")
 
 class TrainingResponse(BaseModel):
     """학습 응답 모델"""
@@ -70,4 +77,5 @@ class TrainingStatusResponse(BaseModel):
     total_steps: int = Field(..., description="총 스텝")
     status: str = Field(..., description="상태")
     result: Optional[Dict[str, Any]] = Field(None, description="학습 결과")
-    error: Optional[str] = Field(None, description="에러 메시지") 
\ No newline at end of file
+    error: Optional[str] = Field(None, description="에러 메시지")
+    throughput: Optional[Dict[str, Any]] = Field(None, description="학습 처리량 요약 (tokens/sec, 데이터 대기 비율, 패딩 비율, 메모리 최대치)") 
\ No newline at end of file
@@ -14,6 +14,7 @@ from fastapi import BackgroundTasks
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 from utils.model_loader import ModelLoader
 from utils.data_loader import DataLoader
+from utils.throughput_callback import ThroughputCallback
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +33,7 @@ class SummarizerTrainerService:
             "error": None
         }
         self.stop_training_flag = False
+        self.throughput = None  # 현재(또는 마지막) 학습의 처리량 계측 콜백
         
     async def get_service_info(self) -> Dict[str, str]:
         """서비스 정보 조회"""
@@ -49,8 +51,19 @@ class SummarizerTrainerService:
         }
     
     async def get_training_status(self) -> Dict[str, Any]:
-        """학습 상태 조회"""
-        return self.training_state.copy()
+        """학습 상태 조회 (처리량 요약 포함)"""
+        status = self.training_state.copy()
+        status["throughput"] = self.throughput.summary() if self.throughput else None
+        return status
+    
+    async def get_training_metrics(self) -> Dict[str, Any]:
+        """학습 처리량 지표 (실행 요약 + 최근 스텝별 기록)"""
+        if self.throughput is None:
+            return {"summary": None, "recent_steps": []}
+        return {
+            "summary": self.throughput.summary(),
+            "recent_steps": self.throughput.recent_steps()
+        }
     
     async def start_training(self, training_config: Dict[str, Any], background_tasks: BackgroundTasks) -> Dict[str, str]:
         """학습 시작"""
@@ -120,7 +133,7 @@ class SummarizerTrainerService:
             
             # 1. 모델 및 토크나이저 로드
             self.training_state["status"] = "loading_model"
-            model, tokenizer = await self.model_loader.load_model_for_training()
+            model, tokenizer = await self.model_loader.load_model_for_training(config.get("profile"))
             
             if self.stop_training_flag:
                 self._handle_training_stop()
@@ -139,6 +152,8 @@ class SummarizerTrainerService:
             trainer = await self.model_loader.setup_trainer(
                 model, tokenizer, train_dataset, config
             )
+            self.throughput = ThroughputCallback(run_name=trainer.args.run_name)
+            trainer.add_callback(self.throughput)
             
             if self.stop_training_flag:
                 self._handle_training_stop()
@@ -146,7 +161,7 @@ class SummarizerTrainerService:
             
             # 4. 학습 실행
             self.training_state["status"] = "training"
-            self.training_state["total_steps"] = len(trainer.get_train_dataloader()) * config.get("epochs", 15)
+            self.training_state["total_steps"] = config.get("max_steps") or len(trainer.get_train_dataloader()) * config.get("epochs", 15)
             
             # 학습 진행 상황을 주기적으로 업데이트
             train_result = await self._run_training_with_progress(trainer)
@@ -165,7 +180,8 @@ class SummarizerTrainerService:
                 "status": "completed",
                 "result": {
                     "final_loss": train_result.training_loss if train_result else None,
-                    "total_steps": self.training_state["current_step"]
+                    "total_steps": self.training_state["current_step"],
+                    "throughput": self.throughput.summary()
                 }
             })
             
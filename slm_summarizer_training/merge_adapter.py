@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+뉴스 요약 모델 LoRA 어댑터 병합 스크립트
+학습 완료 후 어댑터를 베이스 가중치에 병합하여 추론 서비스용 단일 safetensors 생성
+
+사용 예:
+    python merge_adapter.py
+    python merge_adapter.py --adapter_path ./outputs --output_dir ./outputs/merged --dtype float16
+"""
+import sys
+import os
+import logging
+import argparse
+
+# 프로젝트 루트 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.adapter_merger import merge_and_export, MERGED_DIRNAME
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+def parse_arguments():
+    """명령행 인수 파싱"""
+    parser = argparse.ArgumentParser(description="뉴스 요약 모델 LoRA 어댑터 병합 및 내보내기")
+
+    parser.add_argument("--adapter_path", type=str, default="./outputs", help="학습된 LoRA 어댑터 경로 (기본값: ./outputs)")
+    parser.add_argument("--output_dir", type=str, default=None, help=f"병합 모델 저장 경로 (기본값: <adapter_path>/{MERGED_DIRNAME})")
+    parser.add_argument("--base_model", type=str, default="skt/kogpt2-base-v2", help="베이스 모델 이름")
+    parser.add_argument("--dtype", type=str, default="float32", choices=["float32", "float16"],
+                       help="저장 dtype (CPU int8 양자화 시 float32 권장)")
+
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+
+    print("=" * 60)
+    print("🔗 LoRA 어댑터 병합 시작")
+    print(f"   - 어댑터: {args.adapter_path}")
+    print(f"   - 베이스 모델: {args.base_model}")
+    print(f"   - dtype: {args.dtype}")
+    print("=" * 60)
+
+    try:
+        output_dir = merge_and_export(args.adapter_path, args.output_dir, args.base_model, args.dtype)
+    except FileNotFoundError as e:
+        print(str(e))
+        print("💡 먼저 python train.py 로 학습을 완료하세요.")
+        sys.exit(1)
+
+    print(f"🎉 병합 완료: {output_dir}")
+    print("💡 추론 서비스는 병합 모델이 있으면 PeftModel 대신 이를 우선 로드합니다.")
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 # utils 폴더 import
 from utils.model_loader import ModelLoader
 from utils.data_loader import DataLoader
+from utils.throughput_callback import ThroughputCallback
 
 # 로깅 설정 (Windows CP949 호환)
 import sys
@@ -67,7 +68,9 @@ class DirectTrainer:
             
             # GPU 정보 출력
             import torch
-            if torch.cuda.is_available():
+            if config.get("profile") == "cpu":
+                print(f"🖥️  CPU 학습 프로파일 (스레드 {torch.get_num_threads()}개)")
+            elif torch.cuda.is_available():
                 gpu_name = torch.cuda.get_device_name(0)
                 gpu_memory = torch.cuda.get_device_properties(0).total_memory / 1024**3
                 print(f"🖥️  GPU: {gpu_name} ({gpu_memory:.1f}GB)")
@@ -79,11 +82,12 @@ class DirectTrainer:
             print(f"   - 배치 크기: {config['batch_size']}")
             print(f"   - 학습률: {config['learning_rate']}")
             print(f"   - 최대 시퀀스 길이: {config['max_seq_length']}")
+            print(f"   - 배치 구성: {config.get('batching_mode') or 'SUMMARIZER_BATCHING_MODE'}")
             print()
             
             # 1. 모델 및 토크나이저 로드
             print("🔄 1단계: 모델 및 토크나이저 로딩...")
-            model, tokenizer = await self.model_loader.load_model_for_training()
+            model, tokenizer = await self.model_loader.load_model_for_training(config.get("profile"))
             print("✅ 모델 로딩 완료")
             
             # 2. 데이터셋 로드
@@ -96,6 +100,8 @@ class DirectTrainer:
             trainer = await self.model_loader.setup_trainer(
                 model, tokenizer, train_dataset, config
             )
+            throughput = ThroughputCallback(run_name=trainer.args.run_name)
+            trainer.add_callback(throughput)
             print("✅ 학습 설정 완료")
             
             # 4. 학습 실행
@@ -149,6 +155,9 @@ class DirectTrainer:
             try:
                 train_result = trainer.train()
                 print("✅ 학습 완료!")
+                summary = throughput.summary()
+                print(f"⏱️ 처리량: {summary['tokens_per_second']} tokens/s, 데이터 대기 {summary['data_wait_ratio']:.1%}, "
+                      f"패딩 비율 {summary['padding_ratio']}, 병목: {summary['bottleneck']}")
                 
             except RuntimeError as e:
                 error_msg = str(e).lower()
@@ -207,6 +216,15 @@ def parse_arguments():
     parser.add_argument("--batch_size", type=int, default=1, help="배치 크기 (기본값: 1)")
     parser.add_argument("--learning_rate", type=float, default=2e-4, help="학습률 (기본값: 2e-4)")
     parser.add_argument("--max_seq_length", type=int, default=512, help="최대 시퀀스 길이 (기본값: 512)")
+    parser.add_argument("--batching_mode", type=str, default=None, choices=["padded", "dynamic", "packing"],
+                       help="배치 구성 방식 (기본값: SUMMARIZER_BATCHING_MODE 또는 dynamic)")
+    parser.add_argument("--profile", type=str, default=None, choices=["auto", "gpu", "cpu"],
+                       help="학습 프로파일 (기본값: SUMMARIZER_TRAINING_PROFILE 또는 auto)")
+    parser.add_argument("--cpu_dtype", type=str, default=None, choices=["fp32", "bf16"], help="CPU 학습 정밀도")
+    parser.add_argument("--num_workers", type=int, default=None, help="CPU 학습 데이터로더 워커 수")
+    parser.add_argument("--torch_compile", action="store_true", default=None, help="CPU 학습 시 torch.compile 사용")
+    parser.add_argument("--max_samples", type=int, default=None, help="스모크 학습용 최대 샘플 수")
+    parser.add_argument("--max_steps", type=int, default=None, help="스모크 학습용 최대 스텝 수")
     parser.add_argument("--data_path", type=str, default="./data/final_input_output_dataset_filtered.csv", 
                        help="데이터셋 경로")
     
@@ -230,7 +248,14 @@ async def main():
             "batch_size": args.batch_size,
             "learning_rate": args.learning_rate,
             "max_seq_length": args.max_seq_length,
-            "data_path": args.data_path
+            "data_path": args.data_path,
+            "batching_mode": args.batching_mode,
+            "profile": args.profile,
+            "cpu_dtype": args.cpu_dtype,
+            "dataloader_num_workers": args.num_workers,
+            "torch_compile": args.torch_compile,
+            "max_samples": args.max_samples,
+            "max_steps": args.max_steps
         }
         
         # 학습 실행
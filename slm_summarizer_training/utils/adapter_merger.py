@@ -0,0 +1,81 @@
+"""
+LoRA 어댑터 병합 / 내보내기 유틸리티
+학습된 어댑터를 베이스 가중치에 병합하여 단일 safetensors 모델로 저장
+(추론 시 PeftModel 래핑 및 LoRA 우회 연산 제거)
+"""
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+from peft import PeftModel
+
+logger = logging.getLogger(__name__)
+
+MERGED_DIRNAME = "merged"
+MERGED_WEIGHTS_FILENAME = "model.safetensors"
+MERGE_INFO_FILENAME = "merge_info.json"
+
+def _file_sha256(path: str) -> str:
+    """어댑터 가중치 파일 해시 (병합 산출물이 어떤 어댑터에서 나왔는지 추적)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def merge_and_export(
+    adapter_path: str,
+    output_dir: str = None,
+    base_model_name: str = "skt/kogpt2-base-v2",
+    dtype: str = "float32"
+) -> str:
+    """
+    LoRA 어댑터를 베이스 모델에 병합 후 단일 safetensors로 저장
+    - 4bit 가중치에 병합하면 양자화 오차가 누적되므로 베이스는 항상 full precision으로 로드
+    - 토크나이저와 merge_info.json(베이스 모델, 어댑터 해시)을 함께 저장
+    """
+    if not os.path.exists(os.path.join(adapter_path, "adapter_config.json")):
+        raise FileNotFoundError(f"❌ LoRA 어댑터를 찾을 수 없습니다: {adapter_path}")
+
+    output_dir = output_dir or os.path.join(adapter_path, MERGED_DIRNAME)
+    torch_dtype = torch.float16 if dtype == "float16" else torch.float32
+
+    logger.info(f"🤖 베이스 모델 로딩 (CPU, {dtype}): {base_model_name}")
+    base_model = AutoModelForCausalLM.from_pretrained(
+        base_model_name,
+        torch_dtype=torch_dtype,
+        low_cpu_mem_usage=True,
+        token=os.getenv("HUGGINGFACE_HUB_TOKEN")
+    )
+
+    logger.info(f"🔗 LoRA 어댑터 병합: {adapter_path}")
+    model = PeftModel.from_pretrained(base_model, adapter_path).merge_and_unload()
+    model.config.use_cache = True  # 학습 시 꺼둔 KV 캐시를 추론용으로 복구
+
+    os.makedirs(output_dir, exist_ok=True)
+    model.save_pretrained(output_dir, safe_serialization=True, max_shard_size="10GB")  # 샤딩 없이 단일 파일
+
+    tokenizer_source = adapter_path if os.path.exists(os.path.join(adapter_path, "tokenizer_config.json")) else base_model_name
+    AutoTokenizer.from_pretrained(tokenizer_source).save_pretrained(output_dir)
+
+    adapter_weights = os.path.join(adapter_path, "adapter_model.safetensors")
+    if not os.path.exists(adapter_weights):
+        adapter_weights = os.path.join(adapter_path, "adapter_model.bin")
+
+    merge_info = {
+        "base_model": base_model_name,
+        "adapter_path": os.path.abspath(adapter_path),
+        "adapter_sha256": _file_sha256(adapter_weights) if os.path.exists(adapter_weights) else None,
+        "dtype": dtype,
+        "merged_at": datetime.now().isoformat()
+    }
+    with open(os.path.join(output_dir, MERGE_INFO_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(merge_info, f, ensure_ascii=False, indent=2)
+
+    weights_path = os.path.join(output_dir, MERGED_WEIGHTS_FILENAME)
+    logger.info(f"✅ 병합 모델 저장 완료: {weights_path} ({os.path.getsize(weights_path) / 1e6:.1f}MB)")
+    return output_dir
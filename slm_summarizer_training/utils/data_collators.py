@@ -0,0 +1,170 @@
+"""
+학습 배치 구성 유틸리티
+max_seq_length까지 패딩된 샘플을 그대로 쌓으면 연산 대부분이 패딩 토큰에 쓰이므로
+- PackingCollator: 여러 프롬프트/요약 샘플을 max_seq_length 행에 이어붙여 패딩을 거의 없앰
+- DynamicPaddingCollator: 길이별로 묶인 배치(group_by_length)를 배치 내 최장 길이까지만 패딩
+"""
+import logging
+from typing import Dict, List, Tuple
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+# 학습 배치 구성 방식
+BATCHING_MODES = ("padded", "dynamic", "packing")
+
+def unpad(feature: Dict) -> Tuple[List[int], List[int]]:
+    """attention_mask 기준으로 오른쪽 패딩을 제거한 (input_ids, labels)"""
+    length = int(sum(feature["attention_mask"]))
+    return list(feature["input_ids"][:length]), list(feature["labels"][:length])
+
+def add_length_column(dataset):
+    """LengthGroupedSampler(group_by_length)가 사용할 실제 토큰 수 컬럼 추가"""
+    if "length" in dataset.column_names:
+        return dataset
+    return dataset.map(
+        lambda batch: {"length": [int(sum(mask)) for mask in batch["attention_mask"]]},
+        batched=True,
+        desc="Computing lengths"
+    )
+
+def _round_up(value: int, multiple: int) -> int:
+    if not multiple:
+        return value
+    return (value + multiple - 1) // multiple * multiple
+
+class DynamicPaddingCollator:
+    """
+    배치 내 최장 시퀀스 길이(pad_to_multiple_of 배수)까지만 오른쪽 패딩
+    LengthGroupedSampler와 함께 쓰면 비슷한 길이끼리 묶여 패딩이 최소화됨
+    """
+
+    def __init__(self, pad_token_id: int, pad_to_multiple_of: int = 8):
+        self.pad_token_id = pad_token_id
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.stats = {"batches": 0, "tokens": 0, "slots": 0}
+
+    def __call__(self, features: List[Dict]) -> Dict[str, torch.Tensor]:
+        sequences = [unpad(feature) for feature in features]
+        width = _round_up(max(len(ids) for ids, _ in sequences), self.pad_to_multiple_of)
+
+        input_ids = torch.full((len(sequences), width), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+        labels = torch.full((len(sequences), width), -100, dtype=torch.long)
+        for row, (ids, row_labels) in enumerate(sequences):
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+            labels[row, :len(ids)] = torch.tensor(row_labels, dtype=torch.long)
+
+        self.stats["batches"] += 1
+        self.stats["tokens"] += int(attention_mask.sum())
+        self.stats["slots"] += attention_mask.numel()
+        return {"input_ids": input_ids, "attention_mask": attention_mask, "labels": labels}
+
+class PackingCollator:
+    """
+    시퀀스 패킹 콜레이터
+    - 배치로 들어온 샘플들을 길이 내림차순 first-fit으로 max_seq_length 행에 채워 넣음
+    - position_ids는 샘플마다 0부터 다시 시작 (각 요약이 독립 문서로 보이도록)
+    - 다음 샘플의 첫 토큰은 항상 프롬프트(label -100)이므로 이전 샘플의 eos 이후를 예측하는 손실이 생기지 않음
+    - attention_mask는 행마다 블록 대각 causal 마스크 (batch, 1, seq, seq)로 만들어 같은 행의 다른 샘플을 보지 못하게 함
+      (additive float 마스크: 0 = attend, dtype 최솟값 = 차단, 모델이 4D 마스크를 지원하는지는 supports_packed_attention으로 확인)
+    """
+
+    def __init__(self, pad_token_id: int, max_seq_length: int = 512, pad_to_multiple_of: int = 8):
+        self.pad_token_id = pad_token_id
+        self.max_seq_length = max_seq_length
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.stats = {"batches": 0, "examples": 0, "rows": 0, "tokens": 0, "slots": 0}
+
+    def _pack(self, sequences: List[Tuple[List[int], List[int]]]) -> List[List[Tuple[List[int], List[int]]]]:
+        """길이 내림차순 first-fit 빈 패킹 (행 = 샘플 목록)"""
+        rows, free = [], []
+        for sequence in sorted(sequences, key=lambda item: len(item[0]), reverse=True):
+            length = len(sequence[0])
+            for index, remaining in enumerate(free):
+                if length <= remaining:
+                    rows[index].append(sequence)
+                    free[index] -= length
+                    break
+            else:
+                rows.append([sequence])
+                free.append(self.max_seq_length - length)
+        return rows
+
+    def __call__(self, features: List[Dict]) -> Dict[str, torch.Tensor]:
+        sequences = [unpad(feature) for feature in features]
+        rows = self._pack(sequences)
+        width = _round_up(max(sum(len(ids) for ids, _ in row) for row in rows), self.pad_to_multiple_of)
+
+        input_ids = torch.full((len(rows), width), self.pad_token_id, dtype=torch.long)
+        labels = torch.full((len(rows), width), -100, dtype=torch.long)
+        position_ids = torch.zeros((len(rows), width), dtype=torch.long)
+        # 샘플 번호 (패딩은 -1), 같은 번호끼리만 causal하게 attend
+        segment_ids = torch.full((len(rows), width), -1, dtype=torch.long)
+        for row, packed in enumerate(rows):
+            offset = 0
+            for segment, (ids, row_labels) in enumerate(packed):
+                end = offset + len(ids)
+                input_ids[row, offset:end] = torch.tensor(ids, dtype=torch.long)
+                labels[row, offset:end] = torch.tensor(row_labels, dtype=torch.long)
+                position_ids[row, offset:end] = torch.arange(len(ids))
+                segment_ids[row, offset:end] = segment
+                offset = end
+
+        tokens = int((segment_ids >= 0).sum())
+        self.stats["batches"] += 1
+        self.stats["examples"] += len(sequences)
+        self.stats["rows"] += len(rows)
+        self.stats["tokens"] += tokens
+        self.stats["slots"] += segment_ids.numel()
+        return {
+            "input_ids": input_ids,
+            "attention_mask": block_causal_mask(segment_ids),
+            "labels": labels,
+            "position_ids": position_ids
+        }
+
+def block_causal_mask(segment_ids: torch.Tensor) -> torch.Tensor:
+    """
+    (batch, seq) 샘플 번호로 (batch, 1, seq, seq) additive causal 마스크 생성
+    패딩 위치는 자기 자신만 보도록 두어 softmax 행이 전부 차단되지 않게 함 (라벨 -100이라 손실에는 영향 없음)
+    """
+    width = segment_ids.size(1)
+    causal = torch.tril(torch.ones((width, width), dtype=torch.bool))
+    same_segment = segment_ids[:, :, None] == segment_ids[:, None, :]
+    allowed = (same_segment & (segment_ids[:, :, None] >= 0) & causal) | torch.eye(width, dtype=torch.bool)
+    mask = torch.zeros(allowed.shape, dtype=torch.float32)
+    mask.masked_fill_(~allowed, torch.finfo(torch.float32).min)
+    return mask[:, None, :, :]
+
+def supports_packed_attention(model) -> bool:
+    """
+    모델이 4D 블록 대각 attention_mask를 실제로 반영하는지 작은 입력으로 확인
+    transformers 버전에 따라 GPT2가 4D 마스크를 무시/거부할 수 있으므로, 패킹한 두 번째 샘플의 logits가
+    단독으로 forward한 결과와 같을 때만 True
+    """
+    first, second = [11, 12, 13], [21, 22]
+    probe = PackingCollator(pad_token_id=0, max_seq_length=8, pad_to_multiple_of=1)
+    packed = probe([{"input_ids": ids, "attention_mask": [1] * len(ids), "labels": ids} for ids in (first, second)])
+    device = next(model.parameters()).device
+    was_training = model.training
+    model.eval()
+    try:
+        with torch.no_grad():
+            packed_logits = model(
+                input_ids=packed["input_ids"].to(device),
+                attention_mask=packed["attention_mask"].to(device),
+                position_ids=packed["position_ids"].to(device)
+            ).logits[0, len(first):len(first) + len(second)]
+            alone_logits = model(
+                input_ids=torch.tensor([second], device=device),
+                attention_mask=torch.ones((1, len(second)), dtype=torch.long, device=device)
+            ).logits[0]
+        return torch.allclose(packed_logits.float(), alone_logits.float(), atol=5e-2, rtol=1e-3)
+    except Exception as e:
+        logger.warning(f"4D attention_mask 확인 실패: {e}")
+        return False
+    finally:
+        model.train(was_training)
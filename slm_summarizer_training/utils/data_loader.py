@@ -1,321 +1,324 @@
 """
 데이터 로더 유틸리티
 CSV 데이터 로딩 및 전처리 기능
+- datasets.map(batched=True, num_proc=N) + fast tokenizer로 배치 토크나이징
+- 라벨 마스킹/토큰 범위 보정/필터링은 numpy 배열 연산으로 처리
+- 전처리 결과는 (데이터셋 + 토크나이저 + 설정) 해시를 키로 캐시에 저장하여 다음 실행에서 재사용
+  (기본은 패딩 없는 메모리 맵 토큰 코퍼스, SUMMARIZER_DATASET_FORMAT=arrow면 패딩된 Arrow 데이터셋)
 """
 import os
-import pandas as pd
+import json
+import shutil
+import hashlib
 import logging
-from typing import Any
-from datasets import Dataset
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from datasets import Dataset, load_from_disk
+
+from .token_corpus import TokenCorpus, TokenCorpusWriter
 
 logger = logging.getLogger(__name__)
 
+# 전처리 병렬 프로세스 수 (0이면 CPU 코어 수 기준 자동)
+PREPROCESS_NUM_PROC = int(os.getenv("SUMMARIZER_PREPROCESS_NUM_PROC", "0"))
+# 전처리 결과 Arrow 캐시 디렉터리 (빈 값이면 캐시 사용 안 함)
+DATASET_CACHE_DIR = os.getenv("SUMMARIZER_DATASET_CACHE_DIR", "./data/cache")
+# 전처리 캐시 형식 (corpus: 메모리 맵 토큰 코퍼스 | arrow: 패딩된 Arrow 데이터셋)
+DATASET_FORMAT = os.getenv("SUMMARIZER_DATASET_FORMAT", "corpus")
+# 코퍼스 생성 시 CSV를 읽고 토크나이징하는 청크 크기 (행)
+CORPUS_CHUNK_ROWS = int(os.getenv("SUMMARIZER_CORPUS_CHUNK_ROWS", "10000"))
+# 전처리 로직이 바뀌면 올려서 기존 캐시를 무효화
+PREPROCESS_VERSION = 1
+
+MIN_SEQUENCE_TOKENS = 10
+MIN_LEARNABLE_TOKENS = 3
+MAX_CLIPPED_RATIO = 0.9
+MAX_PAD_RATIO = 0.8
+
 class DataLoader:
     """데이터 로딩 및 전처리 클래스"""
-    
+
     def __init__(self):
         self.dataset_path = "./data/final_input_output_dataset_filtered.csv"
-        
-    async def load_training_dataset(self, tokenizer, config) -> Dataset:
-        """학습 데이터셋 로드 및 전처리"""
+        self.cache_dir = DATASET_CACHE_DIR
+        self.dataset_format = DATASET_FORMAT
+
+    async def load_training_dataset(self, tokenizer, config):
+        """학습 데이터셋 로드 및 전처리 (캐시 적중 시 전처리 생략)"""
         try:
             logger.info(f"Loading dataset from {self.dataset_path}")
-            
+
             # CSV 파일 로드
             if not os.path.exists(self.dataset_path):
                 raise FileNotFoundError(f"Dataset not found: {self.dataset_path}")
-            
+
+            if self.cache_dir and self.dataset_format == "corpus":
+                return self._load_token_corpus(tokenizer, config)
+
+            cache_path = None
+            if self.cache_dir:
+                cache_key = self._cache_key(tokenizer, config)
+                cache_path = os.path.join(self.cache_dir, cache_key[:16])
+                if os.path.exists(os.path.join(cache_path, "dataset_info.json")):
+                    dataset = load_from_disk(cache_path)
+                    logger.info(f"💾 전처리 캐시 적중 - {cache_path} ({len(dataset)} samples)")
+                    return dataset
+
             df = pd.read_csv(self.dataset_path)
             logger.info(f"Loaded {len(df)} samples")
-            
+
             # 데이터 전처리
-            processed_data = self._preprocess_data(df, tokenizer, config)
-            
-            # Dataset 객체 생성
-            dataset = Dataset.from_dict(processed_data)
-            
+            dataset = self._preprocess_data(df, tokenizer, config)
+
+            if cache_path:
+                self._save_cache(dataset, cache_path)
+
             logger.info("Dataset loaded and preprocessed successfully")
             return dataset
-            
+
         except Exception as e:
             logger.error(f"Failed to load dataset: {str(e)}")
             raise e
-    
-    def _preprocess_data(self, df, tokenizer, config):
-        """데이터 전처리 - Causal LM용"""
+
+    def _preprocess_data(self, df, tokenizer, config) -> Dataset:
+        """데이터 전처리 - Causal LM용 (배치 토크나이징 후 유효하지 않은 샘플 필터링)"""
         try:
             max_seq_length = config.get("max_seq_length", 512)
-            
-            input_ids_list = []
-            attention_mask_list = []
-            labels_list = []
-            
-            for _, row in df.iterrows():
-                # 입력 프롬프트와 출력 분리
-                input_prompt = self._create_input_prompt(str(row['input']))
-                target_output = str(row['output'])
-                
-                # 빈 데이터 체크
-                if not input_prompt.strip() or not target_output.strip():
-                    logger.warning(f"Skipping empty data at index {row.name}")
-                    continue
-                
-                # 입력 부분 토크나이징 (KoGPT2 안전 처리)
-                try:
-                    # 기본 토크나이징 시도
-                    input_encoding = tokenizer(
-                        input_prompt,
-                        truncation=False,
-                        padding=False,
-                        add_special_tokens=True,
-                        return_tensors=None
-                    )
-                    # input_ids 검증
-                    if not isinstance(input_encoding.get("input_ids"), list) or len(input_encoding["input_ids"]) == 0:
-                        raise ValueError("Invalid input_ids")
-                        
-                except Exception as e:
-                    logger.warning(f"Input encoding 실패 ({e}), 단순 방법 시도...")
-                    try:
-                        # 더 단순한 방법 시도
-                        input_ids = tokenizer.encode(input_prompt, add_special_tokens=True)
-                        input_encoding = {"input_ids": input_ids}
-                    except Exception as e2:
-                        logger.error(f"Input encoding 완전 실패: {e2}")
-                        continue
-                
-                # 출력 부분 토크나이징 (special token 없이)
-                try:
-                    # 기본 토크나이징 시도
-                    output_encoding = tokenizer(
-                        target_output,
-                        truncation=False,
-                        padding=False,
-                        add_special_tokens=False,
-                        return_tensors=None
-                    )
-                    # output_ids 검증
-                    if not isinstance(output_encoding.get("input_ids"), list) or len(output_encoding["input_ids"]) == 0:
-                        raise ValueError("Invalid output_ids")
-                        
-                except Exception as e:
-                    logger.warning(f"Output encoding 실패 ({e}), 단순 방법 시도...")
-                    try:
-                        # 더 단순한 방법 시도
-                        output_ids = tokenizer.encode(target_output, add_special_tokens=False)
-                        output_encoding = {"input_ids": output_ids}
-                    except Exception as e2:
-                        logger.error(f"Output encoding 완전 실패: {e2}")
-                        continue
-                
-                # 전체 시퀀스 구성 (KoGPT2 안전 처리)
-                try:
-                    input_ids = input_encoding["input_ids"] + output_encoding["input_ids"] + [tokenizer.eos_token_id]
-                except Exception as e:
-                    logger.warning(f"시퀀스 구성 실패: {e}")
-                    continue
-                
-                # 길이 제한 및 검증
-                if len(input_ids) > max_seq_length:
-                    input_ids = input_ids[:max_seq_length]
-                elif len(input_ids) < 10:  # 너무 짧은 시퀀스 제외
-                    logger.warning(f"시퀀스가 너무 짧음: {len(input_ids)} tokens")
-                    continue
-                
-                # attention_mask 생성
-                attention_mask = [1] * len(input_ids)
-                
-                # labels 생성 (입력 부분은 -100으로 마스킹, 출력 부분만 학습)
-                try:
-                    labels = [-100] * len(input_encoding["input_ids"]) + output_encoding["input_ids"] + [tokenizer.eos_token_id]
-                    if len(labels) > max_seq_length:
-                        labels = labels[:max_seq_length]
-                except Exception as e:
-                    logger.warning(f"Labels 생성 실패: {e}")
-                    continue
-                
-                # 패딩 (KoGPT2 안전 처리)
-                padding_length = max_seq_length - len(input_ids)
-                if padding_length > 0:
-                    # pad_token_id가 없는 경우 eos_token_id 사용
-                    pad_id = getattr(tokenizer, 'pad_token_id', tokenizer.eos_token_id)
-                    if pad_id is None:
-                        pad_id = tokenizer.eos_token_id
-                    
-                    input_ids.extend([pad_id] * padding_length)
-                    attention_mask.extend([0] * padding_length)
-                    labels.extend([-100] * padding_length)
-                
-                # 🔍 강화된 최종 검증 (device-side assert 방지)
-                try:
-                    # 1. 길이 일치 검증
-                    if len(input_ids) != max_seq_length or len(attention_mask) != max_seq_length or len(labels) != max_seq_length:
-                        logger.warning(f"[ERROR] 길이 불일치: input_ids={len(input_ids)}, attention_mask={len(attention_mask)}, labels={len(labels)}")
-                        continue
-                    
-                    # 2. 토크나이저 정보 확인 및 스마트 vocab_size 검증
-                    vocab_size = getattr(tokenizer, 'vocab_size', 51200)
-                    unk_token_id = getattr(tokenizer, 'unk_token_id', 0)  # UNK 토큰 ID
-                    pad_token_id = getattr(tokenizer, 'pad_token_id', tokenizer.eos_token_id)
-                    
-                    # 디버그: 토큰 범위 확인 (첫 번째 샘플만)
-                    if len(input_ids_list) == 0:  # 첫 번째 샘플
-                        logger.info(f"[DEBUG] 토크나이저 정보:")
-                        logger.info(f"   - vocab_size: {vocab_size}")
-                        logger.info(f"   - unk_token_id: {unk_token_id}")
-                        logger.info(f"   - pad_token_id: {pad_token_id}")
-                        logger.info(f"   - eos_token_id: {tokenizer.eos_token_id}")
-                        logger.info(f"   - 샘플 input_ids 범위: {min(input_ids)} ~ {max(input_ids)}")
-                        logger.info(f"   - 샘플 labels 범위: {min([l for l in labels if l != -100])} ~ {max([l for l in labels if l != -100])}")
-                        
-                        # 실제 사용 가능한 vocab_size 계산 (특별 토큰 고려)
-                        special_tokens = set([
-                            getattr(tokenizer, 'unk_token_id', None),
-                            getattr(tokenizer, 'pad_token_id', None),
-                            getattr(tokenizer, 'eos_token_id', None),
-                            getattr(tokenizer, 'bos_token_id', None),
-                            getattr(tokenizer, 'cls_token_id', None),
-                            getattr(tokenizer, 'sep_token_id', None),
-                            getattr(tokenizer, 'mask_token_id', None)
-                        ])
-                        special_tokens.discard(None)
-                        max_special_token = max(special_tokens) if special_tokens else 0
-                        logger.info(f"   - 특별 토큰 최대값: {max_special_token}")
-                        logger.info(f"   - 특별 토큰 집합: {sorted(special_tokens)}")
-                    
-                    # 안전한 토큰 범위 처리 (vocab_size 기준)
-                    max_valid_token_id = vocab_size - 1  # 0 ~ vocab_size-1이 유효한 범위
-                    
-                    # input_ids에서 범위 초과 토큰을 max_valid_token_id로 클리핑
-                    original_input_ids = input_ids[:]
-                    input_ids = []
-                    input_fixes = 0
-                    
-                    for idx in original_input_ids:
-                        if idx >= vocab_size or idx < 0:
-                            input_ids.append(max_valid_token_id)  # vocab_size-1로 클리핑
-                            input_fixes += 1
-                        else:
-                            input_ids.append(idx)
-                    
-                    # labels에서 범위 초과 토큰 처리 (-100은 그대로 유지)
-                    original_labels = labels[:]
-                    labels = []
-                    label_fixes = 0
-                    
-                    for label in original_labels:
-                        if label == -100:  # ignore index는 그대로 유지
-                            labels.append(label)
-                        elif label >= vocab_size or label < 0:
-                            labels.append(max_valid_token_id)  # vocab_size-1로 클리핑
-                            label_fixes += 1
-                        else:
-                            labels.append(label)
-                    
-                    # 수정 통계 로그 (처음 3개만)
-                    if (input_fixes > 0 or label_fixes > 0) and len(input_ids_list) < 3:
-                        logger.info(f"[FIX] 토큰 범위 수정 (샘플 {len(input_ids_list)}):")
-                        logger.info(f"   - vocab_size: {vocab_size}")
-                        logger.info(f"   - max_valid_token_id: {max_valid_token_id}")
-                        logger.info(f"   - input_fixes: {input_fixes}/{len(original_input_ids)}")
-                        logger.info(f"   - label_fixes: {label_fixes}/{len([l for l in original_labels if l != -100])}")
-                    
-                    # 극단적인 경우만 필터링 (대부분이 클리핑된 토큰인 경우)
-                    clipped_ratio_input = input_ids.count(max_valid_token_id) / len(input_ids)
-                    valid_labels = [l for l in labels if l != -100]
-                    clipped_ratio_labels = (valid_labels.count(max_valid_token_id) / len(valid_labels)) if valid_labels else 0
-                    
-                    if clipped_ratio_input > 0.9:  # 90% 이상이 클리핑된 토큰
-                        logger.warning(f"[ERROR] input에 클리핑된 토큰이 너무 많음: {clipped_ratio_input:.2f}")
-                        continue
-                    
-                    if clipped_ratio_labels > 0.9:  # 90% 이상이 클리핑된 토큰
-                        logger.warning(f"[ERROR] labels에 클리핑된 토큰이 너무 많음: {clipped_ratio_labels:.2f}")
-                        continue
-                    
-                    # 3. 데이터 타입 검증
-                    if not all(isinstance(x, int) for x in input_ids):
-                        logger.warning(f"[ERROR] input_ids 타입 오류: {[type(x) for x in input_ids[:5]]}")
-                        continue
-                    
-                    if not all(isinstance(x, int) for x in labels):
-                        logger.warning(f"[ERROR] labels 타입 오류: {[type(x) for x in labels[:5]]}")
-                        continue
-                    
-                    # 4. 학습 가능한 토큰 검증
-                    learnable_tokens = [label for label in labels if label != -100]
-                    if len(learnable_tokens) == 0:
-                        logger.warning(f"[ERROR] 학습 가능한 토큰이 없음 (모든 labels가 -100)")
-                        continue
-                    
-                    if len(learnable_tokens) < 3:
-                        logger.warning(f"[ERROR] 학습 가능한 토큰이 너무 적음: {len(learnable_tokens)}개")
-                        continue
-                    
-                    # 5. 패딩 토큰 비율 검증
-                    pad_token_id = getattr(tokenizer, 'pad_token_id', tokenizer.eos_token_id)
-                    pad_ratio = input_ids.count(pad_token_id) / len(input_ids)
-                    if pad_ratio > 0.8:  # 80% 이상이 패딩이면 제외
-                        logger.warning(f"[ERROR] 패딩 비율이 너무 높음: {pad_ratio:.2f}")
-                        continue
-                    
-                    # 모든 검증 통과
-                    logger.debug(f"[OK] 샘플 검증 통과: input_len={len(input_ids)}, learnable_tokens={len(learnable_tokens)}, pad_ratio={pad_ratio:.2f}")
-                    
-                except Exception as e:
-                    logger.error(f"[ERROR] 검증 중 오류: {e}")
-                    continue
-                
-                input_ids_list.append(input_ids)
-                attention_mask_list.append(attention_mask)
-                labels_list.append(labels)
-            
+            num_proc = self._num_proc(len(df))
+            fast_tokenizer = self._get_fast_tokenizer(tokenizer)
+
+            vocab_size = getattr(tokenizer, 'vocab_size', 51200)
+            pad_id = getattr(tokenizer, 'pad_token_id', None)
+            if pad_id is None:
+                pad_id = tokenizer.eos_token_id
+
+            logger.info(f"[DEBUG] 토크나이저 정보:")
+            logger.info(f"   - fast tokenizer: {fast_tokenizer.is_fast}")
+            logger.info(f"   - vocab_size: {vocab_size}")
+            logger.info(f"   - pad_token_id: {pad_id}")
+            logger.info(f"   - eos_token_id: {tokenizer.eos_token_id}")
+            logger.info(f"   - num_proc: {num_proc}")
+
+            raw = Dataset.from_pandas(df[["input", "output"]].astype(str), preserve_index=False)
+            processed = raw.map(
+                self._tokenize_batch,
+                batched=True,
+                num_proc=num_proc,
+                remove_columns=raw.column_names,
+                fn_kwargs={
+                    "tokenizer": fast_tokenizer,
+                    "max_seq_length": max_seq_length,
+                    "vocab_size": vocab_size,
+                    "pad_id": pad_id,
+                    "eos_id": tokenizer.eos_token_id
+                },
+                desc="Tokenizing"
+            )
+            dataset = processed.filter(
+                lambda batch: batch["keep"],
+                batched=True,
+                num_proc=num_proc,
+                desc="Filtering"
+            ).remove_columns("keep")
+
             # 최종 데이터셋 통계
             total_original = len(df)
-            total_processed = len(input_ids_list)
-            filter_rate = (total_original - total_processed) / total_original * 100
-            
+            total_processed = len(dataset)
+            filter_rate = (total_original - total_processed) / total_original * 100 if total_original else 0.0
+
             logger.info(f"[RESULT] 데이터 처리 완료:")
             logger.info(f"   - 원본 샘플: {total_original}개")
             logger.info(f"   - 처리된 샘플: {total_processed}개")
             logger.info(f"   - 필터링된 샘플: {total_original - total_processed}개 ({filter_rate:.1f}%)")
-            
+
             if total_processed == 0:
                 raise ValueError("[ERROR] 처리된 샘플이 없습니다. 데이터 형식을 확인하세요.")
-            
+
             if total_processed < 10:
                 logger.warning(f"[WARNING] 처리된 샘플이 매우 적습니다 ({total_processed}개). 학습 품질에 영향을 줄 수 있습니다.")
-            
-            # 최종 검증 통계
-            final_dataset = {
-                "input_ids": input_ids_list,
-                "attention_mask": attention_mask_list,
-                "labels": labels_list
-            }
-            
+
             # 샘플 데이터 검증
-            if len(input_ids_list) > 0:
-                sample_input = input_ids_list[0]
-                sample_labels = labels_list[0]
-                vocab_size = getattr(tokenizer, 'vocab_size', 51200)
-                
-                logger.info(f"[SAMPLE] 샘플 검증:")
-                logger.info(f"   - 샘플 길이: {len(sample_input)}")
-                logger.info(f"   - vocab_size: {vocab_size}")
-                logger.info(f"   - 최대 input_id: {max(sample_input)}")
-                logger.info(f"   - 최대 valid_label: {max([l for l in sample_labels if l != -100], default=-100)}")
-                logger.info(f"   - 학습 가능 토큰: {len([l for l in sample_labels if l != -100])}개")
-            
-            return final_dataset
-            
+            sample_input = np.asarray(dataset[0]["input_ids"])
+            sample_labels = np.asarray(dataset[0]["labels"])
+            valid_labels = sample_labels[sample_labels != -100]
+            logger.info(f"[SAMPLE] 샘플 검증:")
+            logger.info(f"   - 샘플 길이: {len(sample_input)} (실제 토큰 {sum(dataset[0]['attention_mask'])}개)")
+            logger.info(f"   - 최대 input_id: {sample_input.max()}")
+            logger.info(f"   - 최대 valid_label: {valid_labels.max() if len(valid_labels) else -100}")
+            logger.info(f"   - 학습 가능 토큰: {len(valid_labels)}개")
+
+            return dataset
+
         except Exception as e:
             logger.error(f"Failed to preprocess data: {str(e)}")
             raise e
-    
+
+    def _load_token_corpus(self, tokenizer, config) -> TokenCorpus:
+        """메모리 맵 토큰 코퍼스 로드 (없으면 CSV를 청크 단위로 읽어 생성)"""
+        corpus_path = os.path.join(self.cache_dir, f"corpus-{self._cache_key(tokenizer, config)[:16]}")
+        if not TokenCorpus.exists(corpus_path):
+            self._build_token_corpus(tokenizer, config, corpus_path)
+        corpus = TokenCorpus(corpus_path)
+        logger.info(f"💾 토큰 코퍼스 로드 - {corpus_path} ({len(corpus)} samples, {corpus.meta['num_tokens']} tokens, {corpus.meta['dtype']})")
+        return corpus
+
+    def _build_token_corpus(self, tokenizer, config, corpus_path: str):
+        """
+        CSV 청크 -> _tokenize_batch (Arrow 경로와 같은 라벨 마스킹/필터) -> 실제 토큰만 코퍼스에 추가
+        청크 단위로 기록하므로 전처리 메모리 사용량이 데이터셋 크기와 무관
+        """
+        max_seq_length = config.get("max_seq_length", 512)
+        fast_tokenizer = self._get_fast_tokenizer(tokenizer)
+        vocab_size = getattr(tokenizer, 'vocab_size', 51200)
+        pad_id = getattr(tokenizer, 'pad_token_id', None)
+        if pad_id is None:
+            pad_id = tokenizer.eos_token_id
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        writer = TokenCorpusWriter(corpus_path, max(vocab_size, len(tokenizer)))
+        total_original = 0
+        try:
+            for chunk in pd.read_csv(self.dataset_path, chunksize=CORPUS_CHUNK_ROWS):
+                batch = chunk[["input", "output"]].astype(str).to_dict("list")
+                processed = self._tokenize_batch(batch, fast_tokenizer, max_seq_length, vocab_size, pad_id, tokenizer.eos_token_id)
+                keep = processed["keep"]
+                lengths = processed["attention_mask"][keep].sum(axis=1)
+                learnable = (processed["labels"][keep] != -100).sum(axis=1)
+                writer.add_batch(processed["input_ids"][keep], lengths, lengths - learnable)
+                total_original += len(chunk)
+
+            if writer.num_samples == 0:
+                raise ValueError("[ERROR] 처리된 샘플이 없습니다. 데이터 형식을 확인하세요.")
+            writer.close({
+                "max_seq_length": max_seq_length,
+                "pad_token_id": pad_id,
+                "source_rows": total_original
+            })
+        except Exception:
+            writer.abort()
+            raise
+
+        filtered = total_original - writer.num_samples
+        logger.info(f"[RESULT] 토큰 코퍼스 생성 완료:")
+        logger.info(f"   - 원본 샘플: {total_original}개")
+        logger.info(f"   - 처리된 샘플: {writer.num_samples}개 (필터링 {filtered}개)")
+        logger.info(f"   - 평균 토큰 수: {writer.num_tokens / writer.num_samples:.1f} (패딩 없이 저장)")
+
+    def _tokenize_batch(self, batch: Dict[str, list], tokenizer, max_seq_length: int,
+                        vocab_size: int, pad_id: int, eos_id: int) -> Dict[str, Any]:
+        """
+        배치 단위 토크나이징 + 라벨 마스킹 + 검증 (datasets.map 워커에서 실행)
+        - input_ids = 프롬프트(special token 포함) + 요약 + eos, max_seq_length로 자르고 pad로 채움
+        - labels = 프롬프트/패딩 위치는 -100, 요약 + eos만 학습
+        - keep = 빈 입력, 너무 짧은 시퀀스, vocab 범위 초과 토큰 과다, 학습 토큰 부족, 패딩 과다 샘플 제외
+        """
+        prompts = [self._create_input_prompt(text) for text in batch["input"]]
+        targets = batch["output"]
+        prompt_ids = tokenizer(prompts, add_special_tokens=True)["input_ids"]
+        target_ids = tokenizer(targets, add_special_tokens=False)["input_ids"]
+
+        count = len(prompts)
+        input_ids = np.full((count, max_seq_length), pad_id, dtype=np.int64)
+        lengths = np.zeros(count, dtype=np.int64)
+        prompt_lengths = np.array([len(ids) for ids in prompt_ids], dtype=np.int64)
+        for row, (prompt, target) in enumerate(zip(prompt_ids, target_ids)):
+            sequence = (prompt + target + [eos_id])[:max_seq_length]
+            input_ids[row, :len(sequence)] = sequence
+            lengths[row] = len(sequence)
+
+        positions = np.arange(max_seq_length)[None, :]
+        attention_mask = positions < lengths[:, None]
+        learnable = attention_mask & (positions >= prompt_lengths[:, None])
+
+        # vocab 범위를 벗어난 토큰은 vocab_size-1로 클리핑 (device-side assert 방지)
+        out_of_vocab = attention_mask & ((input_ids >= vocab_size) | (input_ids < 0))
+        input_ids = np.where(out_of_vocab, vocab_size - 1, input_ids)
+        labels = np.where(learnable, input_ids, -100)
+
+        learnable_count = learnable.sum(axis=1)
+        clipped_input_ratio = out_of_vocab.sum(axis=1) / np.maximum(lengths, 1)
+        clipped_label_ratio = (out_of_vocab & learnable).sum(axis=1) / np.maximum(learnable_count, 1)
+        pad_ratio = 1.0 - lengths / max_seq_length
+        non_empty = np.array([bool(p.strip()) and bool(t.strip()) for p, t in zip(batch["input"], targets)])
+
+        keep = (
+            non_empty
+            & (lengths >= min(MIN_SEQUENCE_TOKENS, max_seq_length))
+            & (clipped_input_ratio <= MAX_CLIPPED_RATIO)
+            & (clipped_label_ratio <= MAX_CLIPPED_RATIO)
+            & (learnable_count >= MIN_LEARNABLE_TOKENS)
+            & (pad_ratio <= MAX_PAD_RATIO)
+        )
+
+        return {
+            "input_ids": input_ids,
+            "attention_mask": attention_mask.astype(np.int64),
+            "labels": labels,
+            "keep": keep
+        }
+
+    def _get_fast_tokenizer(self, tokenizer):
+        """전처리용 fast(Rust) 토크나이저 (학습용 토크나이저가 slow면 같은 체크포인트에서 fast 버전 로드)"""
+        if getattr(tokenizer, "is_fast", False):
+            return tokenizer
+        try:
+            from transformers import AutoTokenizer
+            fast_tokenizer = AutoTokenizer.from_pretrained(tokenizer.name_or_path, use_fast=True)
+            if not fast_tokenizer.is_fast:
+                raise ValueError("fast tokenizer not available")
+            fast_tokenizer.pad_token = tokenizer.pad_token
+            return fast_tokenizer
+        except Exception as e:
+            logger.warning(f"⚠️ fast tokenizer 로드 실패, 기존 토크나이저로 전처리합니다: {e}")
+            return tokenizer
+
+    def _num_proc(self, num_rows: int) -> int:
+        """전처리 프로세스 수 (작은 데이터셋은 프로세스 기동 비용이 더 크므로 단일 프로세스)"""
+        num_proc = PREPROCESS_NUM_PROC or min(8, os.cpu_count() or 1)
+        if num_rows < 1000:
+            return 1
+        return max(1, num_proc)
+
+    def _cache_key(self, tokenizer, config) -> str:
+        """데이터셋 파일 내용 + 토크나이저 + 전처리 설정 해시"""
+        digest = hashlib.sha256()
+        with open(self.dataset_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+
+        payload = {
+            "dataset_sha256": digest.hexdigest(),
+            "tokenizer": getattr(tokenizer, "name_or_path", type(tokenizer).__name__),
+            "vocab_size": getattr(tokenizer, "vocab_size", None),
+            "num_tokens": len(tokenizer),
+            "pad_token_id": getattr(tokenizer, "pad_token_id", None),
+            "eos_token_id": getattr(tokenizer, "eos_token_id", None),
+            "bos_token_id": getattr(tokenizer, "bos_token_id", None),
+            "max_seq_length": config.get("max_seq_length", 512),
+            "prompt": self._create_input_prompt("{input}"),
+            "version": PREPROCESS_VERSION
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _save_cache(self, dataset: Dataset, cache_path: str):
+        """임시 디렉터리에 저장 후 교체 (중단된 저장이 캐시로 읽히지 않도록)"""
+        try:
+            tmp_path = f"{cache_path}.tmp"
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            dataset.save_to_disk(tmp_path)
+            shutil.rmtree(cache_path, ignore_errors=True)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"💾 전처리 캐시 저장 - {cache_path}")
+        except Exception as e:
+            # 저장에 실패해도 이번 학습은 메모리의 전처리 결과로 진행 (다음 실행에서 다시 전처리)
+            logger.warning(f"⚠️ 전처리 캐시 저장 실패: {e}")
+
     def _create_input_prompt(self, input_text: str) -> str:
         """입력 프롬프트 생성 (출력 부분 제외)"""
         return f"""다음 뉴스를 한국어로 간결하게 요약해주세요.
 
 입력: {input_text}
 
-요약:""" 
\ No newline at end of file
+요약:"""
@@ -23,10 +23,36 @@ from peft import (
     TaskType,
     prepare_model_for_kbit_training
 )
+from transformers.trainer_pt_utils import LengthGroupedSampler
 from datetime import datetime
+from .data_collators import BATCHING_MODES, DynamicPaddingCollator, PackingCollator, add_length_column, supports_packed_attention
+from .training_profile import resolve_profile, cpu_training_arguments, select_smoke_subset
+from .token_corpus import TokenCorpus
 
 logger = logging.getLogger(__name__)
 
+# 학습 배치 구성 방식 (padded: 기존 max_seq_length 패딩, dynamic: 길이 그룹 + 동적 패딩, packing: 시퀀스 패킹)
+BATCHING_MODE = os.getenv("SUMMARIZER_BATCHING_MODE", "dynamic")
+GRADIENT_ACCUMULATION_STEPS = 8
+# 토큰 코퍼스는 생성 시 토크나이저로 만든 데이터이므로 학습 전 검증은 앞쪽 일부 샘플만
+CORPUS_VALIDATE_SAMPLES = int(os.getenv("SUMMARIZER_CORPUS_VALIDATE_SAMPLES", "1000"))
+
+class CorpusTrainer(Trainer):
+    """
+    TokenCorpus 학습용 Trainer
+    group_by_length일 때 LengthGroupedSampler에 offsets로 계산한 샘플 길이를 넘김
+    (기본 Trainer는 datasets.Dataset이 아니면 모든 샘플을 __getitem__으로 읽어 길이를 계산)
+    """
+
+    def _get_train_sampler(self, *args, **kwargs):
+        train_dataset = args[0] if args else kwargs.get("train_dataset", self.train_dataset)
+        if self.args.group_by_length and isinstance(train_dataset, TokenCorpus):
+            return LengthGroupedSampler(
+                self.args.train_batch_size * self.args.gradient_accumulation_steps,
+                lengths=train_dataset.lengths().tolist()
+            )
+        return super()._get_train_sampler(*args, **kwargs)
+
 class ModelLoader:
     """QLoRA 모델 로더"""
     
@@ -34,10 +60,11 @@ class ModelLoader:
         self.base_model_name = "skt/kogpt2-base-v2"  # KoGPT2 한국어 생성 모델 (RTX 2080 호환, 한국어 요약 최적화)
         self.output_dir = "./outputs"
         
-    async def load_model_for_training(self) -> Tuple[Any, Any]:
-        """학습용 모델 및 토크나이저 로드"""
+    async def load_model_for_training(self, profile: str = None) -> Tuple[Any, Any]:
+        """학습용 모델 및 토크나이저 로드 (profile: gpu=QLoRA 4bit, cpu=fp32 LoRA)"""
         try:
-            logger.info("Loading model and tokenizer for training...")
+            profile = resolve_profile(profile)
+            logger.info(f"Loading model and tokenizer for training... (profile: {profile})")
             
             # GPU 메모리 정리
             torch.cuda.empty_cache()
@@ -154,6 +181,19 @@ class ModelLoader:
             logger.info(f"   - eos_token: '{tokenizer.eos_token}' (id: {tokenizer.eos_token_id})")
             logger.info(f"   - padding_side: {tokenizer.padding_side}")
             
+            if profile == "cpu":
+                # CPU: bitsandbytes 4bit 양자화 없이 fp32 가중치에 LoRA 적용 (bf16은 Trainer autocast로 처리)
+                model = AutoModelForCausalLM.from_pretrained(
+                    self.base_model_name,
+                    torch_dtype=torch.float32,
+                    low_cpu_mem_usage=True,
+                    use_cache=False,
+                    attn_implementation="eager"
+                )
+                model = self._setup_lora(model, quantized=False)
+                logger.info("Model and tokenizer loaded successfully (CPU)")
+                return model, tokenizer
+            
             # KoGPT2-base 모델용 device_map 설정 (RTX 2080 최적화)
             device_map = "auto"  # KoGPT2-base는 8GB GPU에 충분히 들어감
             
@@ -199,16 +239,17 @@ class ModelLoader:
             logger.error(f"Failed to load model: {str(e)}")
             raise e
     
-    def _setup_lora(self, model):
-        """QLoRA 설정 및 적용"""
+    def _setup_lora(self, model, quantized: bool = True):
+        """QLoRA 설정 및 적용 (quantized=False면 kbit 준비 단계 생략)"""
         logger.info("Setting up QLoRA configuration")
         
         # 모델을 kbit 학습용으로 준비 (gradient checkpointing 완전 비활성화)
-        model = prepare_model_for_kbit_training(
-            model, 
-            use_gradient_checkpointing=False,
-            gradient_checkpointing_kwargs=None
-        )
+        if quantized:
+            model = prepare_model_for_kbit_training(
+                model, 
+                use_gradient_checkpointing=False,
+                gradient_checkpointing_kwargs=None
+            )
         
         # KoGPT2-base 한국어 최적화된 LoRA 설정
         lora_config = LoraConfig(
@@ -237,19 +278,53 @@ class ModelLoader:
                 model.gradient_checkpointing_disable()
                 logger.info("Model gradient checkpointing disabled")
             
+            # 배치 구성 방식 결정
+            batching_mode = config.get("batching_mode") or BATCHING_MODE
+            if batching_mode not in BATCHING_MODES:
+                raise ValueError(f"Unknown batching_mode: {batching_mode} (choose from {BATCHING_MODES})")
+            if batching_mode == "packing" and not supports_packed_attention(model):
+                # 4D 마스크를 무시하는 버전에서는 패킹된 샘플끼리 attention이 섞이므로 학습하지 않음
+                raise ValueError("batching_mode=packing requires a transformers version whose GPT2 honors 4D attention masks; use 'dynamic' instead")
+            
+            per_device_batch_size = config.get("batch_size", 1)
+            gradient_accumulation_steps = GRADIENT_ACCUMULATION_STEPS
+            if batching_mode != "padded":
+                # 누적하던 샘플을 한 번의 forward로 처리 (optimizer step당 샘플 수는 동일, 패딩 토큰 연산 제거)
+                per_device_batch_size *= gradient_accumulation_steps
+                gradient_accumulation_steps = 1
+            if isinstance(train_dataset, TokenCorpus):
+                # 토큰 코퍼스는 길이 컬럼 대신 CorpusTrainer가 offsets로 샘플 길이를 계산해 LengthGroupedSampler에 전달
+                if batching_mode == "padded":
+                    train_dataset = train_dataset.with_padding(config.get("max_seq_length", 512), tokenizer.pad_token_id)
+            elif batching_mode == "dynamic":
+                train_dataset = add_length_column(train_dataset)
+            train_dataset = select_smoke_subset(train_dataset, config.get("max_samples"))
+            
+            # 학습 프로파일별 정밀도/옵티마이저/데이터로더 설정
+            profile = resolve_profile(config.get("profile"))
+            profile_args = {
+                "fp16": True,   # fp16 활성화
+                "bf16": False,  # bf16 비활성화
+                "tf32": False,  # tf32 비활성화
+                "optim": "paged_adamw_8bit",  # 옵티마이저 (메모리 효율적)
+                "dataloader_num_workers": 0,  # 데이터로더 설정 (안정성 최우선)
+                "dataloader_pin_memory": False,  # 메모리 안정성
+            }
+            if profile == "cpu":
+                profile_args = cpu_training_arguments(config)
+            logger.info(f"Batching mode: {batching_mode} (batch={per_device_batch_size}, accumulation={gradient_accumulation_steps})")
+            
             # KoGPT2 RTX 2080 최적화된 학습 인수 설정
             training_args = TrainingArguments(
                 output_dir=self.output_dir,
-                per_device_train_batch_size=config.get("batch_size", 1),
-                gradient_accumulation_steps=8,  # KoGPT2는 적은 accumulation으로 안정적
+                per_device_train_batch_size=per_device_batch_size,
+                gradient_accumulation_steps=gradient_accumulation_steps,  # KoGPT2는 적은 accumulation으로 안정적
                 num_train_epochs=config.get("epochs", 15),
+                max_steps=config.get("max_steps") or -1,  # 스모크 학습 시 스텝 수 제한
                 learning_rate=config.get("learning_rate", 2e-4),
                 
-                # 정밀도 설정 (KoGPT2 + RTX 2080 최적화)
-                fp16=True,   # fp16 활성화
-                bf16=False,  # bf16 비활성화 
-                tf32=False,  # tf32 비활성화
-                dataloader_pin_memory=False,  # 메모리 안정성
+                # 정밀도/옵티마이저/데이터로더 설정 (gpu: KoGPT2 + RTX 2080 최적화, cpu: fp32/bf16 + 멀티 워커)
+                **profile_args,
                 
                 # 저장 및 로깅
                 save_steps=200,
@@ -261,21 +336,16 @@ class ModelLoader:
                 warmup_ratio=0.03,
                 lr_scheduler_type="cosine",
                 
-                # 옵티마이저 (메모리 효율적)
-                optim="paged_adamw_8bit",
-                
                 # 기타 설정
                 load_best_model_at_end=False,
                 report_to=None,
                 run_name=f"summarizer-qlora-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
                 
-                # 데이터로더 설정 (안정성 최우선)
-                dataloader_num_workers=0,
                 dataloader_drop_last=True,
                 
                 # 모델 관련 설정
                 remove_unused_columns=False,
-                group_by_length=True,
+                group_by_length=batching_mode != "packing",  # 패킹은 길이가 섞여야 행이 잘 채워짐
                 
                 # Gradient 관련 설정 (QLoRA 최적화)
                 gradient_checkpointing=False,  # 완전히 비활성화
@@ -296,13 +366,22 @@ class ModelLoader:
             )
             
             # GPT2 계열 최적화된 데이터 콜레이터 설정
-            data_collator = DataCollatorWithPadding(
-                tokenizer=tokenizer,
-                padding=True,
-                max_length=512,
-                pad_to_multiple_of=8,
-                return_tensors="pt"
-            )
+            if batching_mode == "packing":
+                data_collator = PackingCollator(
+                    pad_token_id=tokenizer.pad_token_id,
+                    max_seq_length=config.get("max_seq_length", 512),
+                    pad_to_multiple_of=8
+                )
+            elif batching_mode == "dynamic":
+                data_collator = DynamicPaddingCollator(pad_token_id=tokenizer.pad_token_id, pad_to_multiple_of=8)
+            else:
+                data_collator = DataCollatorWithPadding(
+                    tokenizer=tokenizer,
+                    padding=True,
+                    max_length=512,
+                    pad_to_multiple_of=8,
+                    return_tensors="pt"
+                )
             
             # 🔍 강화된 데이터 검증 함수 (device-side assert 방지)
             def validate_dataset(dataset):
@@ -467,13 +546,17 @@ class ModelLoader:
                 logger.info("[OK] 데이터셋 검증 완료!")
                 return valid_count, invalid_count
             
-            # 데이터셋 검증 실행
-            validate_dataset(train_dataset)
+            # 데이터셋 검증 실행 (토큰 코퍼스는 memmap 전체를 읽지 않도록 앞쪽 일부만)
+            if isinstance(train_dataset, TokenCorpus) and len(train_dataset) > CORPUS_VALIDATE_SAMPLES:
+                validate_dataset(train_dataset.select(range(CORPUS_VALIDATE_SAMPLES)))
+            else:
+                validate_dataset(train_dataset)
             
             logger.info("Creating QLoRA trainer...")
             
             # GPT2 QLoRA 최적화된 Trainer 생성
-            trainer = Trainer(
+            trainer_cls = CorpusTrainer if isinstance(train_dataset, TokenCorpus) else Trainer
+            trainer = trainer_cls(
                 model=model,
                 args=training_args,
                 train_dataset=train_dataset,
@@ -490,7 +573,8 @@ class ModelLoader:
             assert trainer.tokenizer.padding_side == "right", f"Wrong padding_side: {trainer.tokenizer.padding_side}"
             
             # 데이터 콜레이터 확인
-            assert hasattr(trainer.data_collator, 'tokenizer'), "Data collator missing tokenizer"
+            if batching_mode == "padded":
+                assert hasattr(trainer.data_collator, 'tokenizer'), "Data collator missing tokenizer"
             
             logger.info("✅ Trainer configuration verified successfully")
             
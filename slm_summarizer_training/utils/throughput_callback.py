@@ -0,0 +1,230 @@
+"""
+학습 처리량 계측 콜백
+느린 학습이 데이터 로딩(I/O) 병목인지 연산 병목인지 구분하기 위해 optimizer 스텝마다 기록
+- step_seconds: 이전 스텝 종료 ~ 이번 스텝 종료 wall time
+- data_wait_seconds: 마이크로 배치 경계 ~ 모델 forward 시작 (배치 로딩/콜레이트/디바이스 복사)
+- compute_seconds: forward 시작 ~ 마이크로 배치 종료 (forward/backward/optimizer, CUDA는 동기화 후 측정)
+- 나머지(other)는 로깅/체크포인트 저장 등
+- tokens/padding: 모델 forward 입력의 attention_mask 기준 (데이터로더 워커를 써도 메인 프로세스에서 집계)
+- 메모리: 스텝별 CUDA 최대 할당량, 프로세스 최대 RSS
+스텝 기록과 최종 요약은 JSONL 실행 로그로 저장
+"""
+import os
+import sys
+import json
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import torch
+from transformers import TrainerCallback
+
+logger = logging.getLogger(__name__)
+
+# 실행 로그 디렉터리 (빈 값이면 파일 기록 안 함)
+THROUGHPUT_LOG_DIR = os.getenv("SUMMARIZER_THROUGHPUT_LOG_DIR", "./logs/throughput")
+# API로 노출할 최근 스텝 기록 수
+THROUGHPUT_WINDOW = int(os.getenv("SUMMARIZER_THROUGHPUT_WINDOW", "100"))
+# 전체 시간 중 데이터 대기 비율이 이 값을 넘으면 데이터 로딩 병목으로 판단
+DATA_BOUND_RATIO = 0.2
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / (1024 if sys.platform == "darwin" else 1)  # macOS는 bytes, Linux는 KB
+    except ImportError:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss) / 1024**2
+
+class ThroughputCallback(TrainerCallback):
+    """optimizer 스텝별 처리량/대기 시간/메모리 계측 (Trainer.add_callback으로 등록)"""
+
+    def __init__(self, run_name: Optional[str] = None, log_dir: Optional[str] = None, window: int = THROUGHPUT_WINDOW):
+        self.run_name = run_name or f"summarizer-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        self.log_dir = THROUGHPUT_LOG_DIR if log_dir is None else log_dir
+        self.log_path = os.path.join(self.log_dir, f"{self.run_name}.jsonl") if self.log_dir else None
+        self.recent = deque(maxlen=window)
+        self.cuda = torch.cuda.is_available()
+        self._hook = None
+        self._log_file = None
+        self._reset_totals()
+        self._reset_step()
+
+    def _reset_totals(self):
+        self.totals = {
+            "steps": 0,
+            "step_seconds": 0.0,
+            "data_wait_seconds": 0.0,
+            "compute_seconds": 0.0,
+            "tokens": 0,
+            "slots": 0,
+            "learnable_tokens": 0,
+            "peak_cuda_allocated_mb": 0.0,
+            "peak_cuda_reserved_mb": 0.0
+        }
+        self.started_at = None
+        self.finished_at = None
+
+    def _reset_step(self):
+        self._data_wait = 0.0
+        self._compute = 0.0
+        self._tokens = 0
+        self._slots = 0
+        self._learnable = 0
+        self._forward_started = None
+
+    def _on_forward(self, module, args, kwargs):
+        """모델 forward 직전 (학습 forward만): 데이터 대기 종료 시점 + 배치 토큰 수 집계"""
+        if not module.training:
+            return
+        now = time.perf_counter()
+        self._data_wait += now - self._boundary
+        self._forward_started = now
+
+        attention_mask = kwargs.get("attention_mask")
+        input_ids = kwargs.get("input_ids")
+        labels = kwargs.get("labels")
+        if attention_mask is not None and attention_mask.dim() == 4:
+            # 패킹 블록 마스크: 패딩은 자기 자신만 보고 아무도 보지 않음 (샘플은 최소 2토큰이라 실제 토큰은 항상 다른 위치와 연결)
+            allowed = attention_mask[:, 0] == 0
+            self._tokens += ((allowed.sum(-1) + allowed.sum(-2)) > 2).sum()
+            self._slots += allowed.shape[0] * allowed.shape[1]
+        elif attention_mask is not None:
+            self._tokens += attention_mask.sum()  # 텐서로 누적, 스텝 종료 시 한 번만 동기화
+            self._slots += attention_mask.numel()
+        elif input_ids is not None:
+            self._tokens += input_ids.numel()
+            self._slots += input_ids.numel()
+        if labels is not None:
+            self._learnable += (labels != -100).sum()
+
+    def _close_microbatch(self):
+        """마이크로 배치 종료: 연산 시간 누적 후 다음 데이터 대기 시작"""
+        if self.cuda:
+            torch.cuda.synchronize()
+        now = time.perf_counter()
+        if self._forward_started is not None:
+            self._compute += now - self._forward_started
+            self._forward_started = None
+        self._boundary = now
+        return now
+
+    def on_train_begin(self, args, state, control, model=None, **kwargs):
+        self._reset_totals()
+        self._reset_step()
+        self.recent.clear()
+        if model is not None:
+            self._hook = model.register_forward_pre_hook(self._on_forward, with_kwargs=True)
+        if self.cuda:
+            torch.cuda.reset_peak_memory_stats()
+        if self.log_path:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._log_file = open(self.log_path, "a", encoding="utf-8")
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        now = time.perf_counter()
+        self._train_started = now
+        self._step_started = now
+        self._boundary = now
+
+    def on_substep_end(self, args, state, control, **kwargs):
+        self._close_microbatch()
+
+    def on_step_end(self, args, state, control, **kwargs):
+        now = self._close_microbatch()
+        step_seconds = now - self._step_started
+        self._step_started = now
+
+        tokens = int(self._tokens)
+        slots = int(self._slots)
+        learnable = int(self._learnable)
+        record = {
+            "step": state.global_step,
+            "step_seconds": round(step_seconds, 4),
+            "data_wait_seconds": round(self._data_wait, 4),
+            "compute_seconds": round(self._compute, 4),
+            "other_seconds": round(max(0.0, step_seconds - self._data_wait - self._compute), 4),
+            "tokens": tokens,
+            "learnable_tokens": learnable,
+            "tokens_per_second": round(tokens / step_seconds, 1) if step_seconds > 0 else None,
+            "padding_ratio": round(1 - tokens / slots, 4) if slots else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1)
+        }
+        if self.cuda:
+            allocated = torch.cuda.max_memory_allocated() / 1024**2
+            reserved = torch.cuda.max_memory_reserved() / 1024**2
+            record["cuda_peak_allocated_mb"] = round(allocated, 1)
+            record["cuda_peak_reserved_mb"] = round(reserved, 1)
+            self.totals["peak_cuda_allocated_mb"] = max(self.totals["peak_cuda_allocated_mb"], allocated)
+            self.totals["peak_cuda_reserved_mb"] = max(self.totals["peak_cuda_reserved_mb"], reserved)
+            torch.cuda.reset_peak_memory_stats()  # 다음 스텝은 스텝 내 최대값만
+
+        self.totals["steps"] += 1
+        self.totals["step_seconds"] += step_seconds
+        self.totals["data_wait_seconds"] += self._data_wait
+        self.totals["compute_seconds"] += self._compute
+        self.totals["tokens"] += tokens
+        self.totals["slots"] += slots
+        self.totals["learnable_tokens"] += learnable
+        self.recent.append(record)
+        self._write({"type": "step", **record})
+        self._reset_step()
+
+    def on_log(self, args, state, control, **kwargs):
+        # 로깅/저장 시간이 다음 스텝의 데이터 대기로 잡히지 않도록 경계 갱신
+        self._boundary = time.perf_counter()
+
+    def on_save(self, args, state, control, **kwargs):
+        self._boundary = time.perf_counter()
+
+    def on_train_end(self, args, state, control, **kwargs):
+        if self._hook is not None:
+            self._hook.remove()
+            self._hook = None
+        self.finished_at = datetime.now().isoformat(timespec="seconds")
+        summary = self.summary()
+        self._write({"type": "summary", **summary})
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        logger.info(f"⏱️ 학습 처리량 - {summary['tokens_per_second']} tokens/s, 데이터 대기 {summary['data_wait_ratio']:.1%}, "
+                    f"패딩 {summary['padding_ratio']}, 병목: {summary['bottleneck']} (로그: {self.log_path})")
+
+    def _write(self, payload: Dict[str, Any]):
+        if self._log_file is not None:
+            self._log_file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            self._log_file.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        """실행 전체 요약 (학습 중에도 조회 가능)"""
+        totals = self.totals
+        wall = totals["step_seconds"]
+        data_wait_ratio = totals["data_wait_seconds"] / wall if wall else 0.0
+        return {
+            "run_name": self.run_name,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "steps": totals["steps"],
+            "train_seconds": round(wall, 2),
+            "avg_step_seconds": round(wall / totals["steps"], 4) if totals["steps"] else None,
+            "data_wait_seconds": round(totals["data_wait_seconds"], 2),
+            "compute_seconds": round(totals["compute_seconds"], 2),
+            "data_wait_ratio": round(data_wait_ratio, 4),
+            "tokens": totals["tokens"],
+            "learnable_tokens": totals["learnable_tokens"],
+            "tokens_per_second": round(totals["tokens"] / wall, 1) if wall else None,
+            "padding_ratio": round(1 - totals["tokens"] / totals["slots"], 4) if totals["slots"] else None,
+            "peak_cuda_allocated_mb": round(totals["peak_cuda_allocated_mb"], 1) if self.cuda else None,
+            "peak_cuda_reserved_mb": round(totals["peak_cuda_reserved_mb"], 1) if self.cuda else None,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "bottleneck": "data_loading" if data_wait_ratio > DATA_BOUND_RATIO else "compute",
+            "log_path": self.log_path
+        }
+
+    def recent_steps(self) -> List[Dict[str, Any]]:
+        """최근 스텝 기록 (최대 window개)"""
+        return list(self.recent)
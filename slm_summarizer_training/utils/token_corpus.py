@@ -0,0 +1,152 @@
+"""
+메모리 맵 토큰화 코퍼스
+전처리된 샘플을 패딩 없이 평탄한 바이너리 파일로 저장하고 np.memmap으로 샘플 단위 랜덤 접근
+- tokens.bin: 전체 샘플의 토큰 id를 이어붙인 배열 (vocab 크기에 따라 uint16/uint32)
+- offsets.bin: 샘플 i의 토큰 구간 [offsets[i], offsets[i+1]) (uint64, 샘플 수 + 1)
+- prompt_lengths.bin: 샘플별 프롬프트 토큰 수 (uint32, 이후 토큰만 labels로 학습)
+- meta.json: dtype/샘플 수/토큰 수 (모든 파일 기록 후 임시 디렉터리를 교체하므로 있으면 완성된 코퍼스)
+"""
+import os
+import json
+import shutil
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+from torch.utils.data import Dataset
+
+logger = logging.getLogger(__name__)
+
+TOKENS_FILENAME = "tokens.bin"
+OFFSETS_FILENAME = "offsets.bin"
+PROMPT_LENGTHS_FILENAME = "prompt_lengths.bin"
+META_FILENAME = "meta.json"
+
+def token_dtype(vocab_size: int) -> np.dtype:
+    """vocab 크기에 맞는 최소 토큰 dtype (KoGPT2 51200 -> uint16)"""
+    return np.dtype(np.uint16 if vocab_size <= np.iinfo(np.uint16).max + 1 else np.uint32)
+
+class TokenCorpusWriter:
+    """
+    배치 단위로 파일 끝에 추가 기록 (메모리 사용량이 코퍼스 크기와 무관)
+    close()에서 meta.json 기록 후 임시 디렉터리를 최종 경로로 교체
+    """
+
+    def __init__(self, path: str, vocab_size: int):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.dtype = token_dtype(vocab_size)
+        self.num_samples = 0
+        self.num_tokens = 0
+
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+        self._tokens = open(os.path.join(self.tmp_path, TOKENS_FILENAME), "wb")
+        self._offsets = open(os.path.join(self.tmp_path, OFFSETS_FILENAME), "wb")
+        self._prompt_lengths = open(os.path.join(self.tmp_path, PROMPT_LENGTHS_FILENAME), "wb")
+        self._offsets.write(np.zeros(1, dtype=np.uint64).tobytes())
+
+    def add_batch(self, input_ids: np.ndarray, lengths: np.ndarray, prompt_lengths: np.ndarray):
+        """오른쪽 패딩된 (batch, max_seq_length) 배열에서 실제 토큰만 이어붙여 기록"""
+        if len(lengths) == 0:
+            return
+        mask = np.arange(input_ids.shape[1])[None, :] < lengths[:, None]
+        self._tokens.write(input_ids[mask].astype(self.dtype).tobytes())  # 행 우선 순서 유지
+        self._offsets.write((self.num_tokens + np.cumsum(lengths)).astype(np.uint64).tobytes())
+        self._prompt_lengths.write(prompt_lengths.astype(np.uint32).tobytes())
+        self.num_samples += len(lengths)
+        self.num_tokens += int(lengths.sum())
+
+    def close(self, meta: Optional[Dict[str, Any]] = None):
+        """파일 닫기 + meta.json 기록 + 최종 경로로 교체"""
+        for handle in (self._tokens, self._offsets, self._prompt_lengths):
+            handle.close()
+        payload = {
+            "dtype": self.dtype.name,
+            "num_samples": self.num_samples,
+            "num_tokens": self.num_tokens,
+            **(meta or {})
+        }
+        with open(os.path.join(self.tmp_path, META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        """기록 중단 (임시 디렉터리 삭제)"""
+        for handle in (self._tokens, self._offsets, self._prompt_lengths):
+            handle.close()
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+class TokenCorpus(Dataset):
+    """
+    메모리 맵 코퍼스 Dataset
+    - 샘플 조회 시 offsets로 해당 토큰 구간만 memmap에서 읽음 (전체 코퍼스를 메모리에 올리지 않음)
+    - input_ids/attention_mask/labels는 패딩 없이 반환 (dynamic/packing 콜레이터가 배치 단위로 패딩)
+    - padded 배치 구성용으로 with_padding()을 쓰면 max_seq_length까지 오른쪽 패딩
+    - 데이터로더 워커로 전달될 때는 memmap 대신 경로만 넘기고 워커에서 다시 매핑
+    """
+
+    def __init__(self, path: str, indices: Optional[np.ndarray] = None,
+                 pad_to: Optional[int] = None, pad_token_id: Optional[int] = None):
+        self.path = path
+        self.indices = indices
+        self.pad_to = pad_to
+        self.pad_token_id = pad_token_id
+        self._open()
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, META_FILENAME))
+
+    def _open(self):
+        with open(os.path.join(self.path, META_FILENAME), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.tokens = np.memmap(os.path.join(self.path, TOKENS_FILENAME), dtype=self.meta["dtype"], mode="r")
+        self.offsets = np.memmap(os.path.join(self.path, OFFSETS_FILENAME), dtype=np.uint64, mode="r")
+        self.prompt_lengths = np.memmap(os.path.join(self.path, PROMPT_LENGTHS_FILENAME), dtype=np.uint32, mode="r")
+
+    def __getstate__(self):
+        # np.memmap을 그대로 pickle하면 전체 배열이 복사되므로 경로만 전달
+        state = dict(self.__dict__)
+        for key in ("tokens", "offsets", "prompt_lengths"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self.indices) if self.indices is not None else self.meta["num_samples"]
+
+    def __getitem__(self, index: int) -> Dict[str, list]:
+        row = int(self.indices[index]) if self.indices is not None else index
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        input_ids = self.tokens[start:end].tolist()
+        prompt_length = min(int(self.prompt_lengths[row]), len(input_ids))
+        labels = [-100] * prompt_length + input_ids[prompt_length:]
+        attention_mask = [1] * len(input_ids)
+
+        if self.pad_to and len(input_ids) < self.pad_to:
+            padding = self.pad_to - len(input_ids)
+            input_ids = input_ids + [self.pad_token_id] * padding
+            labels = labels + [-100] * padding
+            attention_mask = attention_mask + [0] * padding
+        return {"input_ids": input_ids, "attention_mask": attention_mask, "labels": labels}
+
+    def lengths(self) -> np.ndarray:
+        """샘플별 실제 토큰 수"""
+        lengths = np.diff(self.offsets).astype(np.int64)
+        return lengths[self.indices] if self.indices is not None else lengths
+
+    def select(self, indices: Iterable[int]) -> "TokenCorpus":
+        """부분집합 뷰 (datasets.Dataset.select와 같은 용도, 파일은 공유)"""
+        indices = np.asarray(list(indices), dtype=np.int64)
+        if self.indices is not None:
+            indices = self.indices[indices]
+        return TokenCorpus(self.path, indices, self.pad_to, self.pad_token_id)
+
+    def with_padding(self, max_seq_length: int, pad_token_id: int) -> "TokenCorpus":
+        """max_seq_length까지 오른쪽 패딩해서 반환하는 뷰 (padded 배치 구성용)"""
+        return TokenCorpus(self.path, self.indices, max_seq_length, pad_token_id)
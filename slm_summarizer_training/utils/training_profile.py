@@ -0,0 +1,76 @@
+"""
+학습 프로파일 유틸리티
+GPU(QLoRA 4bit + fp16)와 CPU(fp32/bf16, 멀티 워커 데이터 로딩, torch.compile) 학습 설정 선택
+CPU 빌드 머신에서도 소규모 스모크 학습/회귀 테스트가 가능하도록 함
+"""
+import os
+import inspect
+import logging
+from typing import Any, Dict, Optional
+
+import torch
+from transformers import TrainingArguments
+
+logger = logging.getLogger(__name__)
+
+# 학습 프로파일 (auto: CUDA 사용 가능하면 gpu, 아니면 cpu)
+TRAINING_PROFILE = os.getenv("SUMMARIZER_TRAINING_PROFILE", "auto")
+# CPU 학습 정밀도 (fp32 | bf16, bf16은 autocast로 적용)
+CPU_DTYPE = os.getenv("SUMMARIZER_CPU_DTYPE", "fp32")
+# CPU 학습 데이터로더 워커 수
+CPU_NUM_WORKERS = int(os.getenv("SUMMARIZER_CPU_NUM_WORKERS", str(min(4, os.cpu_count() or 1))))
+# CPU 학습 시 torch.compile 사용 여부 (지원되지 않는 환경에서는 자동으로 끔)
+CPU_TORCH_COMPILE = os.getenv("SUMMARIZER_CPU_TORCH_COMPILE", "false").lower() == "true"
+
+PROFILES = ("auto", "gpu", "cpu")
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """요청/환경변수 프로파일을 gpu 또는 cpu로 확정"""
+    profile = (profile or TRAINING_PROFILE).lower()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown training profile: {profile} (choose from {PROFILES})")
+    if profile == "auto":
+        return "gpu" if torch.cuda.is_available() else "cpu"
+    if profile == "gpu" and not torch.cuda.is_available():
+        raise RuntimeError("GPU 학습 프로파일이 지정되었지만 CUDA를 사용할 수 없습니다")
+    return profile
+
+def torch_compile_available() -> bool:
+    """torch.compile 사용 가능 여부 (torch 2.x, Windows 제외)"""
+    return hasattr(torch, "compile") and os.name != "nt"
+
+def cpu_training_arguments(config: Dict[str, Any]) -> Dict[str, Any]:
+    """CPU 프로파일용 TrainingArguments 인자 (요청 config 값이 환경변수보다 우선)"""
+    dtype = (config.get("cpu_dtype") or CPU_DTYPE).lower()
+    if dtype not in ("fp32", "bf16"):
+        raise ValueError(f"Unknown cpu_dtype: {dtype} (choose from fp32, bf16)")
+    num_workers = config.get("dataloader_num_workers")
+    num_workers = CPU_NUM_WORKERS if num_workers is None else num_workers
+    use_compile = config.get("torch_compile")
+    use_compile = CPU_TORCH_COMPILE if use_compile is None else use_compile
+    if use_compile and not torch_compile_available():
+        logger.warning("⚠️ torch.compile을 사용할 수 없는 환경입니다. 비활성화합니다.")
+        use_compile = False
+
+    # transformers 4.34 미만은 use_cpu 대신 no_cuda
+    cpu_flag = "use_cpu" if "use_cpu" in inspect.signature(TrainingArguments.__init__).parameters else "no_cuda"
+    arguments = {
+        cpu_flag: True,
+        "fp16": False,
+        "bf16": dtype == "bf16",
+        "tf32": False,
+        "optim": "adamw_torch",
+        "dataloader_num_workers": num_workers,
+        "dataloader_persistent_workers": num_workers > 0,
+        "dataloader_pin_memory": False,
+        "torch_compile": use_compile,
+    }
+    logger.info(f"🔧 CPU 학습 프로파일 - dtype: {dtype}, workers: {num_workers}, torch.compile: {use_compile}, threads: {torch.get_num_threads()}")
+    return arguments
+
+def select_smoke_subset(dataset, max_samples: Optional[int]):
+    """스모크 학습용 앞쪽 max_samples개 부분집합 (None/0이면 전체)"""
+    if not max_samples or max_samples >= len(dataset):
+        return dataset
+    logger.info(f"🧪 스모크 학습 - {len(dataset)}개 중 {max_samples}개 샘플만 사용")
+    return dataset.select(range(max_samples))
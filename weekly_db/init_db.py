@@ -31,7 +31,7 @@ if not os.getenv('DATABASE_URL'):
 # 각 서비스의 Base 모델 import
 try:
     from weekly_disclosure.app.domain.model.disclosure_model import Base as DisclosureBase, DisclosureModel
-    from weekly_issue.app.domain.model.issue_model import Base as IssueBase, IssueModel
+    from weekly_issue.app.domain.model.issue_model import Base as IssueBase, IssueModel, ISSUE_INDEX_DDL
     from weekly_stockprice.app.domain.model.stockprice_model import Base as StockPriceBase, StockPriceModel, DailyStockDataModel
     from weekly_db.db.weekly_unified_model import Base as WeeklyBase, WeeklyDataModel, WeeklyBatchJobModel
     print("✅ 모든 모델 클래스 import 완료")
@@ -96,6 +96,13 @@ async def create_all_tables(dry_run=False):
         async with engine.begin() as conn:
             await conn.run_sync(IssueBase.metadata.create_all)
         
+        # 기존 issues 테이블에도 인덱스 적용 (IF NOT EXISTS로 반복 실행 가능)
+        print("📋 weekly_issue 인덱스 적용...")
+        from sqlalchemy import text
+        async with engine.begin() as conn:
+            for ddl in ISSUE_INDEX_DDL:
+                await conn.execute(text(ddl))
+        
         print("📋 weekly_stockprice 테이블 생성...")
         async with engine.begin() as conn:
             await conn.run_sync(StockPriceBase.metadata.create_all)
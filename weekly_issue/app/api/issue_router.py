@@ -110,13 +110,17 @@ async def get_recent_issues(
 @router.get("/search", response_model=IssueListResponse)
 async def search_issues(
     corp: Optional[str] = Query(None, description="기업명"),
-    keyword: Optional[str] = Query(None, description="키워드"),
-    min_confidence: Optional[float] = Query(None, description="최소 신뢰도"),
-    page: int = Query(1, description="페이지 번호"),
-    page_size: int = Query(20, description="페이지 크기"),
+    keyword: Optional[str] = Query(None, description="키워드 (제목/요약 전문 검색, 관련도순)"),
+    min_confidence: Optional[float] = Query(None, ge=0.0, le=1.0, description="최소 신뢰도"),
+    sentiment: Optional[str] = Query(None, description="감정 분석 결과"),
+    start_date: Optional[str] = Query(None, description="발행일 시작 (YYYYMMDD)"),
+    end_date: Optional[str] = Query(None, description="발행일 종료 (YYYYMMDD)"),
+    page: int = Query(1, ge=1, description="페이지 번호 (cursor가 없을 때만 사용)"),
+    page_size: int = Query(20, ge=1, le=100, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     db: AsyncSession = Depends(get_db_session)
 ):
-    """🔍 DB에서 이슈 정보 검색"""
+    """🔍 DB에서 이슈 정보 검색 (키워드가 있으면 관련도순, 없으면 신뢰도순)"""
     print(f"🤍1 검색 라우터 진입 - 기업: {corp}, 키워드: {keyword}")
     
     try:
@@ -125,11 +129,18 @@ async def search_issues(
             corp=corp,
             keyword=keyword,
             min_confidence=min_confidence,
+            sentiment=sentiment,
+            start_date=start_date,
+            end_date=end_date,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor
         )
         print("🤍2 검색 라우터 - 컨트롤러 호출 완료")
         return result
+    except ValueError as e:
+        print(f"❌ 검색 라우터 요청 오류: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"❌ 검색 라우터 에러: {str(e)}")
         raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
@@ -159,6 +170,12 @@ async def health_check():
     print("💚 헬스체크 진입")
     return {"status": "healthy", "service": "issue_analysis"}
 
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """💾 분류/요약 결과 캐시 통계"""
+    from app.domain.service.result_cache_service import result_cache_service
+    return result_cache_service.get_stats()
+
 @router.get("/")
 async def root():
     """📋 서비스 정보"""
@@ -175,7 +192,8 @@ async def root():
             "recent": "/issue/recent",
             "search": "/issue/search",
             "high_confidence": "/issue/high-confidence",
-            "health": "/issue/health"
+            "health": "/issue/health",
+            "cache_stats": "/issue/cache-stats"
         },
         "pipeline_process": [
             "1. 뉴스 수집 (각 기업당 100개)",
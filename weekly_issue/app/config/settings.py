@@ -30,4 +30,26 @@ print(f"🔧 Summarizer URL: {SUMMARIZER_URL}")
 
 # 요청 설정
 REQUEST_TIMEOUT = 15  # 초
-MAX_RETRY_COUNT = 3  # 최대 재시도 횟수 
\ No newline at end of file
+MAX_RETRY_COUNT = 3  # 최대 재시도 횟수 
+
+# 분류기 배치 요청 설정 (청크 단위 병렬 요청)
+CLASSIFIER_BATCH_SIZE = int(os.environ.get('CLASSIFIER_BATCH_SIZE', 32))  # 요청 1회당 제목 수
+CLASSIFIER_MAX_CONCURRENCY = int(os.environ.get('CLASSIFIER_MAX_CONCURRENCY', 4))  # 동시에 보내는 청크 수
+CLASSIFIER_CHUNK_TIMEOUT = float(os.environ.get('CLASSIFIER_CHUNK_TIMEOUT', 30.0))  # 청크당 타임아웃 (초)
+
+# 결과 캐시 설정 (분류/요약 결과 재사용)
+RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+RESULT_CACHE_PATH = os.environ.get(
+    'RESULT_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cache', 'issue_result_cache.sqlite3')
+)
+RESULT_CACHE_TTL_SECONDS = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', 7 * 24 * 60 * 60))  # 기본 7일
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 50000))  # 초과 시 오래 안 쓴 항목부터 제거
+
+# 모델 버전 (모델 교체 시 캐시가 자동으로 분리되도록 캐시 키에 포함)
+CLASSIFIER_MODEL_VERSION = os.environ.get('CLASSIFIER_MODEL_VERSION', 'klue-bert-base-v1')
+SUMMARIZER_MODEL_VERSION = os.environ.get('SUMMARIZER_MODEL_VERSION', 'kogpt2-lora-v1')
+
+# 이슈 검색 설정
+ISSUE_SEARCH_MAX_PAGE_SIZE = int(os.environ.get('ISSUE_SEARCH_MAX_PAGE_SIZE', 100))  # 페이지당 최대 건수
+ISSUE_SEARCH_COUNT_LIMIT = int(os.environ.get('ISSUE_SEARCH_COUNT_LIMIT', 10000))  # total_count 상한 (대용량에서 전체 COUNT 방지)
@@ -73,8 +73,8 @@ class IssueController:
                 
                 if issue_creates:
                     # 대량 저장
-                    saved_issues = await self.db_service.bulk_create(issue_creates)
-                    print(f"🗄️4 DB 저장 완료 - {len(saved_issues)}건")
+                    saved_ids = await self.db_service.bulk_create(issue_creates)
+                    print(f"🗄️4 DB 저장 완료 - {len(saved_ids)}건 (요청 {len(issue_creates)}건)")
                 else:
                     print("🗄️4 저장할 이슈 데이터가 없음")
                 
@@ -101,8 +101,12 @@ class IssueController:
         corp: str = None,
         keyword: str = None,
         min_confidence: float = None,
+        sentiment: str = None,
+        start_date: str = None,
+        end_date: str = None,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: str = None
     ) -> IssueListResponse:
         """DB에서 이슈 검색 (DB 전용)"""
         print(f"🤍2 DB 검색 컨트롤러 진입 - 기업: {corp}, 키워드: {keyword}")
@@ -114,8 +118,12 @@ class IssueController:
             corp=corp,
             keyword=keyword,
             min_confidence=min_confidence,
+            sentiment=sentiment,
+            start_date=start_date,
+            end_date=end_date,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            cursor=cursor
         )
     
     async def get_high_confidence_issues(
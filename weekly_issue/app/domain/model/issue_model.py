@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, Float, JSON, DateTime, Index
+from sqlalchemy import Column, Integer, String, Text, Float, JSON, DateTime, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
 
 Base = declarative_base()
 
+# 전문 검색 문서 (제목 가중치 A, 요약 B)
+# 한국어 형태소 분석기가 없으므로 'simple' 설정 + 접두어 검색(크래프톤:* -> 크래프톤이)으로 조사 처리
+# GIN 표현식 인덱스와 검색 쿼리가 같은 식을 써야 인덱스를 타므로 문자열 하나로 공유
+ISSUE_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(original_title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(summary, '')), 'B')"
+)
+
 class IssueModel(Base):
     """이슈 분석 정보 SQLAlchemy 모델"""
     __tablename__ = "issues"
@@ -35,6 +43,11 @@ class IssueModel(Base):
         Index('idx_issue_confidence', 'confidence'),
         Index('idx_issue_created_at', 'created_at'),
         Index('idx_issue_sentiment', 'sentiment'),
+        # 신뢰도순 키셋 페이지네이션 (전체 / 기업별)
+        Index('idx_issue_confidence_id', 'confidence', 'id'),
+        Index('idx_issue_corp_confidence_id', 'corp', 'confidence', 'id'),
+        # 대량 저장 시 뉴스 URL 기준 중복 제거 (ON CONFLICT 대상, URL 없는 행은 제외)
+        Index('uq_issue_news_url', 'news_url', unique=True, postgresql_where=text("news_url <> ''")),
     )
     
     def __repr__(self):
@@ -55,4 +68,21 @@ class IssueModel(Base):
             "sentiment": self.sentiment,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
\ No newline at end of file
+        }
+
+# 기존 DB에 적용할 인덱스 DDL (create_all은 이미 있는 테이블의 인덱스를 만들지 않으므로 init_db에서 실행)
+ISSUE_INDEX_DDL = [
+    # 같은 뉴스 URL 중복 행은 먼저 저장된 것만 남김 (유니크 인덱스 생성 전 정리)
+    """
+    DELETE FROM issues a USING issues b
+    WHERE a.news_url = b.news_url AND a.news_url <> '' AND a.id > b.id
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_issue_news_url ON issues (news_url) WHERE news_url <> ''",
+    "CREATE INDEX IF NOT EXISTS idx_issue_confidence_id ON issues (confidence, id)",
+    "CREATE INDEX IF NOT EXISTS idx_issue_corp_confidence_id ON issues (corp, confidence, id)",
+    # 검색 인덱스: 전문 검색(tsvector) + 부분 문자열/오타 검색(pg_trgm)
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS idx_issue_search_document ON issues USING gin (({ISSUE_SEARCH_DOCUMENT}))",
+    "CREATE INDEX IF NOT EXISTS idx_issue_title_trgm ON issues USING gin (original_title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_issue_summary_trgm ON issues USING gin (summary gin_trgm_ops)",
+]
\ No newline at end of file
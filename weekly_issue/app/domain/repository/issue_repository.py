@@ -1,10 +1,54 @@
-from typing import List, Optional
-from sqlalchemy import select, and_, desc, func
+import re
+import json
+from typing import List, Optional, Tuple
+from sqlalchemy import select, and_, or_, desc, func, text, tuple_, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..model.issue_model import IssueModel
+from ..model.issue_model import IssueModel, ISSUE_SEARCH_DOCUMENT
 from ..schema.issue_schema import IssueItemCreate, IssueItemUpdate
 
+# 대량 저장용 스테이징 테이블 (트랜잭션 종료 시 자동 삭제)
+STAGING_TABLE = "issues_staging"
+STAGING_COLUMNS = [
+    "seq", "corp", "summary", "original_title", "confidence", "matched_keywords",
+    "news_url", "published_date", "category", "sentiment"
+]
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    seq integer,
+    corp varchar(100),
+    summary text,
+    original_title text,
+    confidence double precision,
+    matched_keywords text,
+    news_url text,
+    published_date varchar(20),
+    category varchar(50),
+    sentiment varchar(20)
+) ON COMMIT DROP
+"""
+
+# 스테이징 -> issues 집합 단위 병합
+# - 배치 안 같은 URL은 마지막 행만 사용, URL 없는 행은 각각 저장
+# - 이미 저장된 URL은 건너뜀 (uq_issue_news_url), 새로 저장된 행의 id만 반환
+MERGE_STAGING_SQL = f"""
+INSERT INTO issues (
+    corp, summary, original_title, confidence, matched_keywords,
+    news_url, published_date, category, sentiment
+)
+SELECT corp, summary, original_title, confidence, matched_keywords::json,
+       news_url, published_date, category, sentiment
+FROM (
+    SELECT DISTINCT ON (COALESCE(NULLIF(news_url, ''), '#' || seq)) *
+    FROM {STAGING_TABLE}
+    ORDER BY COALESCE(NULLIF(news_url, ''), '#' || seq), seq DESC
+) deduped
+ORDER BY seq
+ON CONFLICT (news_url) WHERE news_url <> '' DO NOTHING
+RETURNING id
+"""
+
 
 class IssueRepository:
     """이슈 분석 정보 Repository 클래스"""
@@ -104,18 +148,116 @@ class IssueRepository:
         result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def search_by_keyword(self, keyword: str) -> List[IssueModel]:
-        """키워드로 이슈 검색 (제목 또는 요약에서)"""
+    async def search_by_keyword(self, keyword: str, limit: int = 100) -> List[IssueModel]:
+        """키워드로 이슈 검색 (제목 또는 요약에서, 관련도순)"""
+        rows = await self.search(keyword=keyword, limit=limit)
+        return [issue for issue, _ in rows]
+    
+    @staticmethod
+    def _keyword_match(keyword: str):
+        """
+        키워드 매칭 조건과 관련도 점수 식
+        - 전문 검색: 단어마다 접두어 매칭 (idx_issue_search_document)
+        - trigram: 제목/요약 안에 키워드와 비슷한 구간이 있으면 매칭, 부분 문자열/오타 대응 (idx_issue_*_trgm)
+        """
+        title_similarity = func.word_similarity(keyword, IssueModel.original_title)
+        summary_similarity = func.word_similarity(keyword, IssueModel.summary)
+        matches = [
+            IssueModel.original_title.op('%>')(keyword),
+            IssueModel.summary.op('%>')(keyword)
+        ]
+        score = func.greatest(title_similarity, summary_similarity * 0.5)
+        
+        # tsquery 문법 문자는 제거하고 단어만 사용
+        tokens = re.findall(r"\w+", keyword)
+        if tokens:
+            document = literal_column(f"({ISSUE_SEARCH_DOCUMENT})")
+            tsquery = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{token}:*" for token in tokens))
+            matches.insert(0, document.op('@@')(tsquery))
+            score = func.ts_rank_cd(document, tsquery) + score
+        
+        return or_(*matches), score
+    
+    def _search_conditions(
+        self,
+        keyword: Optional[str] = None,
+        corp: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ):
+        """검색 조건 목록과 정렬 점수 (키워드가 없으면 신뢰도)"""
+        conditions = []
+        if corp:
+            conditions.append(IssueModel.corp == corp)
+        if sentiment:
+            conditions.append(IssueModel.sentiment == sentiment)
+        if min_confidence is not None:
+            conditions.append(IssueModel.confidence >= min_confidence)
+        if start_date:
+            conditions.append(IssueModel.published_date >= start_date)
+        if end_date:
+            conditions.append(IssueModel.published_date <= end_date)
+        
+        score = IssueModel.confidence
+        if keyword:
+            match, score = self._keyword_match(keyword)
+            conditions.append(match)
+        return conditions, score
+    
+    async def search(
+        self,
+        keyword: Optional[str] = None,
+        corp: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None,
+        offset: int = 0
+    ) -> List[Tuple[IssueModel, float]]:
+        """
+        복합 조건 이슈 검색 (필터링/정렬/페이징 모두 DB에서 처리)
+        - 키워드가 있으면 관련도순, 없으면 신뢰도순 (동점은 id 역순)
+        - after=(이전 페이지 마지막 행의 점수, id)로 키셋 페이지네이션
+        반환: (이슈, 정렬 점수) 리스트
+        """
+        conditions, score = self._search_conditions(
+            keyword, corp, sentiment, min_confidence, start_date, end_date
+        )
+        if after is not None:
+            conditions.append(tuple_(score, IssueModel.id) < tuple_(after[0], after[1]))
+        
+        score = score.label("score")
         query = (
-            select(IssueModel)
-            .where(
-                IssueModel.original_title.contains(keyword) |
-                IssueModel.summary.contains(keyword)
-            )
-            .order_by(desc(IssueModel.confidence))
+            select(IssueModel, score)
+            .where(*conditions)
+            .order_by(desc(score), desc(IssueModel.id))
+            .offset(offset)
+            .limit(limit)
         )
         result = await self.db.execute(query)
-        return result.scalars().all()
+        return [(row[0], float(row[1])) for row in result.all()]
+    
+    async def count_search(
+        self,
+        keyword: Optional[str] = None,
+        corp: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        min_confidence: Optional[float] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        cap: int = 10000
+    ) -> int:
+        """검색 결과 개수 (cap건까지만 세어 대용량 테이블에서도 일정 시간 안에 반환)"""
+        conditions, _ = self._search_conditions(
+            keyword, corp, sentiment, min_confidence, start_date, end_date
+        )
+        matched = select(IssueModel.id).where(*conditions).limit(cap).subquery()
+        result = await self.db.execute(select(func.count()).select_from(matched))
+        return result.scalar()
     
     async def get_recent_issues(self, days: int = 7) -> List[IssueModel]:
         """최근 N일간의 이슈 정보 조회"""
@@ -203,28 +345,49 @@ class IssueRepository:
         await self.db.commit()
         return True
     
-    async def bulk_create(self, issues_data: List[IssueItemCreate]) -> List[IssueModel]:
-        """이슈 정보 대량 생성"""
-        issues = []
-        for data in issues_data:
-            issue = IssueModel(
-                corp=data.corp,
-                summary=data.summary,
-                original_title=data.original_title,
-                confidence=data.confidence,
-                matched_keywords=data.matched_keywords,
-                news_url=data.news_url,
-                published_date=data.published_date,
-                category=data.category,
-                sentiment=data.sentiment
-            )
-            issues.append(issue)
+    async def bulk_create(self, issues_data: List[IssueItemCreate]) -> List[int]:
+        """
+        이슈 정보 대량 저장 (COPY 기반)
+        스테이징 테이블에 COPY로 적재한 뒤 INSERT ... SELECT 한 번으로 병합
+        행 수와 관계없이 쿼리 수가 고정되고 ORM 객체 생성/refresh 없이 새로 저장된 id만 반환
+        """
+        if not issues_data:
+            return []
         
-        self.db.add_all(issues)
-        await self.db.commit()
+        records = [
+            (
+                seq,
+                data.corp,
+                data.summary,
+                data.original_title,
+                data.confidence,
+                json.dumps(data.matched_keywords, ensure_ascii=False) if data.matched_keywords is not None else None,
+                data.news_url,
+                data.published_date,
+                data.category,
+                data.sentiment
+            )
+            for seq, data in enumerate(issues_data)
+        ]
         
-        # 새로 생성된 ID로 다시 조회
-        for issue in issues:
-            await self.db.refresh(issue)
+        try:
+            # 세션 트랜잭션 안에서 스테이징 테이블 생성 (ON COMMIT DROP)
+            await self.db.execute(text(CREATE_STAGING_SQL))
+            
+            # 같은 트랜잭션의 asyncpg 연결로 COPY
+            connection = await self.db.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                STAGING_TABLE,
+                records=records,
+                columns=STAGING_COLUMNS
+            )
+            
+            result = await self.db.execute(text(MERGE_STAGING_SQL))
+            inserted_ids = [row[0] for row in result.all()]
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
         
-        return issues
+        return inserted_ids
@@ -75,6 +75,7 @@ class IssueListResponse(BaseModel):
     page: int = Field(1, description="현재 페이지")
     page_size: int = Field(20, description="페이지 크기")
     stats: Optional[PipelineStats] = Field(None, description="파이프라인 통계")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 커서 (검색 키셋 페이지네이션, 마지막 페이지면 없음)")
 
 # === 요청 스키마 ===
 class IssueAnalysisRequest(BaseModel):
@@ -95,6 +96,7 @@ class IssueSearchRequest(BaseModel):
     end_date: Optional[str] = Field(None, description="종료 날짜")
     page: int = Field(1, ge=1, description="페이지 번호")
     page_size: int = Field(20, ge=1, le=100, description="페이지 크기")
+    cursor: Optional[str] = Field(None, description="이전 응답의 next_cursor (지정 시 page 무시)")
 
 # === 배치 처리 스키마 ===
 class BatchJobRequest(BaseModel):
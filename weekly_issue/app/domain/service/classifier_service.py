@@ -1,16 +1,31 @@
 import httpx
 import asyncio
-from typing import List, Dict
-from app.config.settings import CLASSIFIER_URL
+from typing import List, Dict, Optional
+from app.config.settings import (
+    CLASSIFIER_URL,
+    CLASSIFIER_MODEL_VERSION,
+    CLASSIFIER_BATCH_SIZE,
+    CLASSIFIER_MAX_CONCURRENCY,
+    CLASSIFIER_CHUNK_TIMEOUT,
+    MAX_RETRY_COUNT,
+)
+from .result_cache_service import result_cache_service
 
 class ClassifierService:
     def __init__(self):
         self.classifier_url = CLASSIFIER_URL
+        self.model_version = CLASSIFIER_MODEL_VERSION
+        self.cache = result_cache_service
+        self.batch_size = max(1, CLASSIFIER_BATCH_SIZE)
+        self.max_concurrency = max(1, CLASSIFIER_MAX_CONCURRENCY)
+        self.chunk_timeout = CLASSIFIER_CHUNK_TIMEOUT
+        self.max_retry = max(1, MAX_RETRY_COUNT)
         print(f"🔧 ClassifierService 초기화 - URL: {self.classifier_url}")
     
     async def classify_news(self, news_list: List[Dict]) -> List[Dict]:
         """
         2차 중요도 분류 모델로 뉴스 제목 분류
+        - 결과 캐시에 있는 기사는 분류기를 호출하지 않고 캐시 결과 사용
         """
         print(f"🤍3-3 분류기 서비스 진입 - 총 {len(news_list)}개 뉴스")
         print(f"🔧 Classifier URL: {self.classifier_url}")
@@ -18,93 +33,139 @@ class ClassifierService:
         if not news_list:
             return []
         
+        # 캐시 조회 (콘텐츠 해시 + 모델 버전)
+        cache_keys = [self.cache.make_key(news, "classification", self.model_version) for news in news_list]
+        cached = self.cache.get_many(cache_keys)
+        predictions = {i: cached[key] for i, key in enumerate(cache_keys) if key in cached}
+        pending = [(i, news) for i, news in enumerate(news_list) if i not in predictions]
+        print(f"💾 분류 캐시 - 적중: {len(predictions)}개, 분류 필요: {len(pending)}개")
+        
+        if pending:
+            pending_news = [news for _, news in pending]
+            fetched = await self._request_predictions(pending_news)
+            
+            to_cache = {}
+            failed = []
+            for (i, news), prediction in zip(pending, fetched):
+                if prediction is None:
+                    failed.append((i, news))
+                else:
+                    predictions[i] = prediction
+                    to_cache[cache_keys[i]] = prediction
+            self.cache.set_many(to_cache, "classification")
+            
+            if failed:
+                # 재시도 후에도 실패한 청크의 기사만 fallback (나머지는 실제 분류 결과 유지)
+                fallback_items = self._create_fallback_results([news for _, news in failed], "chunk_failure")
+                for (i, _), item in zip(failed, fallback_items):
+                    predictions[i] = item["classification"]
+        
         classified_news = []
+        for i, news in enumerate(news_list):
+            if i not in predictions:
+                continue
+            prediction = predictions[i]
+            
+            # 원본 뉴스 정보를 모두 복사
+            classified_item = news.copy()
+            
+            # 분류 결과 추가
+            classified_item["classification"] = {
+                "label": prediction.get("label"),
+                "confidence": prediction.get("confidence")
+            }
+            
+            # 신뢰도가 0.6 이상인 경우 통과 (임시 완화)
+            confidence = prediction.get("confidence", 0)
+            if confidence >= 0.6:
+                classified_news.append(classified_item)
+                print(f"✅ 분류 통과: {news.get('title', '')[:30]}... (신뢰도: {confidence:.3f})")
+            else:
+                print(f"❌ 분류 제외: {news.get('title', '')[:30]}... (신뢰도: {confidence:.3f})")
+        
+        print(f"✅ 분류기 처리 완료: {len(classified_news)}개 뉴스가 중요도 기준 통과")
+        return classified_news
+    
+    async def _request_predictions(self, news_list: List[Dict]) -> List[Optional[Dict]]:
+        """
+        분류기 API 호출 (청크 단위 병렬 요청)
+        뉴스 순서대로 {"label", "confidence"} 리스트 반환, 재시도 후에도 실패한 청크의 항목은 None
+        """
+        titles = [news.get("title", "") for news in news_list]
+        chunks = [
+            (start, titles[start:start + self.batch_size])
+            for start in range(0, len(titles), self.batch_size)
+        ]
+        print(f"📤 분류기 요청 - {len(titles)}개 제목, {len(chunks)}개 청크 (청크당 최대 {self.batch_size}개, 동시 {self.max_concurrency}개)")
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        predictions: List[Optional[Dict]] = [None] * len(titles)
         
-        try:
-            # 배치로 분류 시도
-            titles = [news.get("title", "") for news in news_list]
-            print(f"📤 분류기 요청 - {len(titles)}개 제목")
+        async with httpx.AsyncClient(timeout=self.chunk_timeout) as client:
+            async def run_chunk(start: int, chunk_titles: List[str]):
+                async with semaphore:
+                    chunk_result = await self._request_chunk(client, chunk_titles, start)
+                if chunk_result is not None:
+                    predictions[start:start + len(chunk_titles)] = chunk_result
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                payload = {"text": titles}
-                print(f"📤 분류기 페이로드: {len(payload['text'])}개 항목")
-                
+            await asyncio.gather(*(run_chunk(start, chunk_titles) for start, chunk_titles in chunks))
+        
+        failed = sum(1 for prediction in predictions if prediction is None)
+        print(f"📊 분류 결과: 성공 {len(titles) - failed}개, 실패 {failed}개")
+        return predictions
+    
+    async def _request_chunk(self, client: httpx.AsyncClient, titles: List[str], start: int) -> Optional[List[Dict]]:
+        """
+        청크 하나를 분류기에 요청 (실패 시 지수 백오프로 재시도)
+        성공 시 제목 순서대로 결과 리스트, 모든 시도 실패 시 None 반환
+        """
+        chunk_name = f"청크[{start}:{start + len(titles)}]"
+        
+        for attempt in range(1, self.max_retry + 1):
+            try:
                 response = await client.post(
                     self.classifier_url,
-                    json=payload,
+                    json={"text": titles},
                     headers={"Content-Type": "application/json"}
                 )
                 
-                print(f"📥 분류기 응답 - Status: {response.status_code}")
-            
                 if response.status_code == 200:
-                    result = response.json()
-                    print(f"📥 분류기 응답 내용: {str(result)[:200]}...")
+                    batch_results = response.json().get("result", [])
                     
-                    batch_results = result.get("result", [])
-                    print(f"📊 분류 결과: {len(batch_results)}개")
-                    
-                    # 결과와 원본 뉴스 매칭
-                    for i, news in enumerate(news_list):
-                        if i < len(batch_results):
-                            prediction = batch_results[i]
-                            
-                            # 원본 뉴스 정보를 모두 복사
-                            classified_item = news.copy()
-                            
-                            # 분류 결과 추가
-                            classified_item["classification"] = {
-                                "label": prediction.get("label"),
-                                "confidence": prediction.get("confidence")
-                            }
-                            
-                            # 신뢰도가 0.6 이상인 경우 통과 (임시 완화)
-                            confidence = prediction.get("confidence", 0)
-                            if confidence >= 0.6:
-                                classified_news.append(classified_item)
-                                print(f"✅ 분류 통과: {news.get('title', '')[:30]}... (신뢰도: {confidence:.3f})")
-                            else:
-                                print(f"❌ 분류 제외: {news.get('title', '')[:30]}... (신뢰도: {confidence:.3f})")
+                    if len(batch_results) == len(titles):
+                        return [
+                            {"label": prediction.get("label"), "confidence": prediction.get("confidence")}
+                            for prediction in batch_results
+                        ]
+                    print(f"❌ {chunk_name} 분류 결과 개수 불일치: 요청 {len(titles)}개, 응답 {len(batch_results)}개")
+                else:
+                    print(f"❌ {chunk_name} 분류기 API 호출 실패: {response.status_code} - {response.text[:200]}")
                     
-                    print(f"✅ 분류기 처리 완료: {len(classified_news)}개 뉴스가 중요도 기준 통과")
-                    return classified_news
+            except httpx.ConnectError as e:
+                print(f"❌ {chunk_name} 분류기 연결 실패: {str(e)}")
+                print("💡 분류기 서비스가 실행되고 있는지 확인해주세요.")
                 
-                else:
-                    print(f"❌ 분류기 API 호출 실패: {response.status_code}")
-                    print(f"❌ 응답 내용: {response.text}")
-                    # 분류 API 실패 시 원본 뉴스를 그대로 반환 (fallback)
-                    print("⚠️ 분류기 실패로 인해 모든 뉴스를 통과시킵니다.")
-                    for news in news_list:
-                        fallback_item = news.copy()
-                        fallback_item["classification"] = {
-                            "label": "important",  # 기본값
-                            "confidence": 0.7  # 기본 신뢰도
-                        }
-                        classified_news.append(fallback_item)
-                    return classified_news
+            except httpx.TimeoutException as e:
+                print(f"❌ {chunk_name} 분류기 타임아웃: {str(e)}")
                 
-        except httpx.ConnectError as e:
-            print(f"❌ 분류기 연결 실패: {str(e)}")
-            print("💡 분류기 서비스가 실행되고 있는지 확인해주세요.")
-            return self._create_fallback_results(news_list, "connection_error")
-            
-        except httpx.TimeoutException as e:
-            print(f"❌ 분류기 타임아웃: {str(e)}")
-            return self._create_fallback_results(news_list, "timeout")
-            
-        except httpx.RequestError as e:
-            print(f"❌ 분류기 호출 중 네트워크 오류: {str(e)}")
-            return self._create_fallback_results(news_list, "network_error")
+            except httpx.RequestError as e:
+                print(f"❌ {chunk_name} 분류기 호출 중 네트워크 오류: {str(e)}")
+                
+            except Exception as e:
+                print(f"❌ {chunk_name} 분류기 처리 중 오류: {str(e)}")
             
-        except Exception as e:
-            print(f"❌ 분류기 처리 중 오류: {str(e)}")
-            return self._create_fallback_results(news_list, "unknown_error")
+            if attempt < self.max_retry:
+                backoff = 0.5 * (2 ** (attempt - 1))
+                print(f"🔁 {chunk_name} 재시도 {attempt}/{self.max_retry - 1} ({backoff:.1f}초 후)")
+                await asyncio.sleep(backoff)
+        
+        return None
     
     def _create_fallback_results(self, news_list: List[Dict], error_type: str) -> List[Dict]:
         """
         Fallback 결과 생성
         """
-        print(f"⚠️ {error_type}로 인해 모든 뉴스를 통과시킵니다.")
+        print(f"⚠️ {error_type}로 인해 {len(news_list)}개 뉴스를 통과시킵니다.")
         classified_news = []
         for news in news_list:
             fallback_item = news.copy()
@@ -1,6 +1,9 @@
-from typing import List, Optional, Dict, Any
+import json
+import base64
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import ISSUE_SEARCH_MAX_PAGE_SIZE, ISSUE_SEARCH_COUNT_LIMIT
 from ..repository.issue_repository import IssueRepository
 from ..model.issue_model import IssueModel
 from ..schema.issue_schema import (
@@ -11,6 +14,20 @@ from ..schema.issue_schema import (
 )
 
 
+def encode_cursor(score: float, issue_id: int) -> str:
+    """키셋 페이지네이션 커서 (마지막 행의 정렬 점수, id)"""
+    payload = json.dumps({"s": score, "id": issue_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """커서 해석 (형식이 잘못되면 ValueError)"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(payload["s"]), int(payload["id"])
+    except Exception:
+        raise ValueError(f"잘못된 검색 커서입니다: {cursor}")
+
+
 class IssueDbService:
     """이슈 분석 정보 DB 접근 전용 서비스"""
     
@@ -119,11 +136,11 @@ class IssueDbService:
             for issue in issues
         ]
     
-    async def search_by_keyword(self, keyword: str) -> List[IssueItem]:
-        """키워드로 이슈 검색"""
+    async def search_by_keyword(self, keyword: str, limit: int = 100) -> List[IssueItem]:
+        """키워드로 이슈 검색 (관련도순 상위 limit건)"""
         print(f"🗄️ [DB] 키워드 검색 - 키워드: {keyword}")
         
-        issues = await self.repository.search_by_keyword(keyword)
+        issues = await self.repository.search_by_keyword(keyword, limit=limit)
         return [
             IssueItem.model_validate(issue) 
             for issue in issues
@@ -133,13 +150,11 @@ class IssueDbService:
         """신뢰도 상위 이슈 조회"""
         print(f"🗄️ [DB] 신뢰도 상위 {limit}개 이슈 조회")
         
-        issues = await self.repository.get_by_confidence_threshold(0.0)  # 모든 이슈
-        # 신뢰도순 정렬 후 상위 N개
-        sorted_issues = sorted(issues, key=lambda x: x.confidence, reverse=True)[:limit]
+        rows = await self.repository.search(limit=limit)  # 신뢰도순 상위 N개 (DB 정렬)
         
         return [
             IssueItem.model_validate(issue) 
-            for issue in sorted_issues
+            for issue, _ in rows
         ]
     
     async def get_summary_statistics(self) -> Dict[str, Any]:
@@ -163,15 +178,15 @@ class IssueDbService:
     async def bulk_create(
         self, 
         issues_data: List[IssueItemCreate]
-    ) -> List[IssueItem]:
-        """이슈 정보 대량 생성"""
+    ) -> List[int]:
+        """이슈 정보 대량 생성 (COPY + 뉴스 URL 중복 제거, 새로 저장된 이슈 ID 반환)"""
         print(f"🗄️ [DB] 이슈 정보 대량 생성 - {len(issues_data)}건")
         
-        issues = await self.repository.bulk_create(issues_data)
-        return [
-            IssueItem.model_validate(issue) 
-            for issue in issues
-        ]
+        inserted_ids = await self.repository.bulk_create(issues_data)
+        skipped = len(issues_data) - len(inserted_ids)
+        if skipped:
+            print(f"🗄️ [DB] 중복 뉴스 URL {skipped}건 건너뜀")
+        return inserted_ids
     
     async def update(
         self, 
@@ -204,52 +219,43 @@ class IssueDbService:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None
     ) -> IssueListResponse:
-        """복합 조건으로 이슈 검색"""
-        print(f"🗄️ [DB] 이슈 검색 - 기업={corp}, 키워드={keyword}, 감정={sentiment}")
+        """
+        복합 조건으로 이슈 검색 (모든 조건을 조합해 DB에서 필터링)
+        - 키워드가 있으면 관련도순, 없으면 신뢰도순
+        - cursor가 있으면 키셋 페이지네이션 (page 무시), 없으면 page로 OFFSET (첫 페이지 외에는 cursor 권장)
+        - total_count는 ISSUE_SEARCH_COUNT_LIMIT건까지만 셈
+        """
+        print(f"🗄️ [DB] 이슈 검색 - 기업={corp}, 키워드={keyword}, 감정={sentiment}, 신뢰도>={min_confidence}, 기간={start_date}~{end_date}")
         
-        skip = (page - 1) * page_size
-        
-        # 조건별 검색
-        if corp:
-            issues = await self.repository.get_by_corp(corp)
-        elif keyword:
-            issues = await self.repository.search_by_keyword(keyword)
-        elif sentiment:
-            issues = await self.repository.get_by_sentiment(sentiment)
-        elif min_confidence:
-            issues = await self.repository.get_by_confidence_threshold(min_confidence)
-        elif start_date and end_date:
-            issues = await self.repository.get_by_date_range(start_date, end_date)
-        else:
-            issues = await self.repository.get_all(skip=skip, limit=page_size)
-        
-        # 추가 필터링 적용
-        if min_confidence and not sentiment and not corp and not keyword:
-            issues = [issue for issue in issues if issue.confidence >= min_confidence]
+        page_size = max(1, min(page_size, ISSUE_SEARCH_MAX_PAGE_SIZE))
+        after = decode_cursor(cursor) if cursor else None
+        offset = 0 if after else (max(page, 1) - 1) * page_size
+        filters = dict(
+            keyword=keyword.strip() if keyword and keyword.strip() else None,
+            corp=corp,
+            sentiment=sentiment,
+            min_confidence=min_confidence,
+            start_date=start_date,
+            end_date=end_date
+        )
         
-        # 페이징 적용
-        if corp or keyword or sentiment or min_confidence or (start_date and end_date):
-            total_count = len(issues)
-            issues = issues[skip:skip + page_size]
-        else:
-            total_count = await self.repository.count_total()
+        # 다음 페이지 존재 여부 확인용으로 1건 더 조회
+        rows = await self.repository.search(**filters, limit=page_size + 1, after=after, offset=offset)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        total_count = await self.repository.count_search(**filters, cap=ISSUE_SEARCH_COUNT_LIMIT)
         
         issue_items = [
             IssueItem.model_validate(issue) 
-            for issue in issues
+            for issue, _ in rows
         ]
-        
-        # 통계 정보
-        stats_data = await self.repository.get_statistics()
-        pipeline_stats = PipelineStats(
-            total_collected=stats_data.get("total_count", 0),
-            after_keyword_filter=stats_data.get("total_count", 0),
-            after_classification=stats_data.get("total_count", 0),
-            final_summaries=stats_data.get("total_count", 0),
-            companies_processed=len(stats_data.get("top_companies", {}))
-        )
+        next_cursor = None
+        if has_more:
+            last_issue, last_score = rows[-1]
+            next_cursor = encode_cursor(last_score, last_issue.id)
         
         return IssueListResponse(
             status="success",
@@ -258,5 +264,5 @@ class IssueDbService:
             total_count=total_count,
             page=page,
             page_size=page_size,
-            stats=pipeline_stats
+            next_cursor=next_cursor
         )
@@ -0,0 +1,175 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import List, Dict, Optional
+from app.config.settings import (
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_MAX_ENTRIES,
+)
+
+class ResultCacheService:
+    """
+    분류/요약 결과 캐시 (콘텐츠 해시 + 모델 버전 기반)
+    - 같은 기사가 재수집되거나 재시도될 때 분류기/요약기 호출을 건너뛰기 위한 영구 캐시
+    - SQLite 파일 하나에 저장하며 TTL 만료와 최대 항목 수(LRU) 기준으로 정리
+    """
+
+    def __init__(
+        self,
+        db_path: str = RESULT_CACHE_PATH,
+        ttl_seconds: int = RESULT_CACHE_TTL_SECONDS,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+        enabled: bool = RESULT_CACHE_ENABLED,
+    ):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        if self.enabled:
+            try:
+                self._connect()
+                print(f"🔧 ResultCacheService 초기화 - Path: {self.db_path}, TTL: {self.ttl_seconds}s, Max: {self.max_entries}")
+            except Exception as e:
+                # 캐시는 보조 수단이므로 실패해도 파이프라인은 그대로 동작
+                print(f"⚠️ 결과 캐시 초기화 실패, 캐시 없이 진행합니다: {str(e)}")
+                self.enabled = False
+
+    def _connect(self):
+        """SQLite 연결 및 테이블 생성"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS result_cache (
+                cache_key TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_last_access ON result_cache (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """HTML 태그/공백/대소문자 차이를 제거해 같은 기사를 같은 키로 묶음"""
+        text = re.sub(r"<[^>]+>", "", text or "")
+        text = re.sub(r"\s+", " ", text)
+        return text.strip().lower()
+
+    def make_key(self, news: Dict, kind: str, model_version: str) -> str:
+        """
+        캐시 키 생성
+        - 기사 링크가 있으면 링크, 없으면 정규화된 제목+설명으로 기사를 식별
+        - 작업 종류(kind)와 모델 버전을 함께 해시하여 모델 교체 시 자동으로 캐시가 분리됨
+        """
+        link = (news.get("link") or "").strip()
+        if link:
+            identity = f"link:{link}"
+        else:
+            identity = f"text:{self._normalize(news.get('title', ''))}\n{self._normalize(news.get('description', ''))}"
+        return hashlib.sha256(f"{kind}|{model_version}|{identity}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """여러 키를 한 번에 조회 (만료된 항목은 미스로 처리)"""
+        if not self.enabled or not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        try:
+            with self._lock:
+                for i in range(0, len(unique_keys), 500):
+                    chunk = unique_keys[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT cache_key, payload, created_at FROM result_cache WHERE cache_key IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                    for cache_key, payload, created_at in rows:
+                        if now - created_at <= self.ttl_seconds:
+                            found[cache_key] = json.loads(payload)
+
+                if found:
+                    self._conn.executemany(
+                        "UPDATE result_cache SET last_access = ? WHERE cache_key = ?",
+                        [(now, cache_key) for cache_key in found],
+                    )
+                    self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 조회 실패: {str(e)}")
+            return {}
+
+        self.stats["hits"] += len(found)
+        self.stats["misses"] += len(unique_keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, Dict], kind: str):
+        """여러 결과를 한 번에 저장 후 TTL/용량 기준 정리"""
+        if not self.enabled or not items:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO result_cache (cache_key, kind, payload, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (cache_key, kind, json.dumps(payload, ensure_ascii=False), now, now)
+                        for cache_key, payload in items.items()
+                    ],
+                )
+                self._conn.commit()
+                self.stats["writes"] += len(items)
+                self._evict(now)
+        except Exception as e:
+            print(f"⚠️ 결과 캐시 저장 실패: {str(e)}")
+
+    def _evict(self, now: float):
+        """TTL 만료 항목 삭제 후, 최대 항목 수를 넘으면 오래 사용되지 않은 항목부터 삭제"""
+        expired = self._conn.execute(
+            "DELETE FROM result_cache WHERE created_at < ?",
+            (now - self.ttl_seconds,),
+        ).rowcount
+
+        overflow = 0
+        total = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+        if total > self.max_entries:
+            overflow = self._conn.execute(
+                "DELETE FROM result_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM result_cache ORDER BY last_access ASC LIMIT ?)",
+                (total - self.max_entries,),
+            ).rowcount
+
+        if expired or overflow:
+            self._conn.commit()
+            self.stats["evictions"] += expired + overflow
+            print(f"🧹 결과 캐시 정리 - 만료: {expired}개, 용량 초과: {overflow}개")
+
+    def get_stats(self) -> Dict:
+        """캐시 통계 반환"""
+        entries = 0
+        if self.enabled:
+            try:
+                with self._lock:
+                    entries = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+            except Exception:
+                pass
+        return {"enabled": self.enabled, "entries": entries, **self.stats}
+
+# 싱글톤 인스턴스
+result_cache_service = ResultCacheService()
@@ -1,25 +1,40 @@
 import httpx
 import uuid
 from typing import List, Dict
-from app.config.settings import SUMMARIZER_URL, REQUEST_TIMEOUT
+from app.config.settings import SUMMARIZER_URL, REQUEST_TIMEOUT, SUMMARIZER_MODEL_VERSION
+from .result_cache_service import result_cache_service
 
 class SummaryService:
     def __init__(self):
         self.summary_url = SUMMARIZER_URL
         self.timeout = REQUEST_TIMEOUT
+        self.model_version = SUMMARIZER_MODEL_VERSION
+        self.cache = result_cache_service
         print(f"🔧 SummaryService 초기화 - URL: {self.summary_url}")
     
     async def summarize_news(self, news_list: List[Dict]) -> List[Dict]:
         """
         요약 모델로 뉴스 요약 생성
+        - 결과 캐시에 AI 요약이 있는 기사는 요약기를 호출하지 않음
         """
         print(f"🤍3-4 요약 서비스 진입 - 총 {len(news_list)}개 뉴스")
         print(f"🔧 Summarizer URL: {self.summary_url}")
         
         summarized_results = []
         
+        # 캐시 조회 (콘텐츠 해시 + 모델 버전)
+        cache_keys = [self.cache.make_key(news, "summary", self.model_version) for news in news_list]
+        cached = self.cache.get_many(cache_keys)
+        print(f"💾 요약 캐시 - 적중: {len(cached)}개, 요약 필요: {len(news_list) - len(cached)}개")
+        
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             for i, news in enumerate(news_list):
+                if cache_keys[i] in cached:
+                    result = self._create_result(news, cached[cache_keys[i]]["summary"], "ai_generated")
+                    summarized_results.append(result)
+                    print(f"💾 [{i+1}/{len(news_list)}] {news.get('company')} 캐시된 요약 사용")
+                    continue
+                
                 try:
                     print(f"📝 [{i+1}/{len(news_list)}] {news.get('company')} 뉴스 요약 시작")
                     
@@ -56,20 +71,10 @@ class SummaryService:
                         else:
                             print(f"✅ AI 요약 성공: {summary_text[:50]}...")
                             summary_type = "ai_generated"
+                            # 실제 AI 요약만 캐시 (fallback 요약은 다음 실행에서 재시도)
+                            self.cache.set_many({cache_keys[i]: {"summary": summary_text}}, "summary")
                         
-                        result = {
-                            "id": str(uuid.uuid4()),
-                            "corp": news.get("company"),
-                            "summary": summary_text,
-                            "original_title": news.get("title"),
-                            "confidence": news.get("classification", {}).get("confidence", 0),
-                            "matched_keywords": news.get("matched_keywords", []),
-                            "news_url": news.get("link", ""),
-                            "published_date": self._format_published_date(news.get("pubDate", "")),
-                            "category": news.get("category", "일반"),
-                            "sentiment": "neutral",
-                            "summary_type": summary_type  # 디버깅용
-                        }
+                        result = self._create_result(news, summary_text, summary_type)
                         summarized_results.append(result)
                         
                         print(f"✅ {news.get('company')} 뉴스 요약 완료 ({summary_type})")
@@ -103,6 +108,24 @@ class SummaryService:
         
         return summarized_results
     
+    def _create_result(self, news: Dict, summary_text: str, summary_type: str) -> Dict:
+        """
+        요약 결과 생성 (API 응답/캐시 공통)
+        """
+        return {
+            "id": str(uuid.uuid4()),
+            "corp": news.get("company"),
+            "summary": summary_text,
+            "original_title": news.get("title"),
+            "confidence": news.get("classification", {}).get("confidence", 0),
+            "matched_keywords": news.get("matched_keywords", []),
+            "news_url": news.get("link", ""),
+            "published_date": self._format_published_date(news.get("pubDate", "")),
+            "category": news.get("category", "일반"),
+            "sentiment": "neutral",
+            "summary_type": summary_type  # 디버깅용
+        }
+    
     def _create_fallback_result(self, news: Dict) -> Dict:
         """
         Fallback 결과 생성 (일관된 구조 보장)